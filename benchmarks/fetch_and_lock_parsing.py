@@ -0,0 +1,80 @@
+"""
+Compares parsing of a fetchAndLock response:
+
+- legacy: `response.json()` + `validate_python` + `ExternalTaskDTO.model_validate`
+  with eager `parsed_variables`
+- fast: single `TypeAdapter.validate_json` pass into `ExternalTaskDTO`
+
+    python -m benchmarks.fetch_and_lock_parsing
+"""
+
+import json
+import timeit
+from typing import Any
+
+import orjson
+
+from camunda_client.clients.external_task.client import ADAPTER
+from camunda_client.utils import process_variable
+from camunda_client.worker.dto import ExternalTaskDTO
+from camunda_client.worker.task_worker import TASKS_ADAPTER
+
+TASKS = 100
+JSON_VARIABLES = 5
+JSON_ITEMS = 500
+ROUNDS = 20
+
+
+def make_response() -> bytes:
+    blob = orjson.dumps(
+        [{"id": i, "name": f"item-{i}", "price": i * 1.5} for i in range(JSON_ITEMS)],
+    ).decode()
+    variables: dict[str, Any] = {
+        f"json_{i}": {"type": "Json", "value": blob, "valueInfo": {}}
+        for i in range(JSON_VARIABLES)
+    }
+    variables["email"] = {"type": "String", "value": "user@example.com"}
+    tasks = [
+        {
+            "id": f"task-{i}",
+            "workerId": "worker",
+            "topicName": "topic",
+            "activityId": "activity",
+            "processInstanceId": f"process-{i}",
+            "lockExpirationTime": "2026-01-01T00:00:00.000+0000",
+            "priority": 0,
+            "variables": variables,
+        }
+        for i in range(TASKS)
+    ]
+    return orjson.dumps(tasks)
+
+
+def legacy(content: bytes) -> list[ExternalTaskDTO]:
+    result = []
+    for task in ADAPTER.validate_python(json.loads(content)):
+        dto = ExternalTaskDTO.model_validate(task)
+        dto.__dict__["parsed_variables"] = {
+            key: process_variable(schema) for key, schema in task.variables.items()
+        }
+        result.append(dto)
+    return result
+
+
+def fast(content: bytes) -> list[ExternalTaskDTO]:
+    return TASKS_ADAPTER.validate_json(content)
+
+
+def main() -> None:
+    content = make_response()
+    print(f"{TASKS} tasks, {len(content) / 1024 / 1024:.1f} MiB response")
+    results = {}
+    for name, func in (("legacy", legacy), ("fast", fast)):
+        seconds = min(timeit.repeat(lambda: func(content), number=1, repeat=ROUNDS))
+        results[name] = seconds
+        print(f"{name:>8}: {seconds * 1000:8.2f} ms")
+    print(f" speedup: {results['legacy'] / results['fast']:8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,334 @@
+"""
+Benchmark suite of the client and the worker, results are written as JSON
+to compare releases:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --compare results.json
+
+- serialization of `FetchExternalTasksSchema` and `CompleteExternalTaskSchema`,
+  and `encode_variables` of the same variables
+- `process_variable` and `deserialize`
+- `TypeAdapter` parsing of fetchAndLock responses
+- the worker draining a backlog of `FakeEngine`, and its latency
+  from process start to completion under a steady load
+
+Microbenchmarks time every call with garbage collection disabled,
+p50 and p99 are per call. Worker latencies are per task.
+"""
+
+import argparse
+import asyncio
+import dataclasses
+import gc
+import platform
+import statistics
+import sys
+import time
+from collections.abc import Callable, Sequence
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+import orjson
+
+import camunda_client
+from camunda_client import (
+    ExternalTaskClient,
+    ExternalTaskConfig,
+    ExternalTaskContext,
+    ExternalTaskDTO,
+    ExternalTaskWorker,
+    VariableValueSchema,
+)
+from camunda_client.clients.dto import AuthData
+from camunda_client.clients.external_task.client import ADAPTER
+from camunda_client.clients.external_task.schemas import (
+    CompleteExternalTaskSchema,
+    FetchExternalTasksSchema,
+    FetchExternalTaskTopicSchema,
+)
+from camunda_client.testing import ExternalTaskActivity, FakeEngine
+from camunda_client.utils import deserialize, encode_variables, process_variable
+from camunda_client.worker.task_worker import TASKS_ADAPTER
+
+TOPICS = 20
+VARIABLES = 50
+TASKS = 100
+CALLS = 2_000
+
+WORKER_TASKS = 20_000
+WORKER_RATE = 2_000
+WORKER_DURATION = timedelta(seconds=3)
+WORKER_CONCURRENCY = 64
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ResultDTO:
+    name: str
+
+    # Operations per second
+    throughput: float
+
+    # Latency percentiles of a single operation, in seconds
+    p50: float
+    p99: float
+    samples: int
+
+
+def _result(name: str, latencies: Sequence[float], seconds: float) -> ResultDTO:
+    percentiles = statistics.quantiles(latencies, n=100, method="inclusive")
+    return ResultDTO(
+        name=name,
+        throughput=len(latencies) / seconds,
+        p50=percentiles[49],
+        p99=percentiles[98],
+        samples=len(latencies),
+    )
+
+
+def measure(name: str, func: Callable[[], Any], calls: int = CALLS) -> ResultDTO:
+    for _ in range(calls // 10):
+        func()
+
+    latencies = []
+    perf_counter = time.perf_counter
+    # Same as `timeit`, collections would land in random samples
+    gc.disable()
+    try:
+        for _ in range(calls):
+            started = perf_counter()
+            func()
+            latencies.append(perf_counter() - started)
+    finally:
+        gc.enable()
+    return _result(name, latencies, sum(latencies))
+
+
+def _variables(count: int) -> dict[str, VariableValueSchema]:
+    values: list[Any] = ["user@example.com", 42, 1.5, True, None, {"items": [1, 2]}]
+    return {f"var_{i}": deserialize(values[i % len(values)]) for i in range(count)}
+
+
+def _response() -> bytes:
+    variables = {
+        name: variable.model_dump(mode="json", by_alias=True)
+        for name, variable in _variables(VARIABLES).items()
+    }
+    tasks = [
+        {
+            "id": f"task-{i}",
+            "workerId": "worker",
+            "topicName": "topic",
+            "activityId": "activity",
+            "processInstanceId": f"process-{i}",
+            "lockExpirationTime": "2026-01-01T00:00:00.000+0000",
+            "priority": 0,
+            "variables": variables,
+        }
+        for i in range(TASKS)
+    ]
+    return orjson.dumps(tasks)
+
+
+def serialization() -> list[ResultDTO]:
+    fetch = FetchExternalTasksSchema(
+        worker_id="worker",
+        max_tasks=100,
+        lock_timeout=30_000,
+        topics=[
+            FetchExternalTaskTopicSchema(
+                topic_name=f"topic-{i}",
+                lock_duration=60_000,
+                variables=["a", "b", "c"],
+            )
+            for i in range(TOPICS)
+        ],
+    )
+    complete = CompleteExternalTaskSchema(
+        worker_id="worker",
+        variables=_variables(VARIABLES),
+    )
+    values = {
+        name: process_variable(variable)
+        for name, variable in _variables(VARIABLES).items()
+    }
+    return [
+        measure(
+            f"fetch_body_{TOPICS}_topics",
+            lambda: fetch.model_dump_json(by_alias=True, exclude_unset=True),
+        ),
+        measure(
+            f"complete_body_{VARIABLES}_variables",
+            lambda: complete.model_dump_json(by_alias=True, exclude_unset=True),
+        ),
+        measure(
+            f"encode_variables_{VARIABLES}_variables",
+            lambda: encode_variables(values),
+        ),
+    ]
+
+
+def variables() -> list[ResultDTO]:
+    json_variable = VariableValueSchema(
+        type="Json",
+        value=orjson.dumps({"items": list(range(100))}).decode(),
+    )
+    value = {"items": list(range(100))}
+    return [
+        measure("process_variable_json", lambda: process_variable(json_variable)),
+        measure("deserialize_str", lambda: deserialize("user@example.com")),
+        measure("deserialize_json", lambda: deserialize(value)),
+    ]
+
+
+def parsing() -> list[ResultDTO]:
+    content = _response()
+    return [
+        measure(
+            f"parse_response_{TASKS}_tasks",
+            lambda: ADAPTER.validate_json(content),
+            calls=CALLS // 10,
+        ),
+        measure(
+            f"parse_response_{TASKS}_tasks_dto",
+            lambda: TASKS_ADAPTER.validate_json(content),
+            calls=CALLS // 10,
+        ),
+    ]
+
+
+def _worker(engine: FakeEngine) -> ExternalTaskWorker:
+    client = ExternalTaskClient(
+        worker_id="worker",
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=engine.transport,
+        config=ExternalTaskConfig(
+            max_tasks=WORKER_CONCURRENCY,
+            async_response_timeout=timedelta(milliseconds=100),
+        ),
+    )
+    return ExternalTaskWorker(
+        client,
+        pull_interval=timedelta(milliseconds=10),
+        max_in_flight=WORKER_CONCURRENCY * 2,
+    )
+
+
+async def _run_worker(
+    engine: FakeEngine,
+    tasks: int,
+    latencies: list[float],
+    produce: Callable[[], Any] | None = None,
+) -> float:
+    """Serves tasks until `tasks` are completed, returns elapsed seconds"""
+
+    async def handler(ctx: ExternalTaskContext, task: ExternalTaskDTO) -> None:
+        await ctx.complete()
+        latencies.append(time.perf_counter() - task.variables["started"].value)
+
+    worker = _worker(engine)
+    started = time.perf_counter()
+    async with worker, asyncio.TaskGroup() as tg:
+        tg.create_task(
+            worker.serve("topic", handler, concurrency=WORKER_CONCURRENCY),
+        )
+        if produce is not None:
+            tg.create_task(produce())
+        while engine.stats.completed < tasks:
+            await asyncio.sleep(0.01)
+        worker.close()
+    return time.perf_counter() - started
+
+
+def _start(engine: FakeEngine) -> None:
+    engine.start_process(
+        "process",
+        variables={"started": VariableValueSchema(value=time.perf_counter())},
+    )
+
+
+async def worker_drain() -> ResultDTO:
+    """Throughput of the worker with every task waiting in the engine"""
+    engine = FakeEngine()
+    engine.deploy("process", [ExternalTaskActivity("topic")])
+    for _ in range(WORKER_TASKS):
+        _start(engine)
+
+    latencies: list[float] = []
+    seconds = await _run_worker(engine, WORKER_TASKS, latencies)
+    return dataclasses.replace(
+        _result("worker_drain", latencies, seconds),
+        throughput=WORKER_TASKS / seconds,
+    )
+
+
+async def worker_latency() -> ResultDTO:
+    """Latency from process start to completion at `WORKER_RATE` tasks per second"""
+    engine = FakeEngine()
+    engine.deploy("process", [ExternalTaskActivity("topic")])
+    tasks = int(WORKER_RATE * WORKER_DURATION.total_seconds())
+    tick = 0.01
+
+    async def produce() -> None:
+        started = time.perf_counter()
+        produced = 0
+        while produced < tasks:
+            due = min(tasks, int((time.perf_counter() - started) * WORKER_RATE))
+            for _ in range(due - produced):
+                _start(engine)
+            produced = due
+            await asyncio.sleep(tick)
+
+    latencies: list[float] = []
+    seconds = await _run_worker(engine, tasks, latencies, produce)
+    return dataclasses.replace(
+        _result("worker_latency", latencies, seconds),
+        throughput=tasks / seconds,
+    )
+
+
+def run() -> dict[str, Any]:
+    results = [*serialization(), *variables(), *parsing()]
+    results.append(asyncio.run(worker_drain()))
+    results.append(asyncio.run(worker_latency()))
+    return {
+        "version": camunda_client.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "created": datetime.now(tz=UTC).isoformat(),
+        "results": [dataclasses.asdict(result) for result in results],
+    }
+
+
+def report(report: dict[str, Any], baseline: dict[str, Any] | None) -> None:
+    previous = {
+        result["name"]: result for result in (baseline or {}).get("results", ())
+    }
+    print(f"{'':>32} {'ops/s':>12} {'p50, us':>10} {'p99, us':>10} {'change':>8}")
+    for result in report["results"]:
+        change = ""
+        if result["name"] in previous:
+            ratio = result["throughput"] / previous[result["name"]]["throughput"]
+            change = f"{ratio - 1:+.1%}"
+        print(
+            f"{result['name']:>32} {result['throughput']:12.0f}"
+            f" {result['p50'] * 1e6:10.1f} {result['p99'] * 1e6:10.1f} {change:>8}",
+        )
+
+
+def main(argv: Sequence[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--output", type=Path, help="write results as JSON")
+    parser.add_argument("--compare", type=Path, help="results of a previous run")
+    args = parser.parse_args(argv)
+
+    results = run()
+    baseline = orjson.loads(args.compare.read_bytes()) if args.compare else None
+    report(results, baseline)
+    if args.output:
+        args.output.write_bytes(orjson.dumps(results, option=orjson.OPT_INDENT_2))
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
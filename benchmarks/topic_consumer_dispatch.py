@@ -0,0 +1,164 @@
+"""
+Compares dispatch of tasks by `TopicConsumer`:
+
+- legacy: list + `asyncio.Event`, two `asyncio.Task`s per `__anext__`
+- queue: single priority queue with a close sentinel
+
+Measures the time to drain a backlog, the hand-off latency to a waiting
+iterator, the number of `asyncio.Task`s created per dispatched task and
+the peak of traced memory while draining.
+
+    python -m benchmarks.topic_consumer_dispatch
+"""
+
+import asyncio
+import time
+import tracemalloc
+from collections.abc import AsyncIterator, Callable
+from typing import Any, Protocol, Self
+
+from camunda_client.worker import ExternalTaskContext, ExternalTaskDTO, TopicConsumer
+
+TASKS = 20_000
+HANDOFFS = 2_000
+
+
+class _Consumer(Protocol):
+    def __aiter__(self) -> AsyncIterator[ExternalTaskContext]: ...
+    def add_task(self, ctx: ExternalTaskContext) -> None: ...
+    def close(self) -> None: ...
+
+
+class LegacyTopicConsumer:
+    """Consumer implementation before the queue based rewrite"""
+
+    def __init__(self) -> None:
+        self.task_contexts: list[ExternalTaskContext] = []
+        self.new_task_event = asyncio.Event()
+        self.closing = asyncio.Event()
+
+    def __aiter__(self) -> Self:
+        return self
+
+    async def __anext__(self) -> ExternalTaskContext:
+        _, pending = await asyncio.wait(
+            [
+                asyncio.create_task(self.new_task_event.wait()),
+                asyncio.create_task(self.closing.wait()),
+            ],
+            return_when=asyncio.FIRST_COMPLETED,
+        )
+        for task in pending:
+            task.cancel()
+
+        if self.closing.is_set():
+            raise StopAsyncIteration
+
+        task_context = self.task_contexts.pop()
+        if not self.task_contexts:
+            self.new_task_event.clear()
+        return task_context
+
+    def add_task(self, ctx: ExternalTaskContext) -> None:
+        self.task_contexts.append(ctx)
+        self.new_task_event.set()
+
+    def close(self) -> None:
+        self.closing.set()
+
+
+def make_contexts(count: int) -> list[ExternalTaskContext]:
+    return [
+        ExternalTaskContext(
+            client=None,  # type: ignore[arg-type]
+            task=ExternalTaskDTO(
+                id=str(i),
+                worker_id="worker",
+                topic_name="topic",
+                variables={},
+            ),
+            exit_hook=lambda _: None,
+        )
+        for i in range(count)
+    ]
+
+
+async def drain(
+    consumer: _Consumer,
+    contexts: list[ExternalTaskContext],
+) -> tuple[float, int]:
+    for ctx in contexts:
+        consumer.add_task(ctx)
+
+    iterator = aiter(consumer)
+    tracemalloc.start()
+    started = time.perf_counter()
+    for _ in contexts:
+        await anext(iterator)
+    seconds = time.perf_counter() - started
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return seconds / len(contexts), peak
+
+
+async def handoff(consumer: _Consumer, contexts: list[ExternalTaskContext]) -> float:
+    iterator = aiter(consumer)
+    total = 0.0
+    for ctx in contexts:
+        waiter = asyncio.ensure_future(anext(iterator))
+        await asyncio.sleep(0)
+        started = time.perf_counter()
+        consumer.add_task(ctx)
+        await waiter
+        total += time.perf_counter() - started
+    return total / len(contexts)
+
+
+async def measure(factory: Callable[[], _Consumer]) -> dict[str, Any]:
+    loop = asyncio.get_running_loop()
+    created = 0
+
+    def task_factory(
+        loop: asyncio.AbstractEventLoop,
+        coro: Any,  # noqa: ANN401
+        **kwargs: Any,  # noqa: ANN401
+    ) -> asyncio.Task[Any]:
+        nonlocal created
+        created += 1
+        return asyncio.Task(coro, loop=loop, **kwargs)
+
+    contexts = make_contexts(TASKS)
+    loop.set_task_factory(task_factory)
+    drain_seconds, peak = await drain(factory(), contexts)
+    drain_tasks = created
+
+    created = 0
+    handoff_seconds = await handoff(factory(), contexts[:HANDOFFS])
+    loop.set_task_factory(None)
+    return {
+        "drain_us": drain_seconds * 1e6,
+        "handoff_us": handoff_seconds * 1e6,
+        "tasks_per_dispatch": drain_tasks / TASKS,
+        "peak_kib": peak / 1024,
+    }
+
+
+async def main() -> None:
+    consumers: dict[str, Callable[[], _Consumer]] = {
+        "legacy": LegacyTopicConsumer,
+        "queue": TopicConsumer,
+    }
+    print(
+        f"{'':>8} {'drain, us':>10} {'hand-off, us':>13}"
+        f" {'tasks/item':>11} {'peak, KiB':>10}",
+    )
+    for name, factory in consumers.items():
+        result = await measure(factory)
+        print(
+            f"{name:>8} {result['drain_us']:10.2f} {result['handoff_us']:13.2f}"
+            f" {result['tasks_per_dispatch']:11.2f} {result['peak_kib']:10.1f}",
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
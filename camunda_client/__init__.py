@@ -4,8 +4,8 @@ from .clients import (
     ExternalTaskClient,
     ExternalTaskConfig,
 )
-from .types_ import Variables, VariableValueSchema
-from .utils import process_variable
+from .types_ import EncodedVariables, Variables, VariableValueSchema
+from .utils import encode_variables, process_variable
 from .worker import (
     ExternalTaskContext,
     ExternalTaskDTO,
@@ -24,6 +24,8 @@ __all__ = [
     "ExternalTaskWorker",
     "ExternalTaskDTO",
     "process_variable",
+    "encode_variables",
+    "EncodedVariables",
     "VariableValueSchema",
     "Variables",
 ]
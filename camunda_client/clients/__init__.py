@@ -1,10 +1,23 @@
+from .breaker import CircuitBreaker, CircuitBreakerConfig
+from .dto import AuthData, HTTPConfig
 from .endpoints import CamundaUrls
 from .engine import CamundaEngineClient
 from .external_task import ExternalTaskClient, ExternalTaskConfig
+from .nodes import NodePool
+from .rate_limit import RateLimit, RateLimiter
+from .session import HTTPSessionFactory
 
 __all__ = [
+    "AuthData",
     "CamundaEngineClient",
     "CamundaUrls",
+    "CircuitBreaker",
+    "CircuitBreakerConfig",
     "ExternalTaskClient",
     "ExternalTaskConfig",
+    "HTTPConfig",
+    "HTTPSessionFactory",
+    "NodePool",
+    "RateLimit",
+    "RateLimiter",
 ]
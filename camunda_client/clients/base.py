@@ -0,0 +1,206 @@
+import time
+from collections.abc import Sequence
+from types import TracebackType
+from typing import Any, Self
+
+import httpx
+
+from camunda_client.metrics import Metrics
+
+from .breaker import CircuitBreaker
+from .dto import AuthData
+from .nodes import EngineNode, NodePool
+from .rate_limit import RateLimiter
+
+# Responses of a node that is down or overloaded, not of the engine itself
+_NODE_FAILURE_STATUSES = frozenset(
+    (
+        httpx.codes.BAD_GATEWAY,
+        httpx.codes.SERVICE_UNAVAILABLE,
+        httpx.codes.GATEWAY_TIMEOUT,
+    ),
+)
+
+
+def _is_failure(status_code: int) -> bool:
+    return (
+        status_code >= httpx.codes.INTERNAL_SERVER_ERROR
+        or status_code == httpx.codes.TOO_MANY_REQUESTS
+    )
+
+
+class BaseClient:
+    def __init__(  # noqa: PLR0913
+        self,
+        base_url: str | Sequence[str] | NodePool,
+        auth_data: AuthData,
+        transport: httpx.AsyncBaseTransport,
+        timeout: httpx.Timeout | None = None,
+        metrics: Metrics | None = None,
+        breaker: CircuitBreaker | None = None,
+        rate_limiter: RateLimiter | None = None,
+    ) -> None:
+        """
+        `base_url` may list several engine nodes sharing one database,
+        see `NodePool` for the balancing and failover rules
+        """
+        if isinstance(base_url, str):
+            self._nodes = None
+        elif isinstance(base_url, NodePool):
+            self._nodes = base_url
+        else:
+            self._nodes = NodePool(base_url)
+
+        self._http_client = httpx.AsyncClient(
+            base_url=base_url if isinstance(base_url, str) else "",
+            transport=transport,
+            auth=httpx.BasicAuth(
+                username=auth_data.username,
+                password=auth_data.password,
+            ),
+            headers={"Content-Type": "application/json"},
+            timeout=timeout or httpx.Timeout(5.0),
+        )
+        self._metrics = metrics or Metrics()
+        self._breaker = breaker
+        self._rate_limiter = rate_limiter
+
+    @property
+    def metrics(self) -> Metrics:
+        return self._metrics
+
+    @property
+    def breaker(self) -> CircuitBreaker | None:
+        return self._breaker
+
+    async def aclose(self) -> None:
+        """Closes the client, a transport of `HTTPSessionFactory` stays open"""
+        await self._http_client.aclose()
+
+    async def __aenter__(self) -> Self:
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
+
+    async def _request(
+        self,
+        method: str,
+        url: str,
+        *,
+        operation: str,
+        long_polling: bool = False,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> httpx.Response:
+        """
+        Sends a request to the engine, `operation` names the call in metrics
+        and in the circuit breaker. Latency of `long_polling` requests is not tracked.
+        """
+        if self._breaker is None:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(operation)
+            return await self._balance(
+                method,
+                url,
+                operation=operation,
+                long_polling=long_polling,
+                **kwargs,
+            )
+
+        # Calls rejected by the breaker do not spend rate limit tokens
+        probe = self._breaker.before_call(operation)
+        try:
+            if self._rate_limiter is not None:
+                await self._rate_limiter.acquire(operation)
+            started = time.perf_counter()
+            response = await self._balance(
+                method,
+                url,
+                operation=operation,
+                long_polling=long_polling,
+                **kwargs,
+            )
+        except httpx.TransportError:
+            self._breaker.record(operation, failed=True, seconds=None, probe=probe)
+            raise
+        except BaseException:
+            # Cancelled calls say nothing about the endpoint
+            self._breaker.abandon(operation, probe)
+            raise
+
+        self._breaker.record(
+            operation,
+            failed=_is_failure(response.status_code),
+            seconds=None if long_polling else time.perf_counter() - started,
+            probe=probe,
+        )
+        return response
+
+    async def _balance(
+        self,
+        method: str,
+        url: str,
+        *,
+        operation: str,
+        long_polling: bool,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> httpx.Response:
+        """A request that could not connect is sent to another node of the pool"""
+        if self._nodes is None:
+            return await self._send(method, url, operation=operation, **kwargs)
+
+        tried: list[EngineNode] = []
+        while True:
+            node = self._nodes.select(exclude=tried)
+            tried.append(node)
+            started = time.perf_counter()
+            try:
+                response = await self._send(
+                    method,
+                    node.url(url),
+                    operation=operation,
+                    **kwargs,
+                )
+            except httpx.ConnectError:
+                self._nodes.failed(node)
+                if len(tried) < len(self._nodes):
+                    continue
+                raise
+            except httpx.TransportError:
+                self._nodes.failed(node)
+                raise
+
+            if response.status_code in _NODE_FAILURE_STATUSES:
+                self._nodes.failed(node)
+            else:
+                self._nodes.succeeded(
+                    node,
+                    None if long_polling else time.perf_counter() - started,
+                )
+            return response
+
+    async def _send(
+        self,
+        method: str,
+        url: str,
+        *,
+        operation: str,
+        **kwargs: Any,  # noqa: ANN401
+    ) -> httpx.Response:
+        status_code = None
+        started = time.perf_counter()
+        try:
+            response = await self._http_client.request(method, url, **kwargs)
+            status_code = response.status_code
+        finally:
+            self._metrics.observe_request(
+                operation,
+                time.perf_counter() - started,
+                status_code,
+            )
+        return response
@@ -0,0 +1,182 @@
+import time
+from collections import deque
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Literal, TypeAlias
+
+from camunda_client._logger import logger
+from camunda_client.exceptions import CircuitOpenError
+
+CircuitState: TypeAlias = Literal["closed", "open", "half_open"]
+
+# Calls rejected while probes are in flight are retried after this time
+_PROBE_WAIT = 1.0
+
+
+@dataclass(frozen=True, slots=True)
+class CircuitBreakerConfig:
+    # Share of failed calls in the window that opens the circuit
+    failure_rate: float = 0.5
+
+    # Calls slower than this count as failed, latency is not tracked if None
+    slow_call: timedelta | None = None
+
+    # Number of last calls the failure rate is computed on
+    window: int = 20
+
+    # The circuit is not opened before this number of calls in the window
+    min_calls: int = 10
+
+    # Time the circuit stays open before probe calls are let through
+    open_for: timedelta = timedelta(seconds=30)
+
+    # Successful probe calls needed to close the circuit
+    probe_calls: int = 3
+
+
+@dataclass(slots=True)
+class _Circuit:
+    outcomes: deque[bool]
+    state: CircuitState = "closed"
+    opened_at: float = 0.0
+    probes: int = 0
+    probe_successes: int = 0
+    failures: int = 0
+
+    # Incremented every time the circuit becomes half-open,
+    # outcomes of probes admitted in a previous half-open period are ignored
+    generation: int = 0
+
+
+class CircuitBreaker:
+    """
+    Tracks the error rate and latency of every endpoint of the engine.
+
+    When too many calls of an endpoint fail the circuit opens and calls
+    fail fast with `CircuitOpenError`. After `open_for` the circuit is half-open:
+    up to `probe_calls` concurrent calls are let through, the circuit closes
+    after `probe_calls` successful probes and opens again on a failed one.
+
+    `before_call` returns a probe token for calls let through as probes,
+    it has to be passed to `record` / `abandon` of the call.
+    """
+
+    def __init__(self, config: CircuitBreakerConfig | None = None) -> None:
+        self._config = config or CircuitBreakerConfig()
+        self._circuits: dict[str, _Circuit] = {}
+
+    def state(self, endpoint: str) -> CircuitState:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            return "closed"
+        if circuit.state == "open" and self._retry_after(circuit) <= 0:
+            return "half_open"
+        return circuit.state
+
+    def retry_after(self, endpoint: str) -> float:
+        """Seconds until calls to `endpoint` are let through again"""
+        circuit = self._circuits.get(endpoint)
+        if circuit is None or circuit.state != "open":
+            return 0.0
+        return max(0.0, self._retry_after(circuit))
+
+    def before_call(self, endpoint: str) -> int | None:
+        """
+        Raises `CircuitOpenError` if the call should not be sent,
+        returns a probe token if the call is a probe
+        """
+        circuit = self._circuit(endpoint)
+        if circuit.state == "closed":
+            return None
+
+        if circuit.state == "open":
+            retry_after = self._retry_after(circuit)
+            if retry_after > 0:
+                raise CircuitOpenError(endpoint, retry_after)
+            circuit.state = "half_open"
+            circuit.probes = 0
+            circuit.probe_successes = 0
+            circuit.generation += 1
+
+        if circuit.probes >= self._config.probe_calls:
+            raise CircuitOpenError(endpoint, _PROBE_WAIT)
+        circuit.probes += 1
+        return circuit.generation
+
+    def record(
+        self,
+        endpoint: str,
+        *,
+        failed: bool,
+        seconds: float | None,
+        probe: int | None = None,
+    ) -> None:
+        """
+        Records the outcome of a call, `seconds` is None if latency is not tracked,
+        `probe` is the token returned by `before_call`
+        """
+        slow_call = self._config.slow_call
+        if seconds is not None and slow_call is not None:
+            failed = failed or seconds > slow_call.total_seconds()
+
+        circuit = self._circuit(endpoint)
+        if probe is not None:
+            if not _is_current_probe(circuit, probe):
+                return
+            circuit.probes -= 1
+            if failed:
+                self._open(endpoint, circuit)
+                return
+            circuit.probe_successes += 1
+            if circuit.probe_successes >= self._config.probe_calls:
+                logger.info('Circuit of "%s" is closed', endpoint)
+                circuit.state = "closed"
+                circuit.outcomes.clear()
+                circuit.failures = 0
+            return
+
+        if circuit.state != "closed":
+            # A call sent before the circuit was opened
+            return
+
+        if len(circuit.outcomes) == circuit.outcomes.maxlen:
+            circuit.failures -= circuit.outcomes[0]
+        circuit.outcomes.append(failed)
+        circuit.failures += failed
+
+        calls = len(circuit.outcomes)
+        if (
+            calls >= self._config.min_calls
+            and circuit.failures / calls >= self._config.failure_rate
+        ):
+            self._open(endpoint, circuit)
+
+    def abandon(self, endpoint: str, probe: int | None = None) -> None:
+        """Forgets a call that was cancelled before it finished"""
+        circuit = self._circuit(endpoint)
+        if probe is not None and _is_current_probe(circuit, probe):
+            circuit.probes -= 1
+
+    def _circuit(self, endpoint: str) -> _Circuit:
+        circuit = self._circuits.get(endpoint)
+        if circuit is None:
+            circuit = _Circuit(outcomes=deque(maxlen=self._config.window))
+            self._circuits[endpoint] = circuit
+        return circuit
+
+    def _open(self, endpoint: str, circuit: _Circuit) -> None:
+        logger.warning(
+            'Circuit of "%s" is open for %s',
+            endpoint,
+            self._config.open_for,
+        )
+        circuit.state = "open"
+        circuit.opened_at = time.monotonic()
+
+    def _retry_after(self, circuit: _Circuit) -> float:
+        open_until = circuit.opened_at + self._config.open_for.total_seconds()
+        return open_until - time.monotonic()
+
+
+def _is_current_probe(circuit: _Circuit, probe: int) -> bool:
+    return circuit.state == "half_open" and circuit.generation == probe
@@ -0,0 +1,46 @@
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable, Iterator, Sequence
+from typing import TypeVar
+
+from camunda_client._logger import logger
+
+from .dto import BulkResultDTO
+
+TItem = TypeVar("TItem")
+TResult = TypeVar("TResult")
+
+DEFAULT_BULK_CONCURRENCY = 10
+
+
+async def run_bulk(
+    items: Iterable[TItem],
+    call: Callable[[TItem], Awaitable[TResult]],
+    concurrency: int = DEFAULT_BULK_CONCURRENCY,
+) -> Sequence[BulkResultDTO[TItem, TResult]]:
+    """
+    Calls `call` for every item with at most `concurrency` calls at once.
+    Errors are returned with the item instead of aborting the batch,
+    results are in the order of `items`.
+    """
+    if concurrency < 1:
+        msg = "concurrency must be greater than 0"
+        raise ValueError(msg)
+
+    results: dict[int, BulkResultDTO[TItem, TResult]] = {}
+    pending = enumerate(items)
+
+    async def run(pending: Iterator[tuple[int, TItem]]) -> None:
+        for index, item in pending:
+            try:
+                result = await call(item)
+            except Exception as e:  # noqa: BLE001
+                logger.debug("Bulk call failed for %r: %r", item, e)
+                results[index] = BulkResultDTO(item=item, error=e)
+            else:
+                results[index] = BulkResultDTO(item=item, result=result)
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(concurrency):
+            tg.create_task(run(pending))
+
+    return [results[index] for index in range(len(results))]
@@ -1,7 +1,38 @@
 import dataclasses
+from datetime import timedelta
+from typing import Generic, TypeVar
+
+TItem = TypeVar("TItem")
+TResult = TypeVar("TResult")
 
 
 @dataclasses.dataclass(frozen=True, slots=True)
 class AuthData:
     username: str
     password: str = dataclasses.field(repr=False)
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class HTTPConfig:
+    # Upper bound of open connections to the engine
+    max_connections: int = 100
+
+    # Idle connections kept open for reuse
+    max_keepalive_connections: int = 20
+
+    # Idle connections are closed after this time
+    keepalive_expiry: timedelta = timedelta(seconds=30)
+
+    # Multiplex requests over a single connection, requires `camunda-client[http2]`
+    http2: bool = False
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class BulkResultDTO(Generic[TItem, TResult]):
+    item: TItem
+    result: TResult | None = None
+    error: Exception | None = None
+
+    @property
+    def is_success(self) -> bool:
+        return self.error is None
@@ -35,6 +35,7 @@ class CamundaUrls:
     deployment_create = "/deployment/create"
     message_send = "/message"
     process_instances = "/process-instance"
+    delete_process_instances = f"{process_instances}/delete"
     task = "/task"
     tasks_count = f"{task}/count"
     history_task = "/history/task"
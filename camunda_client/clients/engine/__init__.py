@@ -1,3 +1,4 @@
 from .client import CamundaEngineClient
+from .dto import StartProcessDTO
 
-__all__ = ["CamundaEngineClient"]
+__all__ = ["CamundaEngineClient", "StartProcessDTO"]
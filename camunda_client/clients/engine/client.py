@@ -1,15 +1,23 @@
+import functools
 import json
-from collections.abc import Sequence
+from collections.abc import AsyncGenerator, Iterable, Sequence
 from http import HTTPStatus
 from typing import Any
 from typing_extensions import deprecated
 from uuid import UUID
 
 import httpx
+import orjson
 from pydantic.type_adapter import TypeAdapter
 
-from camunda_client.clients.dto import AuthData
+from camunda_client.clients.base import BaseClient
+from camunda_client.clients.breaker import CircuitBreaker
+from camunda_client.clients.bulk import DEFAULT_BULK_CONCURRENCY, run_bulk
+from camunda_client.clients.dto import AuthData, BulkResultDTO
 from camunda_client.clients.endpoints import CamundaUrls
+from camunda_client.clients.nodes import NodePool
+from camunda_client.clients.pagination import DEFAULT_PAGE_SIZE, paginate
+from camunda_client.clients.rate_limit import RateLimiter
 from camunda_client.clients.engine.schemas.body import (
     ClaimTaskSchema,
     HistoricProcessInstanceFilterSchema,
@@ -28,7 +36,9 @@ from camunda_client.clients.engine.schemas.response import (
     HistoricProcessInstanceSchema,
 )
 from camunda_client.clients.schemas import CountSchema, PaginationParams
+from camunda_client.metrics import Metrics
 from camunda_client.types_ import (
+    EncodedVariables,
     TValue,
     TypedVariableValueSchema,
     VariableValueSchema,
@@ -37,6 +47,8 @@ from camunda_client.types_ import (
 from camunda_client.utils import raise_for_status
 
 from .schemas import (
+    BatchSchema,
+    DeleteProcessInstancesSchema,
     GetHistoryTasksFilterSchema,
     GetTasksFilterSchema,
     ProcessInstanceQuerySchema,
@@ -44,7 +56,7 @@ from .schemas import (
     StartProcessInstanceSchema,
     SendCorrelationMessageSchema,
 )
-from .dto import GetTaskVariableDTO, UpdateTaskVariableDTO
+from .dto import GetTaskVariableDTO, StartProcessDTO, UpdateTaskVariableDTO
 
 
 PROCESS_INSTANCE_ADAPTER = TypeAdapter(list[ProcessInstanceSchema])
@@ -55,25 +67,26 @@ VARIABLE_INSTANCE_ADAPTER = TypeAdapter(list[VariableInstanceSchema])
 TASK_IDENTITY_ADAPTER = TypeAdapter(list[TaskIdentitySchema])
 
 
-class CamundaEngineClient:
-    def __init__(
+class CamundaEngineClient(BaseClient):
+    def __init__(  # noqa: PLR0913
         self,
-        base_url: str,
+        base_url: str | Sequence[str] | NodePool,
         auth_data: AuthData,
-        transport: httpx.AsyncHTTPTransport,
+        transport: httpx.AsyncBaseTransport,
         urls: CamundaUrls | None = None,
         timeout: httpx.Timeout | None = None,
+        metrics: Metrics | None = None,
+        breaker: CircuitBreaker | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
-        timeout = timeout or httpx.Timeout(5.0)
-        self._http_client = httpx.AsyncClient(
+        super().__init__(
             base_url=base_url,
+            auth_data=auth_data,
             transport=transport,
-            auth=httpx.BasicAuth(
-                username=auth_data.username,
-                password=auth_data.password,
-            ),
-            headers={"Content-Type": "application/json"},
             timeout=timeout,
+            metrics=metrics,
+            breaker=breaker,
+            rate_limiter=rate_limiter,
         )
         self._urls = urls or CamundaUrls()
 
@@ -81,25 +94,55 @@ class CamundaEngineClient:
         self,
         process_key: str,
         business_key: str | None = None,
-        variables: Variables | None = None,
+        variables: Variables | EncodedVariables | None = None,
         tenant_id: str | None = None,
     ) -> ProcessInstanceSchema:
         """
         Instantiates a given process definition, starts the latest
         version of the process definition which belongs to no tenant.
-        Process variables and business key may be supplied in the request body
+        Process variables and business key may be supplied in the request body,
+        variables may be encoded with `encode_variables` beforehand
         """
 
         url = self._urls.get_start_process_instance(process_key, tenant_id)
-        schema = StartProcessInstanceSchema(
-            business_key=business_key,
-            variables=variables,
+        content: str | bytes
+        if isinstance(variables, EncodedVariables):
+            content = orjson.dumps(
+                {"businessKey": business_key, "variables": variables.fragment},
+            )
+        else:
+            schema = StartProcessInstanceSchema(
+                business_key=business_key,
+                variables=variables,
+            )
+            content = schema.model_dump_json(by_alias=True)
+        response = await self._request(
+            "POST",
+            url,
+            operation="start_process",
+            content=content,
         )
-        content = schema.model_dump_json(by_alias=True)
-        response = await self._http_client.post(url, content=content)
         raise_for_status(response)
         return ProcessInstanceSchema.model_validate(response.json())
 
+    async def start_processes(
+        self,
+        processes: Iterable[StartProcessDTO],
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    ) -> Sequence[BulkResultDTO[StartProcessDTO, ProcessInstanceSchema]]:
+        """Starts processes with at most `concurrency` requests at once"""
+
+        async def start(process: StartProcessDTO) -> ProcessInstanceSchema:
+            return await self.start_process(
+                process.process_key,
+                business_key=process.business_key,
+                variables=process.variables,
+                tenant_id=process.tenant_id,
+            )
+
+        return await run_bulk(processes, start, concurrency=concurrency)
+
     async def get_process_instances(
         self,
         params: ProcessInstanceQuerySchema,
@@ -111,8 +154,10 @@ class CamundaEngineClient:
         retrieved by using the Get Instance Count method
         """
 
-        response = await self._http_client.get(
+        response = await self._request(
+            "GET",
             self._urls.process_instances,
+            operation="get_process_instances",
             params=params.model_dump(
                 mode="json",
                 by_alias=True,
@@ -126,12 +171,55 @@ class CamundaEngineClient:
         """Deletes a running process instance by id"""
 
         url = self._urls.get_process_instance(process_instance_id)
-        response = await self._http_client.delete(
+        response = await self._request(
+            "DELETE",
             url,
+            operation="delete_process",
             params={"skipCustomListeners": "true", "skipIoMappings": "true"},
         )
         raise_for_status(response)
 
+    async def delete_processes(
+        self,
+        process_instance_ids: Iterable[str],
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    ) -> Sequence[BulkResultDTO[str, None]]:
+        """
+        Deletes running process instances one by one
+        with at most `concurrency` requests at once.
+        See `delete_processes_async` to delete many instances in the engine.
+        """
+        return await run_bulk(
+            process_instance_ids,
+            self.delete_process,
+            concurrency=concurrency,
+        )
+
+    async def delete_processes_async(
+        self,
+        process_instance_ids: Sequence[str],
+        delete_reason: str | None = None,
+    ) -> BatchSchema:
+        """
+        Deletes running process instances asynchronously with a batch job
+        of the engine, returns the created batch
+        """
+        schema = DeleteProcessInstancesSchema(
+            process_instance_ids=list(process_instance_ids),
+            delete_reason=delete_reason,
+            skip_custom_listeners=True,
+            skip_io_mappings=True,
+        )
+        response = await self._request(
+            "POST",
+            self._urls.delete_process_instances,
+            operation="delete_processes_async",
+            content=schema.model_dump_json(by_alias=True, exclude_none=True),
+        )
+        raise_for_status(response)
+        return BatchSchema.model_validate(response.json())
+
     async def get_tasks(
         self,
         schema: GetTasksFilterSchema | None = None,
@@ -143,18 +231,36 @@ class CamundaEngineClient:
             pagination.model_dump(mode="json", by_alias=True) if pagination else {}
         )
 
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.task,
+            operation="get_tasks",
             params=pagination_params,
             content=schema.model_dump_json(by_alias=True, exclude_unset=True),
         )
         raise_for_status(response)
         return TASK_ADAPTER.validate_python(response.json())
 
+    def iter_tasks(
+        self,
+        schema: GetTasksFilterSchema | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncGenerator[TaskSchema, None]:
+        """
+        Iterates over tasks that fulfill a given filter.
+        Pages are requested lazily and the next page is prefetched, see `paginate`.
+        """
+        return paginate(
+            functools.partial(self.get_tasks, schema),
+            page_size=page_size,
+        )
+
     async def update_task(self, task_id: UUID, *, schema: TaskSchema) -> None:
         """Updates a task"""
-        response = await self._http_client.put(
+        response = await self._request(
+            "PUT",
             self._urls.task_by_id(task_id),
+            operation="update_task",
             content=schema.model_dump_json(by_alias=True),
         )
         raise_for_status(response)
@@ -168,8 +274,10 @@ class CamundaEngineClient:
         Corresponds to the size of the result set of the Get Tasks (POST) method and takes the same parameters.
         """
         schema = schema or GetTasksFilterSchema()
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.tasks_count,
+            operation="get_tasks_count",
             content=schema.model_dump_json(by_alias=True, exclude_unset=True),
         )
         raise_for_status(response)
@@ -182,7 +290,7 @@ class CamundaEngineClient:
         """Retrieves a task by id"""
 
         url = self._urls.task_by_id(str(ident))
-        response = await self._http_client.get(url)
+        response = await self._request("GET", url, operation="get_task")
 
         if response.status_code == HTTPStatus.NOT_FOUND:
             return None
@@ -199,14 +307,30 @@ class CamundaEngineClient:
             pagination.model_dump(mode="json", by_alias=True) if pagination else {}
         )
 
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.history_task,
+            operation="get_history_tasks",
             params=pagination_params,
             content=schema.model_dump_json(by_alias=True),
         )
         raise_for_status(response)
         return HISTORIC_TASK_INSTANCE_ADAPTER.validate_python(response.json())
 
+    def iter_history_tasks(
+        self,
+        schema: GetHistoryTasksFilterSchema,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncGenerator[HistoricTaskInstanceSchema, None]:
+        """
+        Iterates over historic tasks that fulfill a given filter.
+        Pages are requested lazily and the next page is prefetched, see `paginate`.
+        """
+        return paginate(
+            functools.partial(self.get_history_tasks, schema),
+            page_size=page_size,
+        )
+
     async def get_history_process_instances(
         self,
         schema: HistoricProcessInstanceFilterSchema,
@@ -216,22 +340,40 @@ class CamundaEngineClient:
             pagination.model_dump(mode="json", by_alias=True) if pagination else {}
         )
 
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.history_process_instance,
+            operation="get_history_process_instances",
             params=pagination_params,
             content=schema.model_dump_json(by_alias=True),
         )
         raise_for_status(response)
         return HISTORIC_PROCESS_INSTANCE_ADAPTER.validate_python(response.json())
 
+    def iter_history_process_instances(
+        self,
+        schema: HistoricProcessInstanceFilterSchema,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncGenerator[HistoricProcessInstanceSchema, None]:
+        """
+        Iterates over historic process instances that fulfill a given filter.
+        Pages are requested lazily and the next page is prefetched, see `paginate`.
+        """
+        return paginate(
+            functools.partial(self.get_history_process_instances, schema),
+            page_size=page_size,
+        )
+
     async def get_history_process_instance(
         self,
         process_instance_id: UUID,
     ) -> HistoricProcessInstanceSchema | None:
         """Retrieves a historic process instance by id, according to the HistoricProcessInstance interface in the engine."""
 
-        response = await self._http_client.get(
+        response = await self._request(
+            "GET",
             self._urls.get_history_process_instance(process_instance_id),
+            operation="get_history_process_instance",
         )
         if response.status_code == HTTPStatus.NOT_FOUND:
             return None
@@ -250,8 +392,10 @@ class CamundaEngineClient:
     ) -> Sequence[VariableInstanceSchema]:
         """Queries for historic variable instances that fulfill the given parameters."""
 
-        response = await self._http_client.get(
+        response = await self._request(
+            "GET",
             self._urls.history_variable_instances,
+            operation="get_variable_instances",
             params={
                 "processInstanceId": str(process_instance_id),
                 "deserializeValues": deserialize_values,
@@ -273,8 +417,10 @@ class CamundaEngineClient:
         pagination_params = (
             pagination.model_dump(mode="json", by_alias=True) if pagination else {}
         )
-        response = await self._http_client.get(
+        response = await self._request(
+            "GET",
             self._urls.history_variable_instances,
+            operation="get_history_variable_instances",
             params={
                 **pagination_params,
                 **filter_.model_dump(mode="json", by_alias=True, exclude_unset=True),
@@ -283,6 +429,20 @@ class CamundaEngineClient:
         raise_for_status(response)
         return VARIABLE_INSTANCE_ADAPTER.validate_python(response.json())
 
+    def iter_history_variable_instances(
+        self,
+        filter_: HistoryVariableInstanceFilterParamsSchema | None = None,
+        page_size: int = DEFAULT_PAGE_SIZE,
+    ) -> AsyncGenerator[VariableInstanceSchema, None]:
+        """
+        Iterates over historic variable instances that fulfill the given parameters.
+        Pages are requested lazily and the next page is prefetched, see `paginate`.
+        """
+        return paginate(
+            functools.partial(self.get_history_variable_instances, filter_),
+            page_size=page_size,
+        )
+
     async def get_history_variable_instances_post(
         self,
         filter_: HistoryVariableInstanceFilterSchema | None = None,
@@ -296,8 +456,10 @@ class CamundaEngineClient:
         pagination_params = (
             pagination.model_dump(mode="json", by_alias=True) if pagination else {}
         )
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.history_variable_instances,
+            operation="get_history_variable_instances_post",
             params={"deserializeValues": deserialize_values, **pagination_params},
             content=filter_.model_dump_json(by_alias=True, exclude_unset=True),
         )
@@ -315,8 +477,10 @@ class CamundaEngineClient:
         So, if a variable is updated AND deleted, the deletion overrides the update
         """
 
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.update_process_instance_variables(str(process_instance_id)),
+            operation="update_variable_instances",
             content=schema.model_dump_json(by_alias=True, exclude_unset=True),
         )
         raise_for_status(response)
@@ -338,8 +502,10 @@ class CamundaEngineClient:
                 },
             },
         )
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.submit_task_form(str(task_id)),
+            operation="submit_task_form",
             content=content,
         )
         raise_for_status(response)
@@ -352,14 +518,30 @@ class CamundaEngineClient:
         """
         Claims a task for a specific user.
         """
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.claim_task(str(task_id)),
+            operation="claim_task",
             content=ClaimTaskSchema(user_id=str(user_id)).model_dump_json(
                 by_alias=True,
             ),
         )
         raise_for_status(response)
 
+    async def claim_tasks(
+        self,
+        task_ids: Iterable[UUID],
+        user_id: UUID,
+        *,
+        concurrency: int = DEFAULT_BULK_CONCURRENCY,
+    ) -> Sequence[BulkResultDTO[UUID, None]]:
+        """Claims tasks for a user with at most `concurrency` requests at once"""
+        return await run_bulk(
+            task_ids,
+            functools.partial(self.claim_task, user_id=user_id),
+            concurrency=concurrency,
+        )
+
     async def unclaim_task(
         self,
         task_id: UUID,
@@ -367,7 +549,11 @@ class CamundaEngineClient:
         """
         Claims a task for a specific user.
         """
-        response = await self._http_client.post(self._urls.unclaim_task(str(task_id)))
+        response = await self._request(
+            "POST",
+            self._urls.unclaim_task(str(task_id)),
+            operation="unclaim_task",
+        )
         raise_for_status(response)
 
     async def set_assignee_task(
@@ -378,8 +564,10 @@ class CamundaEngineClient:
         """
         Changes the assignee of a task to a specific user.
         """
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.set_assignee_task(str(task_id)),
+            operation="set_assignee_task",
             content=SetAssigneeTaskSchema(user_id=str(user_id)).model_dump_json(
                 by_alias=True,
             ),
@@ -394,8 +582,10 @@ class CamundaEngineClient:
         Correlates a message to the process engine to either trigger
         a message start event or an intermediate message catching event.
         """
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             self._urls.message_send,
+            operation="send_correlation_message",
             content=schema.model_dump_json(by_alias=True, exclude_unset=True),
         )
         raise_for_status(response)
@@ -415,8 +605,10 @@ class CamundaEngineClient:
             url_resolver = self._urls.local_task_variable
 
         url = url_resolver(task_id=str(dto.task_id), variable_name=dto.variable_name)
-        return await self._http_client.get(
+        return await self._request(
+            "GET",
             url,
+            operation="get_task_variable",
             params={"deserializeValue": dto.deserialize_value},
         )
 
@@ -472,7 +664,12 @@ class CamundaEngineClient:
             variable_name=dto.variable_name,
         )
         content = dto.variable.model_dump_json(by_alias=True)
-        response = await self._http_client.put(url, content=content)
+        response = await self._request(
+            "PUT",
+            url,
+            operation="update_task_variable",
+            content=content,
+        )
         raise_for_status(response)
 
     async def get_identity_links(
@@ -480,6 +677,6 @@ class CamundaEngineClient:
         task_id: UUID,
     ) -> list[TaskIdentitySchema]:
         url = self._urls.identity_links(str(task_id))
-        response = await self._http_client.get(url)
+        response = await self._request("GET", url, operation="get_identity_links")
         raise_for_status(response)
         return TASK_IDENTITY_ADAPTER.validate_python(response.json())
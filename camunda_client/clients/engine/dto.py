@@ -1,7 +1,7 @@
 from dataclasses import dataclass
 from uuid import UUID
 
-from camunda_client.types_ import VariableValueSchema
+from camunda_client.types_ import EncodedVariables, Variables, VariableValueSchema
 
 
 @dataclass(frozen=True, slots=True)
@@ -18,3 +18,11 @@ class UpdateTaskVariableDTO:
     variable_name: str
     variable: VariableValueSchema
     is_local_variable: bool = False
+
+
+@dataclass(frozen=True, slots=True)
+class StartProcessDTO:
+    process_key: str
+    business_key: str | None = None
+    variables: Variables | EncodedVariables | None = None
+    tenant_id: str | None = None
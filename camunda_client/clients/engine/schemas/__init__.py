@@ -1,4 +1,5 @@
 from .body import (
+    DeleteProcessInstancesSchema,
     GetHistoryTasksFilterSchema,
     GetTasksFilterSchema,
     StartProcessInstanceSchema,
@@ -6,6 +7,7 @@ from .body import (
 )
 from .query import ProcessInstanceQuerySchema
 from .response import (
+    BatchSchema,
     HistoricTaskInstanceSchema,
     LinkSchema,
     ProcessDefinitionSchema,
@@ -17,6 +19,8 @@ from .response import (
 
 
 __all__ = [
+    "BatchSchema",
+    "DeleteProcessInstancesSchema",
     "GetHistoryTasksFilterSchema",
     "GetTasksFilterSchema",
     "HistoricTaskInstanceSchema",
@@ -18,6 +18,14 @@ class StartProcessInstanceSchema(BaseSchema):
     variables: Variables | None = None
 
 
+class DeleteProcessInstancesSchema(BaseSchema):
+    process_instance_ids: list[str]
+    delete_reason: str | None = None
+    skip_custom_listeners: bool | None = None
+    skip_io_mappings: bool | None = None
+    skip_subprocesses: bool | None = None
+
+
 class ClaimTaskSchema(BaseSchema):
     user_id: str
 
@@ -32,6 +32,21 @@ class ProcessInstanceSchema(BaseSchema):
     tenant_id: str | None = None
 
 
+class BatchSchema(BaseSchema):
+    id: str
+    type: str | None = None
+    total_jobs: int | None = None
+    jobs_created: int | None = None
+    batch_jobs_per_seed: int | None = None
+    invocations_per_batch_job: int | None = None
+    seed_job_definition_id: str | None = None
+    monitor_job_definition_id: str | None = None
+    batch_job_definition_id: str | None = None
+    suspended: bool | None = None
+    tenant_id: str | None = None
+    create_user_id: str | None = None
+
+
 class HistoricProcessInstanceSchema(BaseSchema):
     id: UUID
     root_process_instance_id: UUID | None = None
@@ -1,7 +1,8 @@
 from .client import ExternalTaskClient
-from .dto import ExternalTaskConfig
+from .dto import ExternalTaskConfig, FetchTopicDTO
 
 __all__ = [
     "ExternalTaskClient",
     "ExternalTaskConfig",
+    "FetchTopicDTO",
 ]
@@ -1,15 +1,25 @@
-from collections.abc import Sequence
+from collections.abc import Hashable, Sequence
 from datetime import timedelta
 
 import httpx
+import orjson
 from pydantic import TypeAdapter
 
+from camunda_client.clients.base import BaseClient
+from camunda_client.clients.breaker import CircuitBreaker
 from camunda_client.clients.dto import AuthData
 from camunda_client.clients.endpoints import CamundaUrls
-from camunda_client.types_ import Variables
-from camunda_client.utils import camunda_timedelta, raise_for_status
+from camunda_client.clients.nodes import NodePool
+from camunda_client.clients.rate_limit import RateLimiter
+from camunda_client.metrics import Metrics
+from camunda_client.types_ import EncodedVariables, Variables
+from camunda_client.utils import (
+    camunda_timedelta,
+    raise_for_status,
+    variables_fragment,
+)
 
-from .dto import ExternalTaskConfig
+from .dto import ExternalTaskConfig, FetchTopicDTO
 from .schemas import (
     CompleteExternalTaskSchema,
     ExtendLockOnExternalTaskSchema,
@@ -22,84 +32,224 @@ from .schemas.response import ExternalTaskSchema
 
 ADAPTER = TypeAdapter(list[ExternalTaskSchema])
 
+# Upper bound of cached fetchAndLock bodies, one per set of topics and options
+_FETCH_TEMPLATES_SIZE = 128
+
+_MAX_TASKS_PLACEHOLDER = b'"maxTasks":0'
+
+
+def _fetch_topic(topic: str | FetchTopicDTO) -> FetchTopicDTO:
+    if isinstance(topic, FetchTopicDTO):
+        return topic
+    return FetchTopicDTO(topic_name=topic)
+
+
+def _topic_key(topic: FetchTopicDTO) -> Hashable:
+    variables = tuple(topic.variables) if topic.variables is not None else None
+    return topic.topic_name, variables, topic.local_variables
+
+
+class _FetchBodyTemplate:
+    """Serialized fetchAndLock body, `maxTasks` is filled in on render"""
+
+    __slots__ = ("_prefix", "_suffix")
+
+    def __init__(self, schema: FetchExternalTasksSchema) -> None:
+        content = schema.model_dump_json(by_alias=True, exclude_unset=True).encode()
+        # The placeholder can't occur inside a JSON string, quotes are escaped there
+        prefix, _, suffix = content.partition(_MAX_TASKS_PLACEHOLDER)
+        self._prefix = prefix + b'"maxTasks":'
+        self._suffix = suffix
 
-class ExternalTaskClient:
+    def render(self, max_tasks: int) -> bytes:
+        return b"%s%d%s" % (self._prefix, max_tasks, self._suffix)
+
+
+class ExternalTaskClient(BaseClient):
     def __init__(  # noqa: PLR0913
         self,
         worker_id: str,
-        base_url: str,
+        base_url: str | Sequence[str] | NodePool,
         auth_data: AuthData,
-        transport: httpx.AsyncHTTPTransport,
+        transport: httpx.AsyncBaseTransport,
         config: ExternalTaskConfig | None = None,
         urls: CamundaUrls | None = None,
+        metrics: Metrics | None = None,
+        breaker: CircuitBreaker | None = None,
+        rate_limiter: RateLimiter | None = None,
     ) -> None:
-        self._worker_id = worker_id
-        self._http_client = httpx.AsyncClient(
+        super().__init__(
             base_url=base_url,
+            auth_data=auth_data,
             transport=transport,
-            auth=httpx.BasicAuth(
-                username=auth_data.username,
-                password=auth_data.password,
-            ),
-            headers={"Content-Type": "application/json"},
+            metrics=metrics,
+            breaker=breaker,
+            rate_limiter=rate_limiter,
         )
+        self._worker_id = worker_id
         self._urls = urls or CamundaUrls()
         self._config = config or ExternalTaskConfig()
+        self._fetch_templates: dict[Hashable, _FetchBodyTemplate] = {}
 
-    async def fetch_and_lock(
+    @property
+    def config(self) -> ExternalTaskConfig:
+        return self._config
+
+    async def fetch_and_lock(  # noqa: PLR0913
         self,
-        topic_names: Sequence[str],
+        topic_names: Sequence[str | FetchTopicDTO],
         business_key: str | None = None,
         process_variables: Variables | None = None,
         lock_timeout: timedelta | None = None,
+        max_tasks: int | None = None,
+        use_priority: bool | None = None,
     ) -> Sequence[ExternalTaskSchema]:
-        url = self._urls.external_task.fetch_and_lock
-        topics = [
-            FetchExternalTaskTopicSchema(
-                topic_name=topic_name,
-                lock_duration=camunda_timedelta(self._config.lock_duration),
-                process_variables=process_variables,
-                business_key=business_key,
-                variables=None,
-                has_local_variables=None,
+        content = await self.fetch_and_lock_json(
+            topic_names=topic_names,
+            business_key=business_key,
+            process_variables=process_variables,
+            lock_timeout=lock_timeout,
+            max_tasks=max_tasks,
+            use_priority=use_priority,
+        )
+        return ADAPTER.validate_json(content)
+
+    async def fetch_and_lock_json(  # noqa: PLR0913
+        self,
+        topic_names: Sequence[str | FetchTopicDTO],
+        business_key: str | None = None,
+        process_variables: Variables | None = None,
+        lock_timeout: timedelta | None = None,
+        max_tasks: int | None = None,
+        use_priority: bool | None = None,
+    ) -> bytes:
+        """
+        Does the same thing as `fetch_and_lock`, except it returns raw response body,
+        so it can be validated with `TypeAdapter.validate_json` into any model
+        """
+        async_response_timeout = lock_timeout or self._config.async_response_timeout
+        template = self._fetch_template(
+            topic_names=topic_names,
+            business_key=business_key,
+            process_variables=process_variables,
+            async_response_timeout=async_response_timeout,
+            use_priority=use_priority,
+        )
+        response = await self._request(
+            "POST",
+            self._urls.external_task.fetch_and_lock,
+            operation="fetch_and_lock",
+            long_polling=True,
+            content=template.render(max_tasks or self._config.max_tasks),
+            timeout=self._long_polling_timeout(async_response_timeout),
+        )
+        raise_for_status(response)
+        return response.content
+
+    def _fetch_template(
+        self,
+        topic_names: Sequence[str | FetchTopicDTO],
+        business_key: str | None,
+        process_variables: Variables | None,
+        async_response_timeout: timedelta,
+        use_priority: bool | None,
+    ) -> _FetchBodyTemplate:
+        """
+        Bodies are cached per set of topics and options, the worker repeats
+        the same few between fetches. Bodies filtered by `process_variables`
+        are not cached.
+        """
+        topics = [_fetch_topic(topic) for topic in topic_names]
+        key = None
+        if process_variables is None:
+            key = (
+                tuple(map(_topic_key, topics)),
+                business_key,
+                async_response_timeout,
+                use_priority,
             )
-            for topic_name in topic_names
-        ]
+            if template := self._fetch_templates.get(key):
+                return template
+
+        lock_duration = camunda_timedelta(self._config.lock_duration)
         schema = FetchExternalTasksSchema(
             worker_id=self._worker_id,
-            max_tasks=self._config.max_tasks,
-            lock_timeout=camunda_timedelta(
-                lock_timeout or self._config.async_response_timeout,
-            ),
-            topics=topics,
+            max_tasks=0,
+            use_priority=use_priority,
+            lock_timeout=camunda_timedelta(async_response_timeout),
+            topics=[
+                FetchExternalTaskTopicSchema(
+                    topic_name=topic.topic_name,
+                    lock_duration=lock_duration,
+                    process_variables=process_variables,
+                    business_key=business_key,
+                    variables=(
+                        list(topic.variables) if topic.variables is not None else None
+                    ),
+                    has_local_variables=topic.local_variables,
+                )
+                for topic in topics
+            ],
         )
-        try:
-            response = await self._http_client.post(
-                url,
-                content=schema.model_dump_json(by_alias=True, exclude_unset=True),
-                timeout=60,
-            )
-        except httpx.ReadTimeout:
-            return []
+        template = _FetchBodyTemplate(schema)
+        if key is not None:
+            if len(self._fetch_templates) >= _FETCH_TEMPLATES_SIZE:
+                del self._fetch_templates[next(iter(self._fetch_templates))]
+            self._fetch_templates[key] = template
+        return template
 
-        raise_for_status(response)
-        return ADAPTER.validate_python(response.json())
+    def _long_polling_timeout(
+        self,
+        async_response_timeout: timedelta,
+    ) -> httpx.Timeout:
+        """
+        The engine holds the fetch request for up to `async_response_timeout`,
+        the read timeout of the client is added on top of it
+        """
+        timeout = self._http_client.timeout
+        if timeout.read is None:
+            return timeout
+        return httpx.Timeout(
+            connect=timeout.connect,
+            read=timeout.read + async_response_timeout.total_seconds(),
+            write=timeout.write,
+            pool=timeout.pool,
+        )
 
     async def complete(
         self,
         task_id: str,
         *,
-        global_variables: Variables | None = None,
-        local_variables: Variables | None = None,
+        global_variables: Variables | EncodedVariables | None = None,
+        local_variables: Variables | EncodedVariables | None = None,
     ) -> None:
+        """Variables may be encoded with `encode_variables` beforehand"""
         url = self._urls.external_task.complete(task_id)
-        schema = CompleteExternalTaskSchema(
-            worker_id=self._worker_id,
-            variables=global_variables,
-            local_variables=local_variables,
+        content: str | bytes
+        if isinstance(global_variables, EncodedVariables) or isinstance(
+            local_variables,
+            EncodedVariables,
+        ):
+            content = orjson.dumps(
+                {
+                    "workerId": self._worker_id,
+                    "variables": variables_fragment(global_variables or {}),
+                    "localVariables": variables_fragment(local_variables or {}),
+                },
+            )
+        else:
+            schema = CompleteExternalTaskSchema(
+                worker_id=self._worker_id,
+                variables=global_variables,
+                local_variables=local_variables,
+            )
+            content = schema.model_dump_json(by_alias=True, exclude_unset=True)
+        response = await self._request(
+            "POST",
+            url,
+            operation="complete",
+            content=content,
         )
-        content = schema.model_dump_json(by_alias=True, exclude_unset=True)
-        response = await self._http_client.post(url, content=content)
         raise_for_status(response)
 
     async def failure(
@@ -119,8 +269,10 @@ class ExternalTaskClient:
             error_details=error_details,
         )
 
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             url,
+            operation="failure",
             content=schema.model_dump_json(
                 by_alias=True,
                 exclude_unset=True,
@@ -140,8 +292,10 @@ class ExternalTaskClient:
             new_duration=new_duration or camunda_timedelta(self._config.lock_duration),
         )
 
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             url,
+            operation="extend_lock",
             content=schema.model_dump_json(
                 by_alias=True,
                 exclude_unset=True,
@@ -151,7 +305,7 @@ class ExternalTaskClient:
 
     async def unlock(self, task_id: str) -> None:
         url = self._urls.external_task.unlock(task_id)
-        response = await self._http_client.post(url)
+        response = await self._request("POST", url, operation="unlock")
         raise_for_status(response)
 
     async def bpmn_error(
@@ -168,8 +322,10 @@ class ExternalTaskClient:
             error_message=error_message,
             variables=variables,
         )
-        response = await self._http_client.post(
+        response = await self._request(
+            "POST",
             url,
+            operation="bpmn_error",
             content=schema.model_dump_json(
                 by_alias=True,
                 exclude_unset=True,
@@ -1,3 +1,4 @@
+from collections.abc import Sequence
 from dataclasses import dataclass
 from datetime import timedelta
 
@@ -17,3 +18,16 @@ class ExternalTaskConfig:
     sleep_seconds: timedelta = timedelta(seconds=30)
 
     auto_extend_lock: bool = False
+
+    lock_extension_margin: timedelta = timedelta(seconds=10)
+
+
+@dataclass(frozen=True, slots=True)
+class FetchTopicDTO:
+    topic_name: str
+
+    # Names of variables to fetch, all variables are fetched if None
+    variables: Sequence[str] | None = None
+
+    # Fetch only local variables of the task execution
+    local_variables: bool | None = None
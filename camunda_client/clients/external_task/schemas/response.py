@@ -1,8 +1,8 @@
-from typing import Any
+from functools import cached_property
 
 from camunda_client.clients.types_ import SerializedDateTime
 from camunda_client.types_ import BaseSchema, Variables
-from camunda_client.utils import process_variable
+from camunda_client.utils import ParsedVariables
 
 
 class ExternalTaskSchema(BaseSchema):
@@ -25,6 +25,6 @@ class ExternalTaskSchema(BaseSchema):
     business_key: str | None = None
     variables: Variables
 
-    @property
-    def parsed_variables(self) -> dict[str, Any]:
-        return {key: process_variable(schema) for key, schema in self.variables.items()}
+    @cached_property
+    def parsed_variables(self) -> ParsedVariables:
+        return ParsedVariables(self.variables)
@@ -0,0 +1,93 @@
+import itertools
+import time
+from collections.abc import Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Literal, TypeAlias
+
+BalancingStrategy: TypeAlias = Literal["round_robin", "least_latency"]
+
+
+@dataclass(slots=True, eq=False)
+class EngineNode:
+    base_url: str
+
+    # Exponentially weighted moving average of response time, in seconds
+    latency: float = 0.0
+
+    # Consecutive failed requests
+    failures: int = 0
+
+    # Monotonic time until which the node is not selected
+    ejected_until: float = 0.0
+
+    def url(self, path: str) -> str:
+        return f"{self.base_url.rstrip('/')}{path}"
+
+
+class NodePool:
+    """
+    Engine REST nodes sharing one database.
+
+    Requests are spread round-robin or to the node with the least latency.
+    A node is ejected for `eject_for` after `max_failures` consecutive failures,
+    after that it gets requests again and is ejected once more if they fail.
+    """
+
+    def __init__(
+        self,
+        base_urls: Sequence[str],
+        strategy: BalancingStrategy = "round_robin",
+        max_failures: int = 3,
+        eject_for: timedelta = timedelta(seconds=30),
+    ) -> None:
+        if not base_urls:
+            msg = "At least one engine node is required"
+            raise ValueError(msg)
+
+        self.nodes = [EngineNode(base_url) for base_url in base_urls]
+        self._strategy = strategy
+        self._max_failures = max_failures
+        self._eject_for = eject_for.total_seconds()
+        self._round_robin = itertools.cycle(self.nodes)
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def select(self, exclude: Sequence[EngineNode] = ()) -> EngineNode:
+        """
+        Returns a healthy node not in `exclude`,
+        the node that is released first if every node is ejected
+        """
+        now = time.monotonic()
+        healthy = [
+            node
+            for node in self.nodes
+            if node.ejected_until <= now and node not in exclude
+        ]
+        if not healthy:
+            candidates = [node for node in self.nodes if node not in exclude]
+            return min(candidates or self.nodes, key=lambda node: node.ejected_until)
+
+        if self._strategy == "least_latency":
+            return min(healthy, key=lambda node: node.latency)
+
+        for node in self._round_robin:
+            if node in healthy:
+                return node
+        raise AssertionError  # pragma: no cover
+
+    def succeeded(self, node: EngineNode, seconds: float | None) -> None:
+        """`seconds` is None if the response time says nothing about the node"""
+        node.failures = 0
+        node.ejected_until = 0.0
+        if seconds is None:
+            return
+        if node.latency:
+            seconds = 0.8 * node.latency + 0.2 * seconds
+        node.latency = seconds
+
+    def failed(self, node: EngineNode) -> None:
+        node.failures += 1
+        if node.failures >= self._max_failures:
+            node.ejected_until = time.monotonic() + self._eject_for
@@ -0,0 +1,48 @@
+import asyncio
+from collections.abc import AsyncGenerator, Awaitable, Callable, Sequence
+from typing import TypeVar
+
+from camunda_client.clients.schemas import PaginationParams
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 500
+
+
+async def paginate(
+    get_page: Callable[[PaginationParams], Awaitable[Sequence[T]]],
+    page_size: int = DEFAULT_PAGE_SIZE,
+) -> AsyncGenerator[T, None]:
+    """
+    Yields items of every page returned by `get_page`.
+    The next page is requested while the current one is consumed,
+    so at most two pages are kept in memory.
+    A page shorter than `page_size` is the last one.
+
+    Offset pagination skips or repeats items if the result set changes
+    between requests, sort the query by a stable key when possible.
+    """
+    if page_size < 1:
+        msg = "page_size must be greater than 0"
+        raise ValueError(msg)
+
+    def request(offset: int) -> asyncio.Future[Sequence[T]]:
+        return asyncio.ensure_future(
+            get_page(PaginationParams(limit=page_size, offset=offset)),
+        )
+
+    offset = 0
+    next_page: asyncio.Future[Sequence[T]] | None = request(offset)
+    try:
+        while next_page is not None:
+            page = await next_page
+            next_page = None
+            if len(page) >= page_size:
+                offset += page_size
+                next_page = request(offset)
+
+            for item in page:
+                yield item
+    finally:
+        if next_page is not None:
+            next_page.cancel()
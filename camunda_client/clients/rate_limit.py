@@ -0,0 +1,86 @@
+import asyncio
+import time
+from collections.abc import Mapping
+from dataclasses import dataclass
+from typing import Literal, TypeAlias
+
+EndpointGroup: TypeAlias = Literal["fetch", "complete", "engine", "history"]
+
+# Operations that are not listed belong to the "engine" group
+_OPERATION_GROUPS: Mapping[str, EndpointGroup] = {
+    "fetch_and_lock": "fetch",
+    # Task scoped calls of the external task client
+    "complete": "complete",
+    "failure": "complete",
+    "bpmn_error": "complete",
+    "extend_lock": "complete",
+    "unlock": "complete",
+    # Calls of the history service, `/history/...`
+    "get_history_tasks": "history",
+    "get_history_process_instances": "history",
+    "get_history_process_instance": "history",
+    "get_variable_instances": "history",
+    "get_history_variable_instances": "history",
+    "get_history_variable_instances_post": "history",
+}
+
+
+def endpoint_group(operation: str) -> EndpointGroup:
+    return _OPERATION_GROUPS.get(operation, "engine")
+
+
+@dataclass(frozen=True, slots=True)
+class RateLimit:
+    # Sustained number of requests per second
+    rate: float
+
+    # Number of requests that may be sent at once after a quiet period
+    burst: int = 1
+
+
+class TokenBucket:
+    """Waiters get tokens in the order they started waiting"""
+
+    def __init__(self, limit: RateLimit) -> None:
+        if limit.rate <= 0 or limit.burst < 1:
+            msg = "rate must be positive and burst must be at least 1"
+            raise ValueError(msg)
+
+        self._rate = limit.rate
+        self._burst = limit.burst
+        self._tokens = float(limit.burst)
+        self._updated_at = time.monotonic()
+        # asyncio.Lock wakes up waiters in FIFO order
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                await asyncio.sleep((1 - self._tokens) / self._rate)
+                self._refill()
+            self._tokens -= 1
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(
+            self._burst,
+            self._tokens + (now - self._updated_at) * self._rate,
+        )
+        self._updated_at = now
+
+
+class RateLimiter:
+    """
+    Limits requests to the engine per endpoint group,
+    groups without a limit are not limited.
+    Share an instance between clients to share the budget.
+    """
+
+    def __init__(self, limits: Mapping[EndpointGroup, RateLimit]) -> None:
+        self._buckets = {group: TokenBucket(limit) for group, limit in limits.items()}
+
+    async def acquire(self, operation: str) -> None:
+        bucket = self._buckets.get(endpoint_group(operation))
+        if bucket is not None:
+            await bucket.acquire()
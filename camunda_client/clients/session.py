@@ -0,0 +1,57 @@
+from types import TracebackType
+from typing import Self
+
+import httpx
+
+from .dto import HTTPConfig
+
+
+class _SharedTransport(httpx.AsyncBaseTransport):
+    """Transport of a client that does not close the shared connection pool"""
+
+    def __init__(self, transport: httpx.AsyncBaseTransport) -> None:
+        self._transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._transport.handle_async_request(request)
+
+    async def aclose(self) -> None:
+        pass
+
+
+class HTTPSessionFactory:
+    """
+    Owns a connection pool shared by every client created with its `transport`.
+    Closing a client does not close the pool, the pool is closed with the factory.
+    """
+
+    def __init__(self, config: HTTPConfig | None = None) -> None:
+        config = config or HTTPConfig()
+        self._transport = httpx.AsyncHTTPTransport(
+            limits=httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry.total_seconds(),
+            ),
+            http2=config.http2,
+        )
+        self._shared = _SharedTransport(self._transport)
+
+    @property
+    def transport(self) -> httpx.AsyncBaseTransport:
+        return self._shared
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+    async def __aenter__(self) -> Self:
+        await self._transport.__aenter__()
+        return self
+
+    async def __aexit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        await self.aclose()
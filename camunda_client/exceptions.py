@@ -15,3 +15,17 @@ class CamundaClientError(Exception):
 
 class InvalidStateError(Exception):
     pass
+
+
+class CircuitOpenError(Exception):
+    """The engine endpoint is failing, calls are rejected without sending them"""
+
+    def __init__(self, endpoint: str, retry_after: float) -> None:
+        self.endpoint = endpoint
+        self.retry_after = retry_after
+
+    def __str__(self) -> str:
+        return (
+            f'Circuit of "{self.endpoint}" is open, '
+            f"retry after {self.retry_after:.1f} seconds"
+        )
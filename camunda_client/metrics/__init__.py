@@ -0,0 +1,7 @@
+from .base import Metrics
+from .memory import InMemoryMetrics
+
+__all__ = [
+    "InMemoryMetrics",
+    "Metrics",
+]
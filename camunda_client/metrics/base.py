@@ -0,0 +1,30 @@
+class Metrics:
+    """
+    Collects metrics of clients and the worker.
+    Every method is a no-op, implementations override what they need.
+    """
+
+    def observe_request(
+        self,
+        operation: str,
+        seconds: float,
+        status_code: int | None,
+    ) -> None:
+        """Engine REST call, `status_code` is None if no response was received"""
+
+    def observe_fetch(self, seconds: float, tasks: int, max_tasks: int) -> None:
+        """fetchAndLock call of the worker, including long polling"""
+
+    def set_queue_depth(self, topic_name: str, depth: int) -> None:
+        """Number of fetched tasks waiting for a handler"""
+
+    def observe_handler(self, topic_name: str, seconds: float, outcome: str) -> None:
+        """Time spent inside `ExternalTaskContext`"""
+
+    def lock_expired(self, topic_name: str) -> None:
+        """A task was finished after its lock had expired"""
+
+    @property
+    def tracks_lock_expiration(self) -> bool:
+        """The worker skips the lock expiration check if `lock_expired` is a no-op"""
+        return type(self).lock_expired is not Metrics.lock_expired
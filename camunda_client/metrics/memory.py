@@ -0,0 +1,56 @@
+from collections import Counter, defaultdict, deque
+from functools import partial
+
+from .base import Metrics
+
+
+class InMemoryMetrics(Metrics):
+    """Keeps the last `max_samples` observations of every metric in memory"""
+
+    def __init__(self, max_samples: int = 10_000) -> None:
+        samples = partial(deque[float], maxlen=max_samples)
+        self.request_seconds: defaultdict[str, deque[float]] = defaultdict(samples)
+        self.request_errors: Counter[str] = Counter()
+        self.fetch_seconds: deque[float] = samples()
+        self.fetch_tasks: deque[float] = samples()
+        self.fetches: int = 0
+        self.empty_fetches: int = 0
+        self.queue_depth: dict[str, int] = {}
+        self.handler_seconds: defaultdict[str, deque[float]] = defaultdict(samples)
+        self.handler_outcomes: Counter[tuple[str, str]] = Counter()
+        self.lock_expirations: Counter[str] = Counter()
+
+    @property
+    def empty_fetch_ratio(self) -> float:
+        return self.empty_fetches / self.fetches if self.fetches else 0.0
+
+    def observe_request(
+        self,
+        operation: str,
+        seconds: float,
+        status_code: int | None,
+    ) -> None:
+        self.request_seconds[operation].append(seconds)
+        if status_code is None or status_code >= 400:  # noqa: PLR2004
+            self.request_errors[operation] += 1
+
+    def observe_fetch(
+        self,
+        seconds: float,
+        tasks: int,
+        max_tasks: int,  # noqa: ARG002
+    ) -> None:
+        self.fetches += 1
+        self.empty_fetches += not tasks
+        self.fetch_seconds.append(seconds)
+        self.fetch_tasks.append(tasks)
+
+    def set_queue_depth(self, topic_name: str, depth: int) -> None:
+        self.queue_depth[topic_name] = depth
+
+    def observe_handler(self, topic_name: str, seconds: float, outcome: str) -> None:
+        self.handler_seconds[topic_name].append(seconds)
+        self.handler_outcomes[topic_name, outcome] += 1
+
+    def lock_expired(self, topic_name: str) -> None:
+        self.lock_expirations[topic_name] += 1
@@ -0,0 +1,135 @@
+from dataclasses import dataclass
+from weakref import WeakKeyDictionary
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Gauge, Histogram
+
+from .base import Metrics
+
+_BATCH_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+
+@dataclass(frozen=True, slots=True)
+class _Collectors:
+    request_seconds: Histogram
+    fetch_seconds: Histogram
+    fetch_tasks: Histogram
+    empty_fetches: Counter
+    queue_depth: Gauge
+    handler_seconds: Histogram
+    lock_expirations: Counter
+
+
+# A collector name can be registered once per registry,
+# instances with the same registry and namespace share collectors
+_COLLECTORS: WeakKeyDictionary[CollectorRegistry, dict[str, _Collectors]] = (
+    WeakKeyDictionary()
+)
+
+
+def _create_collectors(namespace: str, registry: CollectorRegistry) -> _Collectors:
+    return _Collectors(
+        request_seconds=Histogram(
+            "request_duration_seconds",
+            "Engine REST call duration",
+            ["operation", "status_code"],
+            namespace=namespace,
+            registry=registry,
+        ),
+        fetch_seconds=Histogram(
+            "fetch_duration_seconds",
+            "fetchAndLock duration including long polling",
+            namespace=namespace,
+            registry=registry,
+        ),
+        fetch_tasks=Histogram(
+            "fetch_tasks",
+            "Number of tasks returned by fetchAndLock",
+            buckets=_BATCH_BUCKETS,
+            namespace=namespace,
+            registry=registry,
+        ),
+        empty_fetches=Counter(
+            "fetch_empty",
+            "Number of fetchAndLock calls without tasks",
+            namespace=namespace,
+            registry=registry,
+        ),
+        queue_depth=Gauge(
+            "topic_queue_depth",
+            "Number of fetched tasks waiting for a handler",
+            ["topic_name"],
+            namespace=namespace,
+            registry=registry,
+        ),
+        handler_seconds=Histogram(
+            "handler_duration_seconds",
+            "Time spent inside ExternalTaskContext",
+            ["topic_name", "outcome"],
+            namespace=namespace,
+            registry=registry,
+        ),
+        lock_expirations=Counter(
+            "lock_expired",
+            "Number of tasks finished after lock expiration",
+            ["topic_name"],
+            namespace=namespace,
+            registry=registry,
+        ),
+    )
+
+
+class PrometheusMetrics(Metrics):
+    """
+    Exports metrics with `prometheus_client`, requires `camunda-client[prometheus]`.
+    Metrics are registered in the default registry if `registry` is not provided,
+    any number of instances may be created, e.g. one per client.
+    """
+
+    def __init__(
+        self,
+        namespace: str = "camunda_client",
+        registry: CollectorRegistry | None = None,
+    ) -> None:
+        registry = registry or REGISTRY
+        by_namespace = _COLLECTORS.setdefault(registry, {})
+        if namespace not in by_namespace:
+            by_namespace[namespace] = _create_collectors(namespace, registry)
+        collectors = by_namespace[namespace]
+
+        self._request_seconds = collectors.request_seconds
+        self._fetch_seconds = collectors.fetch_seconds
+        self._fetch_tasks = collectors.fetch_tasks
+        self._empty_fetches = collectors.empty_fetches
+        self._queue_depth = collectors.queue_depth
+        self._handler_seconds = collectors.handler_seconds
+        self._lock_expirations = collectors.lock_expirations
+
+    def observe_request(
+        self,
+        operation: str,
+        seconds: float,
+        status_code: int | None,
+    ) -> None:
+        self._request_seconds.labels(operation, str(status_code or "")).observe(
+            seconds,
+        )
+
+    def observe_fetch(
+        self,
+        seconds: float,
+        tasks: int,
+        max_tasks: int,  # noqa: ARG002
+    ) -> None:
+        self._fetch_seconds.observe(seconds)
+        self._fetch_tasks.observe(tasks)
+        if not tasks:
+            self._empty_fetches.inc()
+
+    def set_queue_depth(self, topic_name: str, depth: int) -> None:
+        self._queue_depth.labels(topic_name).set(depth)
+
+    def observe_handler(self, topic_name: str, seconds: float, outcome: str) -> None:
+        self._handler_seconds.labels(topic_name, outcome).observe(seconds)
+
+    def lock_expired(self, topic_name: str) -> None:
+        self._lock_expirations.labels(topic_name).inc()
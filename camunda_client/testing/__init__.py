@@ -0,0 +1,17 @@
+from .dto import (
+    Activity,
+    ExternalTaskActivity,
+    FakeEngineConfig,
+    FakeEngineStats,
+    UserTaskActivity,
+)
+from .engine import FakeEngine
+
+__all__ = [
+    "Activity",
+    "ExternalTaskActivity",
+    "FakeEngine",
+    "FakeEngineConfig",
+    "FakeEngineStats",
+    "UserTaskActivity",
+]
@@ -0,0 +1,67 @@
+import dataclasses
+from collections.abc import Sequence
+from datetime import timedelta
+from typing import TypeAlias
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class ExternalTaskActivity:
+    topic_name: str
+
+    # Defaults to the topic name
+    activity_id: str | None = None
+    priority: int = 0
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class UserTaskActivity:
+    name: str
+
+    # Defaults to the task name
+    activity_id: str | None = None
+    assignee: str | None = None
+    priority: int = 50
+
+
+Activity: TypeAlias = ExternalTaskActivity | UserTaskActivity
+
+
+@dataclasses.dataclass(frozen=True, slots=True)
+class FakeEngineConfig:
+    # Added to every response
+    latency: timedelta = timedelta(0)
+
+    # Random extra latency, uniformly distributed up to this value
+    jitter: timedelta = timedelta(0)
+
+    # Share of requests answered with `error_status` instead of being handled
+    error_rate: float = 0.0
+    error_status: int = 500
+
+    # Errors are injected only into requests whose path contains one of these,
+    # e.g. `"fetchAndLock"`, into every request if empty
+    error_paths: Sequence[str] = ()
+
+    # Path the REST API is mounted at, stripped from request paths
+    base_path: str = "/engine-rest"
+
+    # Seeds the random source of jitter and error injection
+    seed: int | None = None
+
+
+@dataclasses.dataclass(slots=True)
+class FakeEngineStats:
+    started: int = 0
+    ended: int = 0
+    fetched: int = 0
+    completed: int = 0
+    failed: int = 0
+    incidents: int = 0
+    bpmn_errors: int = 0
+    extended: int = 0
+    unlocked: int = 0
+    lock_expired: int = 0
+
+    # Requests refused because the task is locked by another worker
+    lock_conflicts: int = 0
+    injected_errors: int = 0
@@ -0,0 +1,998 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+import random
+import re
+import time
+import uuid
+from collections.abc import Awaitable, Callable, Mapping, MutableMapping, Sequence
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from http import HTTPStatus
+from typing import Any, Literal, NamedTuple, TypeAlias
+from urllib.parse import parse_qsl
+
+import httpx
+import orjson
+
+from camunda_client.types_ import EncodedVariables, Variables
+from camunda_client.utils import encode_variables, to_camunda_datetime
+
+from .dto import (
+    Activity,
+    ExternalTaskActivity,
+    FakeEngineConfig,
+    FakeEngineStats,
+    UserTaskActivity,
+)
+
+Scope: TypeAlias = MutableMapping[str, Any]
+Receive: TypeAlias = Callable[[], Awaitable[MutableMapping[str, Any]]]
+Send: TypeAlias = Callable[[MutableMapping[str, Any]], Awaitable[None]]
+
+_TaskState: TypeAlias = Literal["available", "locked", "waiting", "incident", "done"]
+
+
+class _Request(NamedTuple):
+    method: str
+    path: str
+    query: Mapping[str, str]
+    body: Any
+
+
+class _Response(NamedTuple):
+    status: int
+
+    # Sent as JSON, `None` is sent as an empty body
+    body: Any = None
+
+
+_Handler: TypeAlias = Callable[..., Awaitable[_Response]]
+
+_NO_CONTENT = _Response(HTTPStatus.NO_CONTENT)
+
+
+def _error(status: HTTPStatus, message: str) -> _Response:
+    type_ = (
+        "RestException" if status == HTTPStatus.NOT_FOUND else "InvalidRequestException"
+    )
+    return _Response(status, {"type": type_, "message": message, "code": None})
+
+
+def _now() -> str:
+    return to_camunda_datetime(datetime.now(tz=UTC))
+
+
+@dataclass(slots=True, eq=False)
+class _Definition:
+    key: str
+    activities: Sequence[Activity]
+    message_name: str | None
+
+
+@dataclass(slots=True, eq=False)
+class _ProcessInstance:
+    id: str
+    definition: _Definition
+    business_key: str | None
+    tenant_id: str | None
+
+    # Variables as serialized by the REST API
+    variables: dict[str, Any]
+
+    # Index of the current activity
+    step: int = -1
+    task: "_ExternalTask | _UserTask | None" = None
+
+    @property
+    def definition_id(self) -> str:
+        return f"{self.definition.key}:1:{self.definition.key}"
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "id": self.id,
+            "definitionId": self.definition_id,
+            "links": [],
+            "businessKey": self.business_key,
+            "caseInstanceId": None,
+            "ended": False,
+            "suspended": False,
+            "tenantId": self.tenant_id,
+        }
+
+
+@dataclass(slots=True, eq=False)
+class _ExternalTask:
+    id: str
+    activity: ExternalTaskActivity
+    instance: _ProcessInstance
+    state: _TaskState = "available"
+    worker_id: str | None = None
+
+    # Monotonic time the lock expires at
+    lock_expires_at: float = 0.0
+    lock_expiration_time: str | None = None
+    retries: int | None = None
+    error_message: str | None = None
+
+    # Identifies the latest queue or timer entry of the task, older ones are stale
+    seq: int = 0
+
+    @property
+    def activity_id(self) -> str:
+        return self.activity.activity_id or self.activity.topic_name
+
+    def to_json(self, variable_names: Sequence[str] | None) -> dict[str, Any]:
+        instance = self.instance
+        variables = instance.variables
+        if variable_names is not None:
+            variables = {
+                name: variables[name] for name in variable_names if name in variables
+            }
+        return {
+            "id": self.id,
+            "workerId": self.worker_id,
+            "topicName": self.activity.topic_name,
+            "activityId": self.activity_id,
+            "activityInstanceId": f"{self.activity_id}:{self.id}",
+            "errorMessage": self.error_message,
+            "executionId": instance.id,
+            "lockExpirationTime": self.lock_expiration_time,
+            "processDefinitionId": instance.definition_id,
+            "processDefinitionKey": instance.definition.key,
+            "processInstanceId": instance.id,
+            "tenantId": instance.tenant_id,
+            "retries": self.retries,
+            "suspended": False,
+            "priority": self.activity.priority,
+            "businessKey": instance.business_key,
+            "variables": variables,
+        }
+
+
+@dataclass(slots=True, eq=False)
+class _UserTask:
+    id: str
+    activity: UserTaskActivity
+    instance: _ProcessInstance
+    created: str
+    assignee: str | None
+    name: str
+    priority: int
+    local_variables: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def activity_id(self) -> str:
+        return self.activity.activity_id or self.activity.name
+
+    def to_json(self) -> dict[str, Any]:
+        instance = self.instance
+        return {
+            "id": self.id,
+            "name": self.name,
+            "assignee": self.assignee,
+            "owner": None,
+            "created": self.created,
+            "due": None,
+            "lastUpdated": None,
+            "delegationState": None,
+            "description": None,
+            "executionId": instance.id,
+            "parentTaskId": None,
+            "priority": self.priority,
+            "processDefinitionId": instance.definition_id,
+            "processInstanceId": instance.id,
+            "caseExecutionId": None,
+            "caseDefinitionId": None,
+            "caseInstanceId": None,
+            "taskDefinitionKey": self.activity_id,
+            "suspended": False,
+            "tenantId": instance.tenant_id,
+        }
+
+
+_TOPIC_FILTERS: Mapping[str, Callable[[_ProcessInstance, Any], bool]] = {
+    "businessKey": lambda instance, value: instance.business_key == value,
+    "processDefinitionKey": lambda instance, value: instance.definition.key == value,
+    "processDefinitionKeyIn": lambda instance, value: instance.definition.key in value,
+    "tenantIdIn": lambda instance, value: instance.tenant_id in value,
+    "withoutTenantId": lambda instance, value: not value or instance.tenant_id is None,
+    "processVariables": lambda instance, value: all(
+        instance.variables.get(name, {}).get("value") == variable
+        for name, variable in value.items()
+    ),
+}
+
+_TASK_FILTERS: Mapping[str, Callable[[_UserTask, Any], bool]] = {
+    "assignee": lambda task, value: task.assignee == value,
+    "assigned": lambda task, value: (task.assignee is not None) == value,
+    "unassigned": lambda task, value: (task.assignee is None) == value,
+    "processInstanceId": lambda task, value: task.instance.id == value,
+    "processInstanceIdIn": lambda task, value: task.instance.id in value,
+    "processInstanceBusinessKey": lambda task, value: (
+        task.instance.business_key == value
+    ),
+    "processDefinitionKey": lambda task, value: task.instance.definition.key == value,
+    "processDefinitionKeyIn": lambda task, value: (
+        task.instance.definition.key in value
+    ),
+    "taskDefinitionKey": lambda task, value: task.activity_id == value,
+    "taskDefinitionKeyIn": lambda task, value: task.activity_id in value,
+}
+
+_INSTANCE_FILTERS: Mapping[str, Callable[[_ProcessInstance, str], bool]] = {
+    "processDefinitionKey": lambda instance, value: instance.definition.key == value,
+    "businessKey": lambda instance, value: instance.business_key == value,
+    "processInstanceIds": lambda instance, value: instance.id in value.split(","),
+}
+
+
+def _paginate(items: Sequence[Any], query: Mapping[str, str]) -> Sequence[Any]:
+    first = int(query.get("firstResult", 0))
+    if "maxResults" not in query:
+        return items[first:]
+    return items[first : first + int(query["maxResults"])]
+
+
+class FakeEngine:
+    """
+    In-process stand-in for the Camunda REST API, for load tests
+    and offline tests of workers.
+
+    Mount it into a client with `transport` or serve it as an ASGI application.
+    Processes are sequences of external and user tasks deployed with `deploy`.
+    External tasks follow the locking model of the engine: a lock is owned
+    by the worker that fetched the task and expires after `lockDuration`,
+    then the task may be fetched again. Fetching honours priorities,
+    topic filters and long polling.
+    """
+
+    def __init__(self, config: FakeEngineConfig | None = None) -> None:
+        self._config = config or FakeEngineConfig()
+        self._random = random.Random(self._config.seed)
+        self.stats = FakeEngineStats()
+
+        self._definitions: dict[str, _Definition] = {}
+        self._instances: dict[str, _ProcessInstance] = {}
+        self._external_tasks: dict[str, _ExternalTask] = {}
+        self._user_tasks: dict[str, _UserTask] = {}
+
+        # Heaps of fetchable tasks by topic, ordered by priority then age
+        self._available: dict[str, list[tuple[int, int, _ExternalTask]]] = {}
+
+        # Heap of lock expirations and retry timeouts
+        self._timers: list[tuple[float, int, _ExternalTask]] = []
+        self._seq = itertools.count()
+
+        # Set and replaced whenever a task becomes fetchable
+        self._wakeup = asyncio.Event()
+
+        routes: Sequence[tuple[str, str, _Handler]] = (
+            ("POST", r"/external-task/fetchAndLock", self._fetch_and_lock),
+            ("POST", r"/external-task/(?P<task_id>[^/]+)/complete", self._complete),
+            ("POST", r"/external-task/(?P<task_id>[^/]+)/failure", self._failure),
+            ("POST", r"/external-task/(?P<task_id>[^/]+)/extendLock", self._extend),
+            ("POST", r"/external-task/(?P<task_id>[^/]+)/unlock", self._unlock),
+            ("POST", r"/external-task/(?P<task_id>[^/]+)/bpmnError", self._bpmn_error),
+            (
+                "POST",
+                (
+                    r"/process-definition/key/(?P<process_key>[^/]+)"
+                    r"(?:/tenant-id/(?P<tenant_id>[^/]+))?/start"
+                ),
+                self._start_process,
+            ),
+            ("GET", r"/process-instance", self._get_instances),
+            ("POST", r"/process-instance/delete", self._delete_instances),
+            ("GET", r"/process-instance/(?P<instance_id>[^/]+)", self._get_instance),
+            (
+                "DELETE",
+                r"/process-instance/(?P<instance_id>[^/]+)",
+                self._delete_instance,
+            ),
+            (
+                "POST",
+                r"/process-instance/(?P<instance_id>[^/]+)/variables",
+                self._update_instance_variables,
+            ),
+            ("POST", r"/message", self._correlate_message),
+            ("POST", r"/task", self._get_tasks),
+            ("POST", r"/task/count", self._count_tasks),
+            ("GET", r"/task/(?P<task_id>[^/]+)", self._get_task),
+            ("PUT", r"/task/(?P<task_id>[^/]+)", self._update_task),
+            ("POST", r"/task/(?P<task_id>[^/]+)/claim", self._claim),
+            ("POST", r"/task/(?P<task_id>[^/]+)/unclaim", self._unclaim),
+            ("POST", r"/task/(?P<task_id>[^/]+)/assignee", self._set_assignee),
+            ("POST", r"/task/(?P<task_id>[^/]+)/submit-form", self._submit_form),
+            (
+                "GET",
+                (
+                    r"/task/(?P<task_id>[^/]+)/(?P<scope>variables|localVariables)"
+                    r"/(?P<name>[^/]+)"
+                ),
+                self._get_task_variable,
+            ),
+            (
+                "PUT",
+                (
+                    r"/task/(?P<task_id>[^/]+)/(?P<scope>variables|localVariables)"
+                    r"/(?P<name>[^/]+)"
+                ),
+                self._put_task_variable,
+            ),
+            ("GET", r"/task/(?P<task_id>[^/]+)/identity-links", self._identity_links),
+        )
+        self._routes = [
+            (method, re.compile(pattern), handler)
+            for method, pattern, handler in routes
+        ]
+
+    @property
+    def transport(self) -> httpx.AsyncBaseTransport:
+        """Transport for clients, requests are handled without a network"""
+        return httpx.MockTransport(self._handle_httpx)
+
+    @property
+    def active_instances(self) -> int:
+        return len(self._instances)
+
+    def deploy(
+        self,
+        process_key: str,
+        activities: Sequence[Activity],
+        *,
+        message_name: str | None = None,
+    ) -> None:
+        """
+        Deploys a process running `activities` one after another,
+        it is also started by a message named `message_name`
+        """
+        self._definitions[process_key] = _Definition(
+            key=process_key,
+            activities=activities,
+            message_name=message_name,
+        )
+
+    def start_process(
+        self,
+        process_key: str,
+        variables: Variables | EncodedVariables | None = None,
+        business_key: str | None = None,
+        tenant_id: str | None = None,
+    ) -> str:
+        """Starts a process without a request, returns the process instance id"""
+        definition = self._definitions.get(process_key)
+        if definition is None:
+            msg = f"Process {process_key!r} is not deployed"
+            raise ValueError(msg)
+
+        if not isinstance(variables, EncodedVariables):
+            variables = encode_variables(variables or {})
+        instance = self._start(
+            definition,
+            variables=orjson.loads(variables.content),
+            business_key=business_key,
+            tenant_id=tenant_id,
+        )
+        return instance.id
+
+    def variables(self, process_instance_id: str) -> dict[str, Any]:
+        """Variables of a running process instance as serialized by the REST API"""
+        return dict(self._instances[process_instance_id].variables)
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """ASGI entrypoint"""
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        body = b""
+        more_body = True
+        while more_body:
+            message = await receive()
+            body += message.get("body", b"")
+            more_body = message.get("more_body", False)
+
+        response = await self._handle(
+            _Request(
+                method=scope["method"],
+                path=scope["path"],
+                query=dict(parse_qsl(scope["query_string"].decode())),
+                body=orjson.loads(body) if body else None,
+            ),
+        )
+        content = b"" if response.body is None else orjson.dumps(response.body)
+        headers = [(b"content-length", str(len(content)).encode())]
+        if response.body is not None:
+            headers.append((b"content-type", b"application/json"))
+        await send(
+            {
+                "type": "http.response.start",
+                "status": response.status,
+                "headers": headers,
+            },
+        )
+        await send({"type": "http.response.body", "body": content})
+
+    async def _lifespan(self, receive: Receive, send: Send) -> None:
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+    async def _handle_httpx(self, request: httpx.Request) -> httpx.Response:
+        content = await request.aread()
+        response = await self._handle(
+            _Request(
+                method=request.method,
+                path=request.url.path,
+                query=dict(request.url.params),
+                body=orjson.loads(content) if content else None,
+            ),
+        )
+        if response.body is None:
+            return httpx.Response(response.status)
+        return httpx.Response(
+            response.status,
+            content=orjson.dumps(response.body),
+            headers={"Content-Type": "application/json"},
+        )
+
+    async def _handle(self, request: _Request) -> _Response:
+        config = self._config
+        delay = config.latency.total_seconds()
+        if config.jitter:
+            delay += self._random.uniform(0, config.jitter.total_seconds())
+        if delay:
+            await asyncio.sleep(delay)
+
+        if self._inject_error(request.path):
+            self.stats.injected_errors += 1
+            return _error(HTTPStatus(config.error_status), "Injected error")
+
+        path = request.path.removeprefix(config.base_path)
+        for method, pattern, handler in self._routes:
+            match = pattern.fullmatch(path)
+            if match is not None and method == request.method:
+                return await handler(request, **match.groupdict())
+        return _error(
+            HTTPStatus.NOT_FOUND,
+            f"{request.method} {path} is not supported by the fake engine",
+        )
+
+    def _inject_error(self, path: str) -> bool:
+        config = self._config
+        if not config.error_rate or self._random.random() >= config.error_rate:
+            return False
+        return not config.error_paths or any(
+            part in path for part in config.error_paths
+        )
+
+    def _notify(self) -> None:
+        self._wakeup.set()
+        self._wakeup = asyncio.Event()
+
+    def _start(
+        self,
+        definition: _Definition,
+        variables: dict[str, Any] | None,
+        business_key: str | None,
+        tenant_id: str | None,
+    ) -> _ProcessInstance:
+        instance = _ProcessInstance(
+            id=str(uuid.uuid4()),
+            definition=definition,
+            business_key=business_key,
+            tenant_id=tenant_id,
+            variables=dict(variables or {}),
+        )
+        self._instances[instance.id] = instance
+        self.stats.started += 1
+        self._advance(instance)
+        return instance
+
+    def _advance(self, instance: _ProcessInstance) -> None:
+        instance.step += 1
+        activities = instance.definition.activities
+        if instance.step >= len(activities):
+            self._remove(instance)
+            self.stats.ended += 1
+            return
+
+        activity = activities[instance.step]
+        task_id = str(uuid.uuid4())
+        if isinstance(activity, ExternalTaskActivity):
+            task = _ExternalTask(id=task_id, activity=activity, instance=instance)
+            self._external_tasks[task_id] = task
+            instance.task = task
+            self._make_available(task)
+            return
+
+        user_task = _UserTask(
+            id=task_id,
+            activity=activity,
+            instance=instance,
+            created=_now(),
+            assignee=activity.assignee,
+            name=activity.name,
+            priority=activity.priority,
+        )
+        self._user_tasks[task_id] = user_task
+        instance.task = user_task
+
+    def _remove(self, instance: _ProcessInstance) -> None:
+        self._instances.pop(instance.id, None)
+        task, instance.task = instance.task, None
+        if isinstance(task, _ExternalTask):
+            task.state = "done"
+            self._external_tasks.pop(task.id, None)
+        elif task is not None:
+            self._user_tasks.pop(task.id, None)
+
+    def _make_available(self, task: _ExternalTask) -> None:
+        task.state = "available"
+        task.seq = next(self._seq)
+        queue = self._available.setdefault(task.activity.topic_name, [])
+        heapq.heappush(queue, (-task.activity.priority, task.seq, task))
+        self._notify()
+
+    def _schedule(self, task: _ExternalTask, at: float) -> None:
+        task.seq = next(self._seq)
+        heapq.heappush(self._timers, (at, task.seq, task))
+
+    def _release_expired(self, now: float) -> None:
+        """Makes tasks with an expired lock or retry timeout fetchable again"""
+        timers = self._timers
+        while timers and timers[0][0] <= now:
+            _, seq, task = heapq.heappop(timers)
+            if task.seq != seq:
+                continue
+            if task.state == "locked":
+                self.stats.lock_expired += 1
+            if task.state in ("locked", "waiting"):
+                self._make_available(task)
+
+    def _pop_available(
+        self,
+        topic_names: Sequence[str],
+    ) -> tuple[int, int, _ExternalTask] | None:
+        """Pops the task with the highest priority among `topic_names`"""
+        best = None
+        for topic_name in topic_names:
+            queue = self._available.get(topic_name)
+            while queue and (
+                queue[0][2].seq != queue[0][1] or queue[0][2].state != "available"
+            ):
+                heapq.heappop(queue)
+            if queue and (best is None or queue[0] < best[0]):
+                best = queue
+        return heapq.heappop(best) if best else None
+
+    def _lock(self, body: dict[str, Any]) -> list[dict[str, Any]]:
+        now = time.monotonic()
+        self._release_expired(now)
+
+        topics = {topic["topicName"]: topic for topic in body.get("topics") or ()}
+        filters = {
+            topic_name: [
+                (check, topic[key])
+                for key, check in _TOPIC_FILTERS.items()
+                if topic.get(key) is not None
+            ]
+            for topic_name, topic in topics.items()
+        }
+        locked: list[_ExternalTask] = []
+        skipped = []
+        while len(locked) < body["maxTasks"]:
+            entry = self._pop_available(list(topics))
+            if entry is None:
+                break
+            task = entry[2]
+            topic_filters = filters[task.activity.topic_name]
+            if all(check(task.instance, value) for check, value in topic_filters):
+                locked.append(task)
+            else:
+                skipped.append(entry)
+        for entry in skipped:
+            heapq.heappush(self._available[entry[2].activity.topic_name], entry)
+
+        wall_now = datetime.now(tz=UTC)
+        tasks = []
+        for task in locked:
+            topic = topics[task.activity.topic_name]
+            lock_duration = timedelta(milliseconds=topic["lockDuration"])
+            task.state = "locked"
+            task.worker_id = body["workerId"]
+            task.lock_expires_at = now + lock_duration.total_seconds()
+            task.lock_expiration_time = to_camunda_datetime(wall_now + lock_duration)
+            self._schedule(task, task.lock_expires_at)
+            tasks.append(task.to_json(topic.get("variables")))
+        self.stats.fetched += len(tasks)
+        return tasks
+
+    async def _fetch_and_lock(self, request: _Request) -> _Response:
+        """Holds the request for up to `asyncResponseTimeout` until tasks are fetched"""
+        body = request.body
+        deadline = time.monotonic() + body.get("asyncResponseTimeout", 0) / 1000
+        while True:
+            wakeup = self._wakeup
+            tasks = self._lock(body)
+            now = time.monotonic()
+            if tasks or now >= deadline:
+                return _Response(HTTPStatus.OK, tasks)
+
+            timeout = deadline - now
+            if self._timers:
+                timeout = min(timeout, max(0, self._timers[0][0] - now))
+            with contextlib.suppress(TimeoutError):
+                await asyncio.wait_for(wakeup.wait(), timeout)
+
+    def _owned_task(self, task_id: str, worker_id: str) -> _ExternalTask | _Response:
+        task = self._external_tasks.get(task_id)
+        if task is None:
+            return _error(
+                HTTPStatus.NOT_FOUND,
+                f"External task with id {task_id} does not exist",
+            )
+        if task.worker_id != worker_id:
+            self.stats.lock_conflicts += 1
+            return _error(
+                HTTPStatus.BAD_REQUEST,
+                f"External Task {task_id} cannot be handled by worker '{worker_id}'. "
+                f"It is locked by worker '{task.worker_id}'.",
+            )
+        return task
+
+    async def _complete(self, request: _Request, task_id: str) -> _Response:
+        task = self._owned_task(task_id, request.body["workerId"])
+        if isinstance(task, _Response):
+            return task
+
+        task.instance.variables.update(request.body.get("variables") or {})
+        self.stats.completed += 1
+        self._remove_task(task)
+        self._advance(task.instance)
+        return _NO_CONTENT
+
+    def _remove_task(self, task: _ExternalTask) -> None:
+        task.state = "done"
+        task.instance.task = None
+        del self._external_tasks[task.id]
+
+    async def _failure(self, request: _Request, task_id: str) -> _Response:
+        body = request.body
+        task = self._owned_task(task_id, body["workerId"])
+        if isinstance(task, _Response):
+            return task
+
+        self.stats.failed += 1
+        task.instance.variables.update(body.get("variables") or {})
+        task.error_message = body.get("errorMessage")
+        task.worker_id = None
+        if body.get("retries") is not None:
+            task.retries = body["retries"]
+
+        if task.retries is not None and task.retries <= 0:
+            self.stats.incidents += 1
+            task.state = "incident"
+            task.seq = next(self._seq)
+        elif body.get("retryTimeout"):
+            task.state = "waiting"
+            self._schedule(task, time.monotonic() + body["retryTimeout"] / 1000)
+        else:
+            self._make_available(task)
+        return _NO_CONTENT
+
+    async def _extend(self, request: _Request, task_id: str) -> _Response:
+        body = request.body
+        task = self._owned_task(task_id, body["workerId"])
+        if isinstance(task, _Response):
+            return task
+
+        now = time.monotonic()
+        if task.state != "locked" or task.lock_expires_at <= now:
+            return _error(
+                HTTPStatus.BAD_REQUEST,
+                f"Cannot extend a lock that expired for external task {task_id}",
+            )
+
+        self.stats.extended += 1
+        duration = timedelta(milliseconds=body["newDuration"])
+        task.lock_expires_at = now + duration.total_seconds()
+        task.lock_expiration_time = to_camunda_datetime(
+            datetime.now(tz=UTC) + duration,
+        )
+        self._schedule(task, task.lock_expires_at)
+        return _NO_CONTENT
+
+    async def _unlock(self, _: _Request, task_id: str) -> _Response:
+        task = self._external_tasks.get(task_id)
+        if task is None:
+            return _error(
+                HTTPStatus.NOT_FOUND,
+                f"External task with id {task_id} does not exist",
+            )
+        if task.state == "locked":
+            self.stats.unlocked += 1
+            task.worker_id = None
+            self._make_available(task)
+        return _NO_CONTENT
+
+    async def _bpmn_error(self, request: _Request, task_id: str) -> _Response:
+        """There are no boundary events, an error ends the process instance"""
+        task = self._owned_task(task_id, request.body["workerId"])
+        if isinstance(task, _Response):
+            return task
+
+        self.stats.bpmn_errors += 1
+        task.instance.variables.update(request.body.get("variables") or {})
+        self._remove(task.instance)
+        self.stats.ended += 1
+        return _NO_CONTENT
+
+    async def _start_process(
+        self,
+        request: _Request,
+        process_key: str,
+        tenant_id: str | None,
+    ) -> _Response:
+        definition = self._definitions.get(process_key)
+        if definition is None:
+            return _error(
+                HTTPStatus.NOT_FOUND,
+                f"No matching process definition with key: {process_key}",
+            )
+
+        body = request.body or {}
+        instance = self._start(
+            definition,
+            variables=body.get("variables"),
+            business_key=body.get("businessKey"),
+            tenant_id=tenant_id,
+        )
+        return _Response(HTTPStatus.OK, instance.to_json())
+
+    async def _get_instances(self, request: _Request) -> _Response:
+        filters = [
+            (check, request.query[key])
+            for key, check in _INSTANCE_FILTERS.items()
+            if key in request.query
+        ]
+        instances = [
+            instance.to_json()
+            for instance in self._instances.values()
+            if all(check(instance, value) for check, value in filters)
+        ]
+        return _Response(HTTPStatus.OK, _paginate(instances, request.query))
+
+    async def _get_instance(self, _: _Request, instance_id: str) -> _Response:
+        instance = self._instances.get(instance_id)
+        if instance is None:
+            return self._instance_not_found(instance_id)
+        return _Response(HTTPStatus.OK, instance.to_json())
+
+    async def _delete_instance(self, _: _Request, instance_id: str) -> _Response:
+        instance = self._instances.get(instance_id)
+        if instance is None:
+            return self._instance_not_found(instance_id)
+        self._remove(instance)
+        return _NO_CONTENT
+
+    async def _delete_instances(self, request: _Request) -> _Response:
+        """Deletes the instances right away and reports a finished batch"""
+        instance_ids = request.body.get("processInstanceIds") or []
+        for instance_id in instance_ids:
+            instance = self._instances.get(instance_id)
+            if instance is not None:
+                self._remove(instance)
+        return _Response(
+            HTTPStatus.OK,
+            {
+                "id": str(uuid.uuid4()),
+                "type": "instance-deletion",
+                "totalJobs": len(instance_ids),
+                "jobsCreated": len(instance_ids),
+                "batchJobsPerSeed": 100,
+                "invocationsPerBatchJob": 1,
+                "suspended": False,
+            },
+        )
+
+    async def _update_instance_variables(
+        self,
+        request: _Request,
+        instance_id: str,
+    ) -> _Response:
+        instance = self._instances.get(instance_id)
+        if instance is None:
+            return self._instance_not_found(instance_id)
+
+        instance.variables.update(request.body.get("modifications") or {})
+        for name in request.body.get("deletions") or ():
+            instance.variables.pop(name, None)
+        return _NO_CONTENT
+
+    def _instance_not_found(self, instance_id: str) -> _Response:
+        return _error(
+            HTTPStatus.NOT_FOUND,
+            f"Process instance with id {instance_id} does not exist",
+        )
+
+    async def _correlate_message(self, request: _Request) -> _Response:
+        """Messages start processes, there are no intermediate catch events"""
+        body = request.body
+        definitions = [
+            definition
+            for definition in self._definitions.values()
+            if definition.message_name == body["messageName"]
+        ]
+        if not definitions:
+            return _error(
+                HTTPStatus.BAD_REQUEST,
+                f"Cannot correlate message '{body['messageName']}': "
+                "No process definition or execution matches the parameters",
+            )
+
+        instances = [
+            self._start(
+                definition,
+                variables=body.get("processVariables"),
+                business_key=body.get("businessKey"),
+                tenant_id=body.get("tenantId"),
+            )
+            for definition in (definitions if body.get("all") else definitions[:1])
+        ]
+        if not body.get("resultEnabled"):
+            return _NO_CONTENT
+        return _Response(
+            HTTPStatus.OK,
+            [
+                {
+                    "resultType": "ProcessDefinition",
+                    "execution": None,
+                    "processInstance": instance.to_json(),
+                }
+                for instance in instances
+            ],
+        )
+
+    def _filter_tasks(self, body: dict[str, Any] | None) -> list[_UserTask]:
+        filters = [
+            (check, value)
+            for key, check in _TASK_FILTERS.items()
+            if (value := (body or {}).get(key)) is not None
+        ]
+        return [
+            task
+            for task in self._user_tasks.values()
+            if all(check(task, value) for check, value in filters)
+        ]
+
+    async def _get_tasks(self, request: _Request) -> _Response:
+        tasks = [task.to_json() for task in self._filter_tasks(request.body)]
+        return _Response(HTTPStatus.OK, _paginate(tasks, request.query))
+
+    async def _count_tasks(self, request: _Request) -> _Response:
+        return _Response(
+            HTTPStatus.OK, {"count": len(self._filter_tasks(request.body))}
+        )
+
+    def _user_task(self, task_id: str) -> _UserTask | _Response:
+        task = self._user_tasks.get(task_id)
+        if task is None:
+            return _error(
+                HTTPStatus.NOT_FOUND,
+                f"No matching task with id {task_id}",
+            )
+        return task
+
+    async def _get_task(self, _: _Request, task_id: str) -> _Response:
+        task = self._user_task(task_id)
+        if isinstance(task, _Response):
+            return task
+        return _Response(HTTPStatus.OK, task.to_json())
+
+    async def _update_task(self, request: _Request, task_id: str) -> _Response:
+        task = self._user_task(task_id)
+        if isinstance(task, _Response):
+            return task
+
+        task.name = request.body.get("name", task.name)
+        task.assignee = request.body.get("assignee")
+        task.priority = request.body.get("priority", task.priority)
+        return _NO_CONTENT
+
+    async def _claim(self, request: _Request, task_id: str) -> _Response:
+        task = self._user_task(task_id)
+        if isinstance(task, _Response):
+            return task
+
+        user_id = request.body["userId"]
+        if task.assignee not in (None, user_id):
+            return _error(
+                HTTPStatus.BAD_REQUEST,
+                f"Task '{task_id}' is already claimed by someone else.",
+            )
+        task.assignee = user_id
+        return _NO_CONTENT
+
+    async def _unclaim(self, _: _Request, task_id: str) -> _Response:
+        task = self._user_task(task_id)
+        if isinstance(task, _Response):
+            return task
+        task.assignee = None
+        return _NO_CONTENT
+
+    async def _set_assignee(self, request: _Request, task_id: str) -> _Response:
+        task = self._user_task(task_id)
+        if isinstance(task, _Response):
+            return task
+        task.assignee = request.body.get("userId")
+        return _NO_CONTENT
+
+    async def _submit_form(self, request: _Request, task_id: str) -> _Response:
+        task = self._user_task(task_id)
+        if isinstance(task, _Response):
+            return task
+
+        instance = task.instance
+        instance.variables.update((request.body or {}).get("variables") or {})
+        del self._user_tasks[task.id]
+        instance.task = None
+        self._advance(instance)
+        return _NO_CONTENT
+
+    def _task_variables(self, task: _UserTask, scope: str) -> dict[str, Any]:
+        if scope == "localVariables":
+            return task.local_variables
+        return {**task.instance.variables, **task.local_variables}
+
+    async def _get_task_variable(
+        self,
+        _: _Request,
+        task_id: str,
+        scope: str,
+        name: str,
+    ) -> _Response:
+        task = self._user_task(task_id)
+        if isinstance(task, _Response):
+            return task
+
+        variable = self._task_variables(task, scope).get(name)
+        if variable is None:
+            return _error(
+                HTTPStatus.NOT_FOUND,
+                f"task variable with name {name} does not exist",
+            )
+        return _Response(HTTPStatus.OK, variable)
+
+    async def _put_task_variable(
+        self,
+        request: _Request,
+        task_id: str,
+        scope: str,
+        name: str,
+    ) -> _Response:
+        task = self._user_task(task_id)
+        if isinstance(task, _Response):
+            return task
+
+        if scope == "localVariables" or name in task.local_variables:
+            task.local_variables[name] = request.body
+        else:
+            task.instance.variables[name] = request.body
+        return _NO_CONTENT
+
+    async def _identity_links(self, _: _Request, task_id: str) -> _Response:
+        task = self._user_task(task_id)
+        if isinstance(task, _Response):
+            return task
+
+        links = []
+        if task.assignee is not None:
+            links.append({"userId": task.assignee, "groupId": None, "type": "assignee"})
+        return _Response(HTTPStatus.OK, links)
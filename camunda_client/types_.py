@@ -85,4 +85,23 @@ class TypedVariableValueSchema(BaseSchema, Generic[TValue]):
 Variables: TypeAlias = dict[str, VariableValueSchema]
 
 
+class EncodedVariables:
+    """
+    Variables already serialized to the JSON object of the REST API
+    by `encode_variables`, embedded into request bodies as is
+    """
+
+    __slots__ = ("content",)
+
+    def __init__(self, content: bytes) -> None:
+        self.content = content
+
+    @property
+    def fragment(self) -> orjson.Fragment:
+        return orjson.Fragment(self.content)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({self.content!r})"
+
+
 TVariables = TypeVar("TVariables", bound=BaseModel)
@@ -1,12 +1,20 @@
+import base64
+from collections.abc import Callable, Iterator, Mapping
 from datetime import datetime, timedelta
 from decimal import Decimal
 from typing import Any, TypeVar
 
 import httpx
 import orjson
+from pydantic import BaseModel
 
 from camunda_client.exceptions import CamundaClientError
-from camunda_client.types_ import VariableTypes, VariableValueSchema
+from camunda_client.types_ import (
+    EncodedVariables,
+    Variables,
+    VariableTypes,
+    VariableValueSchema,
+)
 
 _T = TypeVar("_T")
 
@@ -64,6 +72,67 @@ def to_camunda_datetime(value: datetime) -> str:
     return value.isoformat(timespec="milliseconds").replace("+00:00", "+0000")
 
 
+def _encode_json(value: Any) -> dict[str, Any]:  # noqa: ANN401
+    return {"value": orjson.dumps(value).decode(), "type": "Json"}
+
+
+# Encoders by exact type of the value, subclasses are looked up with `isinstance`
+_ENCODERS: dict[type, Callable[[Any], dict[str, Any]]] = {
+    str: lambda value: {"value": value, "type": "String"},
+    bool: lambda value: {"value": value, "type": "Boolean"},
+    int: lambda value: {"value": value, "type": "Integer"},
+    float: lambda value: {"value": value, "type": "Double"},
+    Decimal: lambda value: {"value": float(value), "type": "Double"},
+    type(None): lambda _: {"value": None, "type": "Null"},
+    datetime: lambda value: {"value": to_camunda_datetime(value), "type": "Date"},
+    bytes: lambda value: {"value": base64.b64encode(value).decode(), "type": "Bytes"},
+    dict: _encode_json,
+    list: _encode_json,
+    VariableValueSchema: lambda value: value.model_dump(
+        mode="json",
+        by_alias=True,
+        exclude_unset=True,
+    ),
+}
+
+
+def _encode_variable(value: Any) -> dict[str, Any]:  # noqa: ANN401
+    encoder = _ENCODERS.get(type(value))
+    if encoder is not None:
+        return encoder(value)
+
+    if isinstance(value, BaseModel) and not isinstance(value, VariableValueSchema):
+        return {"value": value.model_dump_json(), "type": "Json"}
+    for type_, encoder in _ENCODERS.items():
+        if isinstance(value, type_):
+            return encoder(value)
+
+    msg = f"Got undefined type: {type(value)}"
+    raise ValueError(msg)
+
+
+def encode_variables(values: Mapping[str, Any]) -> EncodedVariables:
+    """
+    Serializes plain values to variables of the REST API in one pass,
+    without a `VariableValueSchema` per value.
+    Types are chosen the same way as by `deserialize`, except that `Decimal`
+    is sent as a number and `bytes` are base64 encoded, as the engine expects.
+    Pydantic models are sent as `Json`, `VariableValueSchema` values as they are.
+    """
+    return EncodedVariables(
+        orjson.dumps(
+            {name: _encode_variable(value) for name, value in values.items()},
+        ),
+    )
+
+
+def variables_fragment(variables: Variables | EncodedVariables) -> orjson.Fragment:
+    """Variables as a fragment of a request body serialized with `orjson`"""
+    if isinstance(variables, EncodedVariables):
+        return variables.fragment
+    return encode_variables(variables).fragment
+
+
 def process_variable(variable: VariableValueSchema) -> Any:  # noqa: ANN401
     if variable.type == "Json":
         return orjson.loads(variable.value)
@@ -71,6 +140,44 @@ def process_variable(variable: VariableValueSchema) -> Any:  # noqa: ANN401
     return variable.value
 
 
+def model_variable_names(type_: type[BaseModel]) -> list[str]:
+    """Returns names of variables the model is validated from"""
+    names = []
+    for name, field in type_.model_fields.items():
+        alias = field.validation_alias or field.alias
+        names.append(alias if isinstance(alias, str) else name)
+    return names
+
+
+class ParsedVariables(Mapping[str, Any]):
+    """
+    Read-only mapping of variable values.
+    A variable is decoded with `process_variable` on first access only.
+    """
+
+    __slots__ = ("_parsed", "_variables")
+
+    def __init__(self, variables: Variables) -> None:
+        self._variables = variables
+        self._parsed: dict[str, Any] = {}
+
+    def __getitem__(self, key: str) -> Any:  # noqa: ANN401
+        try:
+            return self._parsed[key]
+        except KeyError:
+            value = self._parsed[key] = process_variable(self._variables[key])
+            return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._variables)
+
+    def __len__(self) -> int:
+        return len(self._variables)
+
+    def __repr__(self) -> str:
+        return f"{self.__class__.__name__}({list(self._variables)})"
+
+
 def get_value(value: _T | None) -> _T:
     """
     Returns value if value is not None
@@ -1,11 +1,20 @@
 from .context import ExternalTaskContext
-from .dto import ExternalTaskDTO
+from .dto import ExternalTaskDTO, ShutdownReportDTO
+from .reporter import TaskReporter
+from .supervisor import WorkerProcessDTO, WorkerSupervisor
 from .task_worker import ExternalTaskWorker
 from .topic_consumer import TopicConsumer
+from .types_ import SyncTaskHandler, TaskHandler
 
 __all__ = [
     "TopicConsumer",
     "ExternalTaskContext",
     "ExternalTaskWorker",
     "ExternalTaskDTO",
+    "ShutdownReportDTO",
+    "SyncTaskHandler",
+    "TaskHandler",
+    "TaskReporter",
+    "WorkerProcessDTO",
+    "WorkerSupervisor",
 ]
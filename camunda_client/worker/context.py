@@ -1,17 +1,23 @@
-from collections.abc import Callable
+import functools
+import time
+from collections.abc import Callable, Coroutine
+from datetime import UTC, datetime
 import traceback
 from types import TracebackType
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 from camunda_client.exceptions import InvalidStateError
 
-from camunda_client.types_ import Variables
+from camunda_client.types_ import EncodedVariables, Variables
 
 from .dto import ExternalTaskDTO
 
 if TYPE_CHECKING:
     from camunda_client.clients import ExternalTaskClient
 
+    from .reporter import TaskReporter
+    from .tracing import TaskTrace
+
 
 class ExternalTaskContext:
     def __init__(
@@ -19,13 +25,29 @@ class ExternalTaskContext:
         client: "ExternalTaskClient",
         task: ExternalTaskDTO,
         exit_hook: Callable[[str], None],
+        reporter: "TaskReporter | None" = None,
+        trace: "TaskTrace | None" = None,
     ) -> None:
         self._client = client
         self._task = task
         self._closed: bool = False
+        self._outcome = "unhandled"
+        self._started: float | None = None
         self._exit_hook = exit_hook
+        self._released = False
+        # The handler and queued outcomes, the task is finished when none is left
+        self._pending = 1
+        self._reporter = reporter
+        self._trace = trace
+
+    @property
+    def task(self) -> ExternalTaskDTO:
+        return self._task
 
     async def __aenter__(self) -> ExternalTaskDTO:
+        self._started = time.perf_counter()
+        if self._trace is not None:
+            self._trace.start_handler()
         return self._task
 
     async def __aexit__(
@@ -34,36 +56,48 @@ class ExternalTaskContext:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        self._exit_hook(self._task.id)
-
-        if self._closed:
+        if exc_val and not self._closed:
+            self._outcome = "error"
+        self._observe()
+        if self._trace is not None:
+            self._trace.end_handler(exc_val)
+
+        try:
+            await self._report_error(exc_val)
+        finally:
+            self._finish()
+
+    def release(self) -> None:
+        """Frees the slot of the task in the worker, repeated calls are ignored"""
+        if self._released:
             return
-
-        if exc_val:
-            error_message = f"{exc_val.__class__.__qualname__}"
-            error_details = "".join(traceback.format_exception(exc_val))
-            await self._client.failure(
-                self._task.id,
-                error_message=error_message,
-                error_details=error_details,
-            )
-
+        self._released = True
+        self._exit_hook(self._task.id)
 
     async def unlock_task(self) -> None:
-        await self._client.unlock(self._task.id)
+        try:
+            await self._client.unlock(self._task.id)
+        finally:
+            # Queued tasks are unlocked without entering the context
+            if self._trace is not None and self._started is None:
+                self._trace.end("unlocked")
 
     async def complete(
         self,
-        global_variables: Variables | None = None,
-        local_variables: Variables | None = None,
+        global_variables: Variables | EncodedVariables | None = None,
+        local_variables: Variables | EncodedVariables | None = None,
     ) -> None:
         self._check_closed()
 
-        await self._client.complete(
-            self._task.id,
-            global_variables=global_variables,
-            local_variables=local_variables,
+        await self._report(
+            functools.partial(
+                self._client.complete,
+                self._task.id,
+                global_variables=global_variables,
+                local_variables=local_variables,
+            ),
         )
+        self._outcome = "completed"
         self._closed = True
 
     async def fail(
@@ -74,12 +108,16 @@ class ExternalTaskContext:
     ) -> None:
         self._check_closed()
 
-        await self._client.failure(
-            self._task.id,
-            error_message=error_message,
-            retries=retries,
-            error_details=error_details,
+        await self._report(
+            functools.partial(
+                self._client.failure,
+                self._task.id,
+                error_message=error_message,
+                retries=retries,
+                error_details=error_details,
+            ),
         )
+        self._outcome = "failed"
         self._closed = True
 
     async def bpmn_error(
@@ -90,14 +128,74 @@ class ExternalTaskContext:
     ) -> None:
         self._check_closed()
 
-        await self._client.bpmn_error(
-            task_id=self._task.id,
-            error_code=error_code,
-            error_message=error_message,
-            variables=variables,
+        await self._report(
+            functools.partial(
+                self._client.bpmn_error,
+                task_id=self._task.id,
+                error_code=error_code,
+                error_message=error_message,
+                variables=variables,
+            ),
         )
+        self._outcome = "bpmn_error"
         self._closed = True
 
+    async def _report_error(self, exc_val: BaseException | None) -> None:
+        if self._closed or not exc_val:
+            return
+
+        error_message = f"{exc_val.__class__.__qualname__}"
+        error_details = "".join(traceback.format_exception(exc_val))
+        await self._report(
+            functools.partial(
+                self._client.failure,
+                self._task.id,
+                error_message=error_message,
+                error_details=error_details,
+            ),
+        )
+
+    async def _report(
+        self,
+        report: functools.partial[Coroutine[Any, Any, None]],
+    ) -> None:
+        if self._trace is not None:
+            report = functools.partial(self._trace.report, report)
+
+        if self._reporter is not None and self._reporter.is_running:
+            # The slot, the lock and the trace of the task
+            # are held until the outcome is sent
+            self._pending += 1
+            self._reporter.submit(self._task.id, report, on_sent=self._finish)
+            return
+
+        await report()
+
+    def _finish(self) -> None:
+        self._pending -= 1
+        if self._pending > 0:
+            return
+        if self._trace is not None:
+            self._trace.end(self._outcome)
+        self.release()
+
+    def _observe(self) -> None:
+        metrics = self._client.metrics
+        topic_name = self._task.topic_name
+        if self._started is not None:
+            metrics.observe_handler(
+                topic_name,
+                time.perf_counter() - self._started,
+                self._outcome,
+            )
+
+        expires_at = self._task.lock_expiration_time
+        if expires_at is None or not metrics.tracks_lock_expiration:
+            return
+        now = datetime.now(tz=UTC if expires_at.tzinfo else None)
+        if expires_at < now:
+            metrics.lock_expired(topic_name)
+
     def _check_closed(self) -> None:
         if self._closed:
             msg = "TaskContext is already closed"
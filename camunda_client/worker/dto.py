@@ -1,10 +1,20 @@
-from typing import Any
+from collections.abc import Sequence
+from dataclasses import dataclass
+from functools import cached_property
+
+from pydantic import AliasGenerator, ConfigDict
 
 from camunda_client.clients.types_ import SerializedDateTime
-from camunda_client.types_ import BaseDTO, TVariables, Variables
+from camunda_client.types_ import BaseDTO, TVariables, Variables, _snake_to_camel
+from camunda_client.utils import ParsedVariables
 
 
 class ExternalTaskDTO(BaseDTO):
+    # camelCase aliases allow to validate the engine response directly
+    model_config = ConfigDict(
+        alias_generator=AliasGenerator(validation_alias=_snake_to_camel),
+    )
+
     id: str
     worker_id: str
     topic_name: str
@@ -18,9 +28,28 @@ class ExternalTaskDTO(BaseDTO):
     process_instance_id: str | None = None
     tenant_id: str | None = None
     retries: int | None = None
+    priority: int | None = None
     business_key: str | None = None
     variables: Variables
-    parsed_variables: dict[str, Any]
+
+    @cached_property
+    def parsed_variables(self) -> ParsedVariables:
+        return ParsedVariables(self.variables)
 
     def get_variables(self, type_: type[TVariables]) -> TVariables:
         return type_.model_validate(self.parsed_variables)
+
+
+@dataclass(frozen=True, slots=True)
+class ShutdownReportDTO:
+    # Number of queued tasks given back to the engine
+    released: int = 0
+
+    # Ids of queued tasks whose unlock failed or did not finish in time
+    left_locked: Sequence[str] = ()
+
+    def merge(self, other: "ShutdownReportDTO") -> "ShutdownReportDTO":
+        return ShutdownReportDTO(
+            released=self.released + other.released,
+            left_locked=[*self.left_locked, *other.left_locked],
+        )
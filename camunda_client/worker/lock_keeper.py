@@ -0,0 +1,110 @@
+import asyncio
+import contextlib
+import heapq
+import itertools
+from datetime import UTC, datetime, timedelta
+from typing import TYPE_CHECKING
+
+import httpx
+
+from camunda_client._logger import logger
+from camunda_client.exceptions import CamundaClientError, CircuitOpenError
+from camunda_client.utils import camunda_timedelta
+
+from .dto import ExternalTaskDTO
+
+if TYPE_CHECKING:
+    from camunda_client.clients import ExternalTaskClient
+
+_RETRY_DELAY = timedelta(seconds=1)
+
+
+class LockKeeper:
+    """
+    Extends locks of running tasks shortly before they expire.
+    All tasks share one timer heap and one background coroutine.
+    """
+
+    def __init__(self, client: "ExternalTaskClient") -> None:
+        self._client = client
+        self._lock_duration = client.config.lock_duration
+        self._margin = min(
+            client.config.lock_extension_margin,
+            self._lock_duration / 2,
+        ).total_seconds()
+
+        # (extend at, sequence number, task id), removed tasks are skipped lazily
+        self._heap: list[tuple[float, int, str]] = []
+        self._tasks: dict[str, ExternalTaskDTO] = {}
+        self._counter = itertools.count()
+        self._changed = asyncio.Event()
+        self._closed = False
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def add(self, task: ExternalTaskDTO) -> None:
+        self._tasks[task.id] = task
+        # Local monotonic time is used instead of `lock_expiration_time`
+        # so the schedule does not depend on the engine clock
+        self._schedule(task.id, self._lock_duration.total_seconds() - self._margin)
+
+    def discard(self, task_id: str) -> None:
+        self._tasks.pop(task_id, None)
+
+    def close(self) -> None:
+        self._closed = True
+        self._changed.set()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        async with asyncio.TaskGroup() as tg:
+            while not self._closed:
+                now = loop.time()
+                while self._heap and self._heap[0][0] <= now:
+                    _, _, task_id = heapq.heappop(self._heap)
+                    if task_id in self._tasks:
+                        tg.create_task(self._extend(task_id))
+
+                delay = self._heap[0][0] - now if self._heap else None
+                self._changed.clear()
+                with contextlib.suppress(TimeoutError):
+                    async with asyncio.timeout(delay):
+                        await self._changed.wait()
+
+    async def _extend(self, task_id: str) -> None:
+        try:
+            await self._client.extend_lock(
+                task_id,
+                new_duration=camunda_timedelta(self._lock_duration),
+            )
+        except CamundaClientError as e:
+            if e.status_code < httpx.codes.INTERNAL_SERVER_ERROR:
+                # The task is finished or the lock is lost
+                logger.warning('Failed to extend lock of task "%s": %s', task_id, e)
+                self.discard(task_id)
+                return
+            logger.warning('Retry to extend lock of task "%s": %s', task_id, e)
+            self._schedule(task_id, _RETRY_DELAY.total_seconds())
+            return
+        except httpx.TransportError as e:
+            logger.warning('Retry to extend lock of task "%s": %r', task_id, e)
+            self._schedule(task_id, _RETRY_DELAY.total_seconds())
+            return
+        except CircuitOpenError as e:
+            logger.warning('Retry to extend lock of task "%s": %s', task_id, e)
+            self._schedule(task_id, max(e.retry_after, _RETRY_DELAY.total_seconds()))
+            return
+
+        if task := self._tasks.get(task_id):
+            logger.debug('Extended lock of task "%s"', task_id)
+            task.lock_expiration_time = datetime.now(tz=UTC) + self._lock_duration
+            self._schedule(task_id, self._lock_duration.total_seconds() - self._margin)
+
+    def _schedule(self, task_id: str, delay: float) -> None:
+        extend_at = asyncio.get_running_loop().time() + delay
+        item = (extend_at, next(self._counter), task_id)
+        heapq.heappush(self._heap, item)
+        if self._heap[0] is item:
+            # Wake up the timer to sleep until the new earliest deadline
+            self._changed.set()
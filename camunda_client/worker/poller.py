@@ -0,0 +1,47 @@
+import random
+from datetime import timedelta
+
+
+class Poller:
+    """
+    Decides how long the worker waits before the next fetch.
+
+    A full batch is followed by an immediate fetch, more tasks are likely waiting.
+    After an empty batch the worker waits only the part of `pull_interval`
+    the engine has not spent long polling, so with long polling enabled
+    the next fetch goes out right away.
+    A partial batch waits `pull_interval` to let tasks accumulate,
+    unless `top_up` is set and released slots are filled immediately.
+
+    Failed fetches back off exponentially from `backoff` up to `max_backoff`
+    with full jitter, so workers do not retry in lockstep.
+    """
+
+    def __init__(
+        self,
+        pull_interval: timedelta,
+        *,
+        top_up: bool = False,
+        backoff: timedelta = timedelta(seconds=1),
+        max_backoff: timedelta = timedelta(seconds=30),
+    ) -> None:
+        self._pull_interval = pull_interval.total_seconds()
+        self._top_up = top_up
+        self._backoff = backoff.total_seconds()
+        self._max_backoff = max_backoff.total_seconds()
+        self.failures: int = 0
+
+    def fetched(self, tasks: int, max_tasks: int, elapsed: float) -> float:
+        """Returns seconds to wait after a fetch that took `elapsed` seconds"""
+        self.failures = 0
+        if tasks >= max_tasks:
+            return 0
+        if tasks == 0:
+            return max(0, self._pull_interval - elapsed)
+        return 0 if self._top_up else self._pull_interval
+
+    def failed(self) -> float:
+        """Returns seconds to wait after a failed fetch"""
+        delay = min(self._max_backoff, self._backoff * 2 ** min(self.failures, 32))
+        self.failures += 1
+        return random.uniform(0, delay)  # noqa: S311
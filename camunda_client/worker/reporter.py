@@ -0,0 +1,110 @@
+import asyncio
+import contextlib
+from collections.abc import Awaitable, Callable
+from typing import TypeAlias
+
+import httpx
+import stamina
+
+from camunda_client._logger import logger
+from camunda_client.exceptions import CamundaClientError, CircuitOpenError
+
+_Report: TypeAlias = tuple[
+    str,
+    Callable[[], Awaitable[None]],
+    Callable[[], None] | None,
+]
+
+
+def is_transient_error(exc: Exception) -> bool:
+    if isinstance(exc, CamundaClientError):
+        return (
+            exc.status_code >= httpx.codes.INTERNAL_SERVER_ERROR
+            or exc.status_code == httpx.codes.TOO_MANY_REQUESTS
+        )
+    return isinstance(exc, httpx.TransportError)
+
+
+class TaskReporter:
+    """
+    Write-behind reporter of task outcomes (complete, failure, bpmn error).
+
+    Outcomes are queued and sent by `concurrency` sender coroutines,
+    transient errors are retried up to `attempts` times.
+    Outcomes rejected by an open circuit breaker wait until it lets calls through,
+    once the reporter is closed they are tried once more and then dropped.
+    `on_sent` of an outcome is called once it is sent or given up.
+    The queue is flushed when the reporter is closed.
+    """
+
+    def __init__(self, concurrency: int = 4, attempts: int = 5) -> None:
+        self._concurrency = concurrency
+        self._attempts = attempts
+        self._queue: asyncio.Queue[_Report | None] = asyncio.Queue()
+        self._is_running = False
+        self._closing = asyncio.Event()
+
+    @property
+    def is_running(self) -> bool:
+        return self._is_running
+
+    def submit(
+        self,
+        task_id: str,
+        report: Callable[[], Awaitable[None]],
+        on_sent: Callable[[], None] | None = None,
+    ) -> None:
+        self._queue.put_nowait((task_id, report, on_sent))
+
+    def close(self) -> None:
+        self._is_running = False
+        self._closing.set()
+        self._queue.put_nowait(None)
+
+    async def run(self) -> None:
+        self._is_running = True
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(self._concurrency):
+                tg.create_task(self._send_reports())
+
+    async def _send_reports(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is None:
+                # Let the other senders see the end of the queue
+                self._queue.put_nowait(None)
+                return
+
+            task_id, report, on_sent = item
+            try:
+                await self._send(task_id, report)
+            finally:
+                if on_sent is not None:
+                    on_sent()
+
+    async def _send(self, task_id: str, report: Callable[[], Awaitable[None]]) -> None:
+        while True:
+            try:
+                async for attempt in stamina.retry_context(
+                    on=is_transient_error,
+                    attempts=self._attempts,
+                ):
+                    with attempt:
+                        await report()
+            except CircuitOpenError as e:
+                if self._closing.is_set():
+                    # The lock of the task expires and the engine gives it out again
+                    logger.warning(
+                        'Dropped outcome of task "%s" on close: %s',
+                        task_id,
+                        e,
+                    )
+                    return
+                # Attempts are not spent while the engine is known to be down
+                with contextlib.suppress(TimeoutError):
+                    async with asyncio.timeout(e.retry_after):
+                        await self._closing.wait()
+                continue
+            except Exception:  # noqa: BLE001
+                logger.exception('Failed to report outcome of task "%s"', task_id)
+            return
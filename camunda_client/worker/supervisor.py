@@ -0,0 +1,181 @@
+import asyncio
+import multiprocessing
+import os
+import signal
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+from datetime import timedelta
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from types import FrameType
+from typing import Literal, TypeAlias
+
+from camunda_client._logger import logger
+
+
+@dataclass(frozen=True, slots=True)
+class WorkerProcessDTO:
+    index: int
+    worker_id: str
+    topics: Sequence[str]
+
+    # Set on SIGTERM / SIGINT, the process should close its worker
+    stopping: asyncio.Event
+
+
+WorkerTarget: TypeAlias = Callable[[WorkerProcessDTO], Awaitable[None]]
+
+
+def split_topics(
+    topics: Sequence[str],
+    processes: int,
+) -> list[list[str]]:
+    """
+    Splits topics between processes round-robin.
+    If there are more processes than topics, topics are repeated,
+    so every process gets at least one topic.
+    """
+    if not topics:
+        msg = "At least one topic is required"
+        raise ValueError(msg)
+
+    if len(topics) >= processes:
+        return [list(topics[index::processes]) for index in range(processes)]
+    return [[topics[index % len(topics)]] for index in range(processes)]
+
+
+def _run_process(
+    target: WorkerTarget,
+    index: int,
+    worker_id: str,
+    topics: Sequence[str],
+) -> None:
+    async def main() -> None:
+        stopping = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGTERM, signal.SIGINT):
+            loop.add_signal_handler(signum, stopping.set)
+
+        await target(
+            WorkerProcessDTO(
+                index=index,
+                worker_id=worker_id,
+                topics=topics,
+                stopping=stopping,
+            ),
+        )
+
+    asyncio.run(main())
+
+
+class WorkerSupervisor:
+    """
+    Runs `target` in `processes` child processes, one event loop per process.
+
+    Every process gets a worker id derived from `worker_id` and a share of
+    `topics` (all topics if `distribute_topics` is False). Crashed processes
+    are restarted after `restart_delay`, processes that exit with code 0
+    are not restarted. On SIGTERM / SIGINT children are
+    asked to stop and are killed if they do not exit in `shutdown_timeout`.
+    """
+
+    def __init__(  # noqa: PLR0913
+        self,
+        target: WorkerTarget,
+        *,
+        worker_id: str,
+        topics: Sequence[str],
+        processes: int | None = None,
+        distribute_topics: bool = True,
+        restart_delay: timedelta = timedelta(seconds=1),
+        shutdown_timeout: timedelta = timedelta(seconds=30),
+        start_method: Literal["fork", "forkserver", "spawn"] | None = None,
+    ) -> None:
+        self._target = target
+        self._worker_id = worker_id
+        self._processes = processes or os.cpu_count() or 1
+        self._topics = (
+            split_topics(topics, self._processes)
+            if distribute_topics
+            else [list(topics)] * self._processes
+        )
+        self._restart_delay = restart_delay.total_seconds()
+        self._shutdown_timeout = shutdown_timeout.total_seconds()
+        self._mp_context = multiprocessing.get_context(start_method)
+
+        self._children: dict[int, BaseProcess] = {}
+        self._restart_at: dict[int, float] = {}
+        self._stopping = False
+
+    def run(self) -> None:
+        """
+        Blocks until SIGTERM / SIGINT is received and all children exit,
+        or until every child exits with code 0
+        """
+        previous_handlers = {
+            signum: signal.signal(signum, self._on_signal)
+            for signum in (signal.SIGTERM, signal.SIGINT)
+        }
+        try:
+            for index in range(self._processes):
+                self._start(index)
+            self._monitor()
+        finally:
+            self._stop_children()
+            for signum, handler in previous_handlers.items():
+                signal.signal(signum, handler)
+
+    def _on_signal(self, signum: int, _: FrameType | None) -> None:
+        logger.info("Supervisor received signal %s, stopping", signum)
+        self._stopping = True
+
+    def _start(self, index: int) -> None:
+        worker_id = f"{self._worker_id}-{index}"
+        process = self._mp_context.Process(
+            target=_run_process,
+            args=(self._target, index, worker_id, self._topics[index]),
+            name=worker_id,
+        )
+        process.start()
+        logger.info('Started worker process "%s" with pid %s', worker_id, process.pid)
+        self._children[index] = process
+
+    def _monitor(self) -> None:
+        while not self._stopping and (self._children or self._restart_at):
+            sentinels = [process.sentinel for process in self._children.values()]
+            wait(sentinels, timeout=0.5)
+
+            for index, process in list(self._children.items()):
+                if process.is_alive():
+                    continue
+                del self._children[index]
+                if process.exitcode == 0:
+                    logger.info('Worker process "%s" exited', process.name)
+                    continue
+                logger.error(
+                    'Worker process "%s" exited with code %s',
+                    process.name,
+                    process.exitcode,
+                )
+                self._restart_at[index] = time.monotonic() + self._restart_delay
+
+            now = time.monotonic()
+            for index, restart_at in list(self._restart_at.items()):
+                if restart_at <= now and not self._stopping:
+                    del self._restart_at[index]
+                    self._start(index)
+
+    def _stop_children(self) -> None:
+        for process in self._children.values():
+            if process.is_alive():
+                process.terminate()
+
+        deadline = time.monotonic() + self._shutdown_timeout
+        for process in self._children.values():
+            process.join(max(deadline - time.monotonic(), 0))
+            if process.is_alive():
+                logger.warning('Kill worker process "%s"', process.name)
+                process.kill()
+                process.join()
+        self._children.clear()
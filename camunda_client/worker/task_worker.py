@@ -1,22 +1,35 @@
 import asyncio
 import contextlib
-from collections.abc import AsyncIterator, Sequence
+import os
+import time
+from collections.abc import AsyncIterator, Coroutine, Sequence
 from datetime import timedelta
 from types import TracebackType
-from typing import TYPE_CHECKING
-from camunda_client.exceptions import CamundaClientError
-from stamina import retry
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, cast, overload
+from camunda_client.exceptions import CamundaClientError, CircuitOpenError
+import httpx
+from pydantic import BaseModel, TypeAdapter
 
-from camunda_client.clients.external_task.schemas.response import ExternalTaskSchema
+from camunda_client.clients.external_task.dto import FetchTopicDTO
+from camunda_client.utils import model_variable_names
 
 if TYPE_CHECKING:
     from camunda_client.clients import ExternalTaskClient
 
+    from .tracing import TaskTracer
+
 from .context import ExternalTaskContext
-from .dto import ExternalTaskDTO
+from .dto import ExternalTaskDTO, ShutdownReportDTO
+from .lock_keeper import LockKeeper
+from .poller import Poller
+from .reporter import TaskReporter
 from .topic_consumer import TopicConsumer
+from .types_ import ExecutorType, SyncTaskHandler, TaskHandler
 from camunda_client._logger import logger
 
+TASKS_ADAPTER = TypeAdapter(list[ExternalTaskDTO])
+
 
 class ExternalTaskWorker:
     def __init__(
@@ -24,22 +37,83 @@ class ExternalTaskWorker:
         client: "ExternalTaskClient",
         pull_interval: timedelta,
         business_key: str | None = None,
+        max_in_flight: int | None = None,
+        reporter: TaskReporter | None = None,
+        *,
+        use_priority: bool = False,
+        unlock_concurrency: int = 16,
+        unlock_timeout: timedelta = timedelta(seconds=10),
+        tracer: "TaskTracer | None" = None,
     ) -> None:
+        """
+        By default the worker fetches a batch of tasks and waits
+        until every task of the batch is finished before the next fetch.
+        A full batch is followed by an immediate fetch, empty fetches rely on
+        long polling of the engine (`async_response_timeout`) and are repeated
+        no more often than `pull_interval`, partial batches wait `pull_interval`.
+        Failed fetches are retried with exponential backoff and jitter,
+        up to `sleep_seconds` of the client config.
+
+        If `max_in_flight` is provided the worker runs in pipelined mode:
+        it fetches new tasks as soon as the number of unfinished tasks
+        drops below `max_in_flight`.
+
+        If `auto_extend_lock` is enabled in the client config, locks of
+        unfinished tasks are extended shortly before they expire.
+
+        If `reporter` is provided, task outcomes are sent in the background
+        and the reporter is flushed when the worker is closed.
+        A task keeps its slot and its lock until its outcome is sent,
+        so a backlog of outcomes pauses fetching.
+
+        If `use_priority` is set, the engine returns tasks with higher priority first.
+
+        Queued tasks are unlocked on shutdown and unsubscribe with at most
+        `unlock_concurrency` concurrent requests within `unlock_timeout`,
+        see `shutdown_report` for the result.
+
+        If `tracer` is provided, every task gets a trace from the moment it is fetched.
+        """
+        if max_in_flight is not None and max_in_flight < 1:
+            msg = "max_in_flight must be greater than 0"
+            raise ValueError(msg)
+
         self._consumers: dict[str, TopicConsumer] = {}
+        self._fetch_topics: dict[str, FetchTopicDTO] = {}
         self._pull_interval = pull_interval
         self._client = client
         self._business_key = business_key
+        self._max_in_flight = max_in_flight
+        self._use_priority = use_priority
+        self._unlock_concurrency = unlock_concurrency
+        self._unlock_timeout = unlock_timeout
+        self._shutdown_report = ShutdownReportDTO()
+        self._reporter = reporter
+        self._tracer = tracer
+        self._poller = Poller(
+            pull_interval,
+            top_up=max_in_flight is not None,
+            max_backoff=client.config.sleep_seconds,
+        )
+        self._lock_keeper = (
+            LockKeeper(client) if client.config.auto_extend_lock else None
+        )
 
         self._tg = asyncio.TaskGroup()
+        self._reporter_task: asyncio.Task[None] | None = None
         self._closing = asyncio.Event()
-        self._is_current_tasks_empty = asyncio.Event()
-        self._is_current_tasks_empty.set()
+        self._capacity_changed = asyncio.Event()
 
-        self._current_tasks: set[str] = set()
+        # task id -> topic name
+        self._current_tasks: dict[str, str] = {}
 
     async def __aenter__(self) -> None:
         await self._tg.__aenter__()
         self._tg.create_task(self._pull_tasks())
+        if self._lock_keeper is not None:
+            self._tg.create_task(self._lock_keeper.run())
+        if self._reporter is not None:
+            self._reporter_task = self._tg.create_task(self._reporter.run())
 
     async def __aexit__(
         self,
@@ -47,52 +121,192 @@ class ExternalTaskWorker:
         exc_val: BaseException | None,
         exc_tb: TracebackType | None,
     ) -> None:
-        self._closing.set()
+        self.close()
+        if self._reporter is not None:
+            self._reporter.close()
+        if self._reporter_task is not None:
+            # Locks are extended until queued outcomes are sent
+            await asyncio.wait([self._reporter_task])
+        if self._lock_keeper is not None:
+            self._lock_keeper.close()
         await self._tg.__aexit__(exc_type, exc_val, exc_tb)
 
+        report = self.shutdown_report
+        logger.info(
+            "Worker is closed, released %s tasks, %s tasks left locked",
+            report.released,
+            len(report.left_locked),
+        )
+
+    @property
+    def shutdown_report(self) -> ShutdownReportDTO:
+        report = self._shutdown_report
+        for topic_consumer in self._consumers.values():
+            report = report.merge(topic_consumer.shutdown_report)
+        return report
+
+    def close(self) -> None:
+        """
+        Stops fetching tasks and closes topic consumers, queued tasks are unlocked.
+        Handlers of already consumed tasks are not interrupted.
+        """
+        self._closing.set()
+        for topic_consumer in self._consumers.values():
+            topic_consumer.close()
+
     async def _pull_tasks(self) -> None:
         while True:
-            if self._consumers:
-                tasks = await self._get_tasks()
-                self._current_tasks = {item.id for item in tasks}
-
-                for task in tasks:
-                    logger.info('Got task with id "%s"', task.id)
-                    consumer = self._consumers[task.topic_name]
-                    ctx = ExternalTaskContext(
-                        client=self._client,
-                        task=ExternalTaskDTO.model_validate(task),
-                        exit_hook=self._on_task_exit,
-                    )
-                    consumer.add_task(ctx)
-                    self._is_current_tasks_empty.clear()
-
-            await self._wait()
+            topics, max_tasks = self._fetch_plan()
+            delay = 0.0
+            if max_tasks > 0:
+                delay = await self._fetch(topics, max_tasks)
+
+            await self._wait(delay)
 
             if self._closing.is_set():
                 return
 
-    def _on_task_exit(self, task_id: str) -> None:
-        self._current_tasks.remove(task_id)
+    async def _fetch(self, topics: Sequence[FetchTopicDTO], max_tasks: int) -> float:
+        """Fetches and dispatches tasks, returns seconds to wait until the next fetch"""
+        started = time.perf_counter()
+        try:
+            content = await self._client.fetch_and_lock_json(
+                topic_names=topics,
+                business_key=self._business_key,
+                max_tasks=max_tasks,
+                use_priority=self._use_priority or None,
+            )
+        except CircuitOpenError as e:
+            # The engine is degraded, fetching is paused until probes are let through
+            logger.warning("%s, fetching is paused", e)
+            return e.retry_after
+        except (CamundaClientError, httpx.TransportError):
+            delay = self._poller.failed()
+            logger.exception("Failed to fetch tasks, retrying in %.2f seconds", delay)
+            return delay
 
-        if not self._current_tasks:
-            self._is_current_tasks_empty.set()
+        elapsed = time.perf_counter() - started
+        fetched_at = time.time_ns()
+        tasks = TASKS_ADAPTER.validate_json(content)
+        decoded_at = time.time_ns()
+        self._client.metrics.observe_fetch(
+            elapsed,
+            tasks=len(tasks),
+            max_tasks=max_tasks,
+        )
+
+        rejected = []
+        for task in tasks:
+            logger.info('Got task with id "%s"', task.id)
+            if not self._dispatch(task, fetched_at, decoded_at):
+                rejected.append(task.id)
+        if rejected:
+            await self._unlock_rejected(rejected)
 
-    @retry(on=CamundaClientError, attempts=3)
-    async def _get_tasks(self) -> Sequence[ExternalTaskSchema]:
-        return await self._client.fetch_and_lock(
-            topic_names=list(self._consumers),
-            business_key=self._business_key,
+        return self._poller.fetched(len(tasks), max_tasks, elapsed)
+
+    def _dispatch(
+        self,
+        task: ExternalTaskDTO,
+        fetched_at: int,
+        decoded_at: int,
+    ) -> bool:
+        """Queues the task to its consumer, returns `False` if there is no free slot"""
+        consumer = self._consumers.get(task.topic_name)
+        free_slots = consumer.free_slots if consumer else 0
+        if consumer is None or (free_slots is not None and free_slots <= 0):
+            # The engine may return more tasks of a topic than the topic can take,
+            # such tasks are given back instead of waiting in the queue
+            logger.info('Unlock task with id "%s", no free slots', task.id)
+            return False
+
+        self._current_tasks[task.id] = task.topic_name
+        if self._lock_keeper is not None:
+            self._lock_keeper.add(task)
+
+        ctx = ExternalTaskContext(
+            client=self._client,
+            task=task,
+            exit_hook=self._on_task_exit,
+            reporter=self._reporter,
+            trace=(
+                self._tracer.start_task(task, fetched_at, decoded_at)
+                if self._tracer is not None
+                else None
+            ),
         )
+        consumer.add_task(ctx)
+        return True
+
+    async def _unlock_rejected(self, task_ids: Sequence[str]) -> None:
+        """
+        Unlocks tasks with at most `unlock_concurrency` concurrent requests,
+        tasks that failed to unlock wait for lock expiration
+        """
+        pending = iter(task_ids)
+
+        async def unlock_pending() -> None:
+            for task_id in pending:
+                try:
+                    await self._client.unlock(task_id)
+                except (
+                    CamundaClientError,
+                    httpx.TransportError,
+                    CircuitOpenError,
+                ) as e:
+                    logger.warning('Failed to unlock task with id "%s": %r', task_id, e)
+
+        async with asyncio.TaskGroup() as tg:
+            for _ in range(min(self._unlock_concurrency, len(task_ids))):
+                tg.create_task(unlock_pending())
+
+    def _on_task_exit(self, task_id: str) -> None:
+        topic_name = self._current_tasks.pop(task_id)
+        if self._lock_keeper is not None:
+            self._lock_keeper.discard(task_id)
+        if consumer := self._consumers.get(topic_name):
+            consumer.release()
+        self._capacity_changed.set()
 
-    async def _wait(self) -> None:
-        await self._is_current_tasks_empty.wait()
+    def _free_slots(self) -> int:
+        if self._max_in_flight is None:
+            return 0 if self._current_tasks else self._client.config.max_tasks
 
+        free_slots = self._max_in_flight - len(self._current_tasks)
+        return min(free_slots, self._client.config.max_tasks)
+
+    def _fetch_plan(self) -> tuple[list[FetchTopicDTO], int]:
+        """Returns topics with free slots and the number of tasks to fetch"""
+        topics: list[FetchTopicDTO] = []
+        topics_free_slots = 0
+        is_limited = True
+        for topic_name, consumer in self._consumers.items():
+            free_slots = consumer.free_slots
+            if free_slots is None:
+                is_limited = False
+            elif free_slots <= 0:
+                continue
+            else:
+                topics_free_slots += free_slots
+            topics.append(self._fetch_topics[topic_name])
+
+        max_tasks = self._free_slots()
+        if is_limited:
+            max_tasks = min(max_tasks, topics_free_slots)
+        return topics, max_tasks
+
+    async def _wait(self, delay: float) -> None:
+        while self._fetch_plan()[1] <= 0 and not self._closing.is_set():
+            self._capacity_changed.clear()
+            await self._wait_or_close(self._capacity_changed.wait())
+
+        if delay > 0:
+            await self._wait_or_close(asyncio.sleep(delay))
+
+    async def _wait_or_close(self, aw: Coroutine[Any, Any, Any]) -> None:
         _, pending = await asyncio.wait(
             [
-                asyncio.create_task(
-                    asyncio.sleep(self._pull_interval.total_seconds()),
-                ),
+                asyncio.create_task(aw),
                 asyncio.create_task(self._closing.wait()),
             ],
             return_when=asyncio.FIRST_COMPLETED,
@@ -104,14 +318,146 @@ class ExternalTaskWorker:
     async def subscribe(
         self,
         topic: str,
-    ) -> AsyncIterator[AsyncIterator[ExternalTaskContext]]:
-        topic_consumer = TopicConsumer(closing=self._closing)
+        *,
+        concurrency: int | None = None,
+        variables: Sequence[str] | type[BaseModel] | None = None,
+        local_variables: bool | None = None,
+    ) -> AsyncIterator[TopicConsumer]:
+        """
+        `concurrency` limits the number of unfinished tasks of the topic,
+        the worker does not fetch tasks of the topic while the limit is reached.
+
+        `variables` limits variables fetched with the tasks of the topic:
+        a list of variable names or a pydantic model passed to `get_variables`.
+        All variables are fetched by default.
+        """
+        topic_consumer = TopicConsumer(
+            concurrency=concurrency,
+            unlock_concurrency=self._unlock_concurrency,
+            unlock_timeout=self._unlock_timeout,
+            metrics=self._client.metrics,
+        )
 
         if topic in self._consumers:
             raise ValueError
 
+        if self._closing.is_set():
+            topic_consumer.close()
+
+        if isinstance(variables, type):
+            variables = model_variable_names(variables)
+
+        self._fetch_topics[topic] = FetchTopicDTO(
+            topic_name=topic,
+            variables=variables,
+            local_variables=local_variables,
+        )
         self._consumers[topic] = topic_consumer
+        self._capacity_changed.set()
+
+        try:
+            yield topic_consumer
+        finally:
+            del self._consumers[topic]
+            del self._fetch_topics[topic]
+            # Tasks left in the queue after unsubscribe are given back to the engine
+            topic_consumer.close()
+            await topic_consumer.unlock_queued()
+            self._shutdown_report = self._shutdown_report.merge(
+                topic_consumer.shutdown_report,
+            )
+
+    @overload
+    async def serve(
+        self,
+        topic: str,
+        handler: TaskHandler,
+        *,
+        concurrency: int | None = None,
+        variables: Sequence[str] | type[BaseModel] | None = None,
+        local_variables: bool | None = None,
+    ) -> None: ...
+
+    @overload
+    async def serve(  # noqa: PLR0913
+        self,
+        topic: str,
+        handler: SyncTaskHandler,
+        *,
+        executor: ExecutorType,
+        max_workers: int | None = None,
+        concurrency: int | None = None,
+        variables: Sequence[str] | type[BaseModel] | None = None,
+        local_variables: bool | None = None,
+    ) -> None: ...
+
+    async def serve(  # noqa: PLR0913
+        self,
+        topic: str,
+        handler: TaskHandler | SyncTaskHandler,
+        *,
+        executor: ExecutorType | None = None,
+        max_workers: int | None = None,
+        concurrency: int | None = None,
+        variables: Sequence[str] | type[BaseModel] | None = None,
+        local_variables: bool | None = None,
+    ) -> None:
+        """
+        Subscribes to `topic` and runs a pool of `concurrency` coroutines
+        calling `handler` until the worker is closed.
+        An exception raised by `handler` fails the task.
+
+        If `executor` is provided, `handler` is a blocking function
+        run on a thread or process pool of `max_workers` workers,
+        the task is completed with the returned variables.
+        `concurrency` defaults to `max_workers` in this case.
+        """
+        async with contextlib.AsyncExitStack() as stack:
+            if executor is None:
+                task_handler = cast(TaskHandler, handler)
+            else:
+                max_workers = max_workers or _default_max_workers(executor)
+                pool = _create_executor(executor, max_workers)
+                # Waiting for running handlers would block the event loop
+                stack.callback(pool.shutdown, wait=False, cancel_futures=True)
+                task_handler = _offload(cast(SyncTaskHandler, handler), pool)
+                concurrency = concurrency or max_workers
+
+            concurrency = concurrency or 1
+            topic_consumer = await stack.enter_async_context(
+                self.subscribe(
+                    topic,
+                    concurrency=concurrency,
+                    variables=variables,
+                    local_variables=local_variables,
+                ),
+            )
+            async with asyncio.TaskGroup() as tg:
+                for _ in range(concurrency):
+                    tg.create_task(topic_consumer.serve(task_handler))
+
+
+def _default_max_workers(executor: ExecutorType) -> int:
+    # Same defaults as ThreadPoolExecutor and ProcessPoolExecutor
+    cpu_count = os.cpu_count() or 1
+    if executor == "thread":
+        return min(32, cpu_count + 4)
+    return cpu_count
+
+
+def _create_executor(
+    executor: ExecutorType,
+    max_workers: int,
+) -> ThreadPoolExecutor | ProcessPoolExecutor:
+    if executor == "thread":
+        return ThreadPoolExecutor(max_workers, thread_name_prefix="camunda-worker")
+    return ProcessPoolExecutor(max_workers)
+
 
-        yield topic_consumer
+def _offload(handler: SyncTaskHandler, executor: Executor) -> TaskHandler:
+    async def run(ctx: ExternalTaskContext, task: ExternalTaskDTO) -> None:
+        loop = asyncio.get_running_loop()
+        variables = await loop.run_in_executor(executor, handler, task)
+        await ctx.complete(global_variables=variables)
 
-        del self._consumers[topic]
+    return run
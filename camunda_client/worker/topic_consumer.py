@@ -1,46 +1,173 @@
 import asyncio
-from collections.abc import Sequence
-from typing import Self
+import contextlib
+import itertools
+import math
+from collections.abc import Iterator, Sequence
+from datetime import timedelta
+from typing import TYPE_CHECKING, Final, Self, TypeAlias
+
+from camunda_client._logger import logger
+from camunda_client.metrics import Metrics
 
 from .context import ExternalTaskContext
+from .dto import ShutdownReportDTO
+
+if TYPE_CHECKING:
+    from .types_ import TaskHandler
+
+# (negative priority, lock expiration timestamp, sequence number, context)
+_QueueItem: TypeAlias = tuple[float, float, int, ExternalTaskContext | None]
+
+# Goes before any task, so iterators stop right after the consumer is closed
+_CLOSED: Final[_QueueItem] = (-math.inf, -math.inf, -1, None)
 
 
 class TopicConsumer:
-    def __init__(self, closing: asyncio.Event) -> None:
-        self.task_contexts: list[ExternalTaskContext] = []
-        self.new_task_event = asyncio.Event()
-        self.closing = closing
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        unlock_concurrency: int = 16,
+        unlock_timeout: timedelta = timedelta(seconds=10),
+        metrics: Metrics | None = None,
+    ) -> None:
+        self.concurrency = concurrency
+        self.in_flight: int = 0
+        self.shutdown_report = ShutdownReportDTO()
+        self._unlock_concurrency = unlock_concurrency
+        self._unlock_timeout = unlock_timeout
+        self._metrics = metrics or Metrics()
+        self._counter = itertools.count()
+        self._closed = False
+        # Tasks with higher priority and then closer to lock expiration go first.
+        # The worker never fetches more than `concurrency` tasks,
+        # one more item is reserved for the close sentinel.
+        self._queue: asyncio.PriorityQueue[_QueueItem] = asyncio.PriorityQueue(
+            maxsize=concurrency + 1 if concurrency else 0,
+        )
+
+    @property
+    def free_slots(self) -> int | None:
+        """
+        Number of tasks the consumer can accept,
+        `None` if the consumer is not limited
+        """
+        if self.concurrency is None:
+            return None
+        return self.concurrency - self.in_flight
 
     def __aiter__(self) -> Self:
         return self
 
     async def __anext__(self) -> ExternalTaskContext:
-        _, pending = await asyncio.wait(
-            [
-                asyncio.create_task(self.new_task_event.wait()),
-                asyncio.create_task(self.closing.wait()),
-            ],
-            return_when=asyncio.FIRST_COMPLETED,
+        *_, task_context = await self._queue.get()
+        if task_context is None:
+            # Leave the sentinel for other iterators of the consumer
+            self._queue.put_nowait(_CLOSED)
+            await self.unlock_queued()
+            raise StopAsyncIteration
+
+        self._metrics.set_queue_depth(task_context.task.topic_name, self._queue.qsize())
+        return task_context
+
+    def add_task(self, ctx: ExternalTaskContext) -> None:
+        task = ctx.task
+        lock_expiration_time = (
+            task.lock_expiration_time.timestamp()
+            if task.lock_expiration_time
+            else math.inf
         )
-        for task in pending:
-            task.cancel()
+        self._queue.put_nowait(
+            (-(task.priority or 0), lock_expiration_time, next(self._counter), ctx),
+        )
+        self.in_flight += 1
+        self._metrics.set_queue_depth(task.topic_name, self._queue.qsize())
 
-        if self.closing.is_set():
-            await self._unlock(self.task_contexts)
-            raise StopAsyncIteration
+    def release(self) -> None:
+        self.in_flight -= 1
 
-        await self.new_task_event.wait()
+    def close(self) -> None:
+        """Stops iteration, queued tasks are unlocked by the iterator"""
+        if self._closed:
+            return
+        self._closed = True
+        self._queue.put_nowait(_CLOSED)
 
-        task_context = self.task_contexts.pop()
-        if not self.task_contexts:
-            self.new_task_event.clear()
+    async def serve(self, handler: "TaskHandler") -> None:
+        """Runs `handler` for every task of the topic until the consumer is closed"""
+        async for ctx in self:
+            try:
+                async with ctx as task:
+                    await handler(ctx, task)
+            except Exception:  # noqa: BLE001
+                logger.exception('Handler failed on task with id "%s"', ctx.task.id)
 
-        return task_context
+    async def unlock_queued(self) -> None:
+        """
+        Unlocks queued tasks concurrently, at most `unlock_concurrency`
+        requests at once and no longer than `unlock_timeout` in total.
+        Slots of the tasks are released in the worker.
+        The result is added to `shutdown_report`.
+        """
+        task_contexts = self._drain()
+        if not task_contexts:
+            return
 
-    def add_task(self, ctx: ExternalTaskContext) -> None:
-        self.task_contexts.append(ctx)
-        self.new_task_event.set()
+        try:
+            released = await _unlock(
+                task_contexts,
+                concurrency=self._unlock_concurrency,
+                timeout=self._unlock_timeout,
+            )
+        finally:
+            # Tasks left locked are not tracked by the worker either
+            for ctx in task_contexts:
+                ctx.release()
+        left_locked = [
+            ctx.task.id for ctx in task_contexts if ctx.task.id not in released
+        ]
+        if left_locked:
+            logger.warning(
+                "%s tasks are left locked until lock expiration: %s",
+                len(left_locked),
+                left_locked,
+            )
+        self.shutdown_report = self.shutdown_report.merge(
+            ShutdownReportDTO(released=len(released), left_locked=left_locked),
+        )
+
+    def _drain(self) -> list[ExternalTaskContext]:
+        task_contexts = []
+        while not self._queue.empty():
+            *_, task_context = self._queue.get_nowait()
+            if task_context is not None:
+                task_contexts.append(task_context)
+        if self._closed:
+            self._queue.put_nowait(_CLOSED)
+        return task_contexts
+
+
+async def _unlock(
+    task_contexts: Sequence[ExternalTaskContext],
+    *,
+    concurrency: int,
+    timeout: timedelta,
+) -> set[str]:
+    """Returns ids of unlocked tasks"""
+    released: set[str] = set()
+    pending = iter(task_contexts)
+
+    async def unlock_pending(pending: Iterator[ExternalTaskContext]) -> None:
+        for ctx in pending:
+            try:
+                await ctx.unlock_task()
+            except Exception:  # noqa: BLE001
+                logger.exception('Failed to unlock task with id "%s"', ctx.task.id)
+            else:
+                released.add(ctx.task.id)
+
+    with contextlib.suppress(TimeoutError):
+        async with asyncio.timeout(timeout.total_seconds()), asyncio.TaskGroup() as tg:
+            for _ in range(min(concurrency, len(task_contexts))):
+                tg.create_task(unlock_pending(pending))
 
-    async def _unlock(self, task_contexts: Sequence[ExternalTaskContext]) -> None:
-        for ctx in task_contexts:
-            await ctx.unlock_task()
+    return released
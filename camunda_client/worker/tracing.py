@@ -0,0 +1,133 @@
+import functools
+import random
+from collections.abc import Coroutine
+from contextvars import Token
+from typing import Any
+
+from opentelemetry import context, trace
+from opentelemetry.context import Context
+from opentelemetry.trace import Span, Status, StatusCode, Tracer
+from opentelemetry.util.types import AttributeValue
+
+from .dto import ExternalTaskDTO
+
+
+class TaskTracer:
+    """
+    Creates a trace for every external task with OpenTelemetry,
+    requires `camunda-client[tracing]`.
+
+    Only `sample_rate` of tasks are traced. Tasks are not traced
+    if spans are not recorded, e.g. when no tracer provider is installed.
+    """
+
+    def __init__(self, tracer: Tracer | None = None, sample_rate: float = 1.0) -> None:
+        if not 0 <= sample_rate <= 1:
+            msg = "sample_rate must be between 0 and 1"
+            raise ValueError(msg)
+
+        self._tracer = tracer or trace.get_tracer("camunda_client")
+        self._sample_rate = sample_rate
+
+    def start_task(
+        self,
+        task: ExternalTaskDTO,
+        fetched_at: int,
+        decoded_at: int,
+    ) -> "TaskTrace | None":
+        """
+        Starts the root span of the task at `fetched_at`,
+        the response decoding takes from `fetched_at` to `decoded_at`.
+        Timestamps are in nanoseconds since the epoch.
+        """
+        if self._sample_rate < 1 and random.random() >= self._sample_rate:  # noqa: S311
+            return None
+
+        span = self._tracer.start_span(
+            f"process {task.topic_name}",
+            # Tasks are not related to the fetch loop, every task is a new trace
+            context=Context(),
+            kind=trace.SpanKind.CONSUMER,
+            attributes=_attributes(task),
+            start_time=fetched_at,
+        )
+        if not span.is_recording():
+            return None
+
+        task_trace = TaskTrace(self._tracer, span)
+        task_trace.start_span("decode", start_time=fetched_at).end(end_time=decoded_at)
+        return task_trace
+
+
+class TaskTrace:
+    """Spans of a single task, children are created under the root span"""
+
+    __slots__ = ("_context", "_handler_span", "_root", "_token", "_tracer")
+
+    def __init__(self, tracer: Tracer, root: Span) -> None:
+        self._tracer = tracer
+        self._root = root
+        self._context = trace.set_span_in_context(root)
+        self._handler_span: Span | None = None
+        self._token: Token[Context] | None = None
+
+    def start_span(self, name: str, start_time: int | None = None) -> Span:
+        return self._tracer.start_span(
+            name,
+            context=self._context,
+            start_time=start_time,
+        )
+
+    def start_handler(self) -> None:
+        """Starts the handler span and makes it current for spans of the handler"""
+        self._handler_span = self.start_span("handle")
+        self._token = context.attach(trace.set_span_in_context(self._handler_span))
+
+    def end_handler(self, exc_val: BaseException | None) -> None:
+        if self._token is not None:
+            context.detach(self._token)
+            self._token = None
+        if self._handler_span is None:
+            return
+
+        if exc_val is not None:
+            _record_error(self._handler_span, exc_val)
+        self._handler_span.end()
+        self._handler_span = None
+
+    async def report(
+        self,
+        report: functools.partial[Coroutine[Any, Any, None]],
+    ) -> None:
+        """Runs a `complete`/`failure` call of the client in a span"""
+        with self._tracer.start_as_current_span(
+            report.func.__name__,
+            context=self._context,
+            kind=trace.SpanKind.CLIENT,
+        ):
+            await report()
+
+    def end(self, outcome: str) -> None:
+        self._root.set_attribute("camunda.outcome", outcome)
+        self._root.end()
+
+
+def _attributes(task: ExternalTaskDTO) -> dict[str, AttributeValue]:
+    attributes: dict[str, AttributeValue] = {
+        "camunda.task_id": task.id,
+        "camunda.topic_name": task.topic_name,
+    }
+    for name, value in (
+        ("camunda.process_instance_id", task.process_instance_id),
+        ("camunda.process_definition_key", task.process_definition_key),
+        ("camunda.activity_id", task.activity_id),
+        ("camunda.business_key", task.business_key),
+    ):
+        if value is not None:
+            attributes[name] = value
+    return attributes
+
+
+def _record_error(span: Span, exc_val: BaseException) -> None:
+    span.record_exception(exc_val)
+    span.set_status(Status(StatusCode.ERROR, exc_val.__class__.__qualname__))
@@ -0,0 +1,20 @@
+from collections.abc import Awaitable, Callable
+from typing import Literal, TypeAlias
+
+from camunda_client.types_ import EncodedVariables, Variables
+
+from .context import ExternalTaskContext
+from .dto import ExternalTaskDTO
+
+TaskHandler: TypeAlias = Callable[
+    [ExternalTaskContext, ExternalTaskDTO],
+    Awaitable[None],
+]
+
+# Blocking handler run on an executor, returned variables complete the task
+SyncTaskHandler: TypeAlias = Callable[
+    [ExternalTaskDTO],
+    Variables | EncodedVariables | None,
+]
+
+ExecutorType: TypeAlias = Literal["thread", "process"]
@@ -0,0 +1,87 @@
+import asyncio
+import json
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from camunda_client.clients import AuthData, CamundaEngineClient
+from camunda_client.clients.bulk import run_bulk
+from camunda_client.clients.engine import StartProcessDTO
+from camunda_client.exceptions import CamundaClientError
+
+
+@pytest.mark.anyio
+async def test_run_bulk_limits_concurrency_and_keeps_errors() -> None:
+    running = 0
+    peak = 0
+
+    async def call(item: int) -> int:
+        nonlocal running, peak
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        if item % 3 == 0:
+            raise ValueError(item)
+        return item * 2
+
+    results = await run_bulk(iter(range(10)), call, concurrency=3)
+
+    assert peak == 3  # noqa: PLR2004
+    assert [result.item for result in results] == list(range(10))
+    assert [result.result for result in results if result.is_success] == [
+        2,
+        4,
+        8,
+        10,
+        14,
+        16,
+    ]
+    assert all(
+        isinstance(result.error, ValueError)
+        for result in results
+        if result.item % 3 == 0
+    )
+
+
+def _client(transport: httpx.MockTransport) -> CamundaEngineClient:
+    return CamundaEngineClient(
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=transport,
+    )
+
+
+@pytest.mark.anyio
+async def test_start_processes() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "broken" in request.url.path:
+            return httpx.Response(404, json={"message": "not found"})
+        return httpx.Response(200, json={"id": str(uuid4()), "links": []})
+
+    client = _client(httpx.MockTransport(handler))
+    results = await client.start_processes(
+        [StartProcessDTO("invoice"), StartProcessDTO("broken")],
+    )
+
+    assert results[0].is_success
+    assert isinstance(results[1].error, CamundaClientError)
+
+
+@pytest.mark.anyio
+async def test_delete_processes_async() -> None:
+    def handler(request: httpx.Request) -> httpx.Response:
+        assert request.url.path == "/engine-rest/process-instance/delete"
+        assert json.loads(request.content) == {
+            "processInstanceIds": ["a", "b"],
+            "skipCustomListeners": True,
+            "skipIoMappings": True,
+        }
+        return httpx.Response(200, json={"id": "batch", "totalJobs": 2})
+
+    client = _client(httpx.MockTransport(handler))
+    batch = await client.delete_processes_async(["a", "b"])
+
+    assert batch.id == "batch"
+    assert batch.total_jobs == 2  # noqa: PLR2004
@@ -0,0 +1,78 @@
+import asyncio
+from collections.abc import Sequence
+from uuid import uuid4
+
+import httpx
+import pytest
+
+from camunda_client.clients import AuthData, CamundaEngineClient
+from camunda_client.clients.engine.schemas.body import (
+    HistoricProcessInstanceFilterSchema,
+)
+from camunda_client.clients.pagination import paginate
+from camunda_client.clients.schemas import PaginationParams
+
+
+@pytest.mark.anyio
+async def test_paginate_prefetches_next_page() -> None:
+    requested: list[int] = []
+    consumed: list[int] = []
+
+    async def get_page(pagination: PaginationParams) -> Sequence[int]:
+        requested.append(pagination.offset)
+        await asyncio.sleep(0)
+        return list(range(pagination.offset, min(pagination.offset + 3, 7)))
+
+    async for item in paginate(get_page, page_size=3):
+        consumed.append(item)
+        if item == 0:
+            await asyncio.sleep(0.01)
+            # The second page is requested while the first one is consumed
+            assert requested == [0, 3]
+
+    assert consumed == list(range(7))
+    assert requested == [0, 3, 6]
+
+
+@pytest.mark.anyio
+async def test_paginate_cancels_prefetch_when_closed() -> None:
+    cancelled = asyncio.Event()
+
+    async def get_page(pagination: PaginationParams) -> Sequence[int]:
+        if pagination.offset == 0:
+            return [1, 2]
+        try:
+            await asyncio.sleep(10)
+        finally:
+            cancelled.set()
+        return []
+
+    pages = paginate(get_page, page_size=2)
+    assert await anext(pages) == 1
+    await asyncio.sleep(0)
+    await pages.aclose()
+
+    await asyncio.wait_for(cancelled.wait(), timeout=1)
+
+
+@pytest.mark.anyio
+async def test_iter_history_process_instances() -> None:
+    ids = [uuid4() for _ in range(3)]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        offset = int(request.url.params["firstResult"])
+        assert request.url.params["maxResults"] == "2"
+        page = ids[offset : offset + 2]
+        return httpx.Response(200, json=[{"id": str(ident)} for ident in page])
+
+    client = CamundaEngineClient(
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=httpx.MockTransport(handler),
+    )
+    instances = client.iter_history_process_instances(
+        HistoricProcessInstanceFilterSchema(),
+        page_size=2,
+    )
+
+    assert [instance.id async for instance in instances] == ids
@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from camunda_client.clients import (
+    AuthData,
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    ExternalTaskClient,
+)
+from camunda_client.exceptions import CamundaClientError, CircuitOpenError
+
+
+def _breaker(open_for: timedelta = timedelta(hours=1)) -> CircuitBreaker:
+    return CircuitBreaker(
+        CircuitBreakerConfig(
+            failure_rate=0.5,
+            slow_call=timedelta(seconds=1),
+            window=4,
+            min_calls=4,
+            open_for=open_for,
+            probe_calls=2,
+        ),
+    )
+
+
+def test_circuit_opens_on_failure_rate() -> None:
+    breaker = _breaker()
+    for failed in (False, False, False, True):
+        breaker.before_call("complete")
+        breaker.record("complete", failed=failed, seconds=0.1)
+    assert breaker.state("complete") == "closed"
+
+    breaker.record("complete", failed=False, seconds=2)
+    assert breaker.state("complete") == "open"
+    assert breaker.state("unlock") == "closed"
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("complete")
+
+
+def test_half_open_circuit_lets_probes_through() -> None:
+    breaker = _breaker(open_for=timedelta(0))
+    for _ in range(4):
+        breaker.record("complete", failed=True, seconds=None)
+    assert breaker.state("complete") == "half_open"
+
+    probes = [breaker.before_call("complete") for _ in range(2)]
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("complete")
+
+    for probe in probes:
+        breaker.record("complete", failed=False, seconds=0.1, probe=probe)
+    assert breaker.state("complete") == "closed"
+
+
+def test_failed_probe_opens_circuit() -> None:
+    breaker = _breaker(open_for=timedelta(0))
+    for _ in range(4):
+        breaker.record("complete", failed=True, seconds=None)
+
+    probe = breaker.before_call("complete")
+    breaker.record("complete", failed=True, seconds=None, probe=probe)
+    assert breaker._circuits["complete"].state == "open"  # noqa: SLF001
+
+
+def test_calls_admitted_before_half_open_are_not_probes() -> None:
+    breaker = _breaker(open_for=timedelta(0))
+    for _ in range(4):
+        breaker.before_call("complete")
+    for _ in range(4):
+        breaker.record("complete", failed=True, seconds=None)
+    first_probe = breaker.before_call("complete")
+    assert first_probe is not None
+
+    # A late call from the closed period neither frees nor fills a probe slot
+    breaker.record("complete", failed=False, seconds=0.1)
+    breaker.before_call("complete")
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("complete")
+
+    # Probes of an earlier half-open period are ignored as well
+    breaker.record("complete", failed=True, seconds=None, probe=first_probe)
+    probes = [breaker.before_call("complete") for _ in range(2)]
+    breaker.abandon("complete", first_probe)
+    breaker.record("complete", failed=False, seconds=0.1, probe=first_probe)
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call("complete")
+
+    for probe in probes:
+        breaker.record("complete", failed=False, seconds=0.1, probe=probe)
+    assert breaker.state("complete") == "closed"
+
+
+@pytest.mark.anyio
+async def test_client_fails_fast_when_circuit_is_open() -> None:
+    calls = 0
+
+    def handler(_: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        return httpx.Response(503)
+
+    client = ExternalTaskClient(
+        worker_id="worker",
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=httpx.MockTransport(handler),
+        breaker=_breaker(),
+    )
+    for _ in range(4):
+        with pytest.raises(CamundaClientError):
+            await client.complete("task")
+    with pytest.raises(CircuitOpenError):
+        await client.complete("task")
+
+    assert calls == 4  # noqa: PLR2004
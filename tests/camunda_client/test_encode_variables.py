@@ -0,0 +1,123 @@
+from datetime import UTC, datetime
+from decimal import Decimal
+from typing import Any
+
+import httpx
+import orjson
+import pytest
+from pydantic import BaseModel
+
+from camunda_client import (
+    CamundaEngineClient,
+    ExternalTaskClient,
+    VariableValueSchema,
+    encode_variables,
+)
+from camunda_client.clients.dto import AuthData
+from camunda_client.testing import ExternalTaskActivity, FakeEngine
+from camunda_client.utils import deserialize
+
+_AUTH = AuthData(username="demo", password="demo")
+
+
+class _Order(BaseModel):
+    id: int
+    items: list[str]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        "text",
+        True,
+        42,
+        1.5,
+        None,
+        datetime(2026, 1, 1, 12, tzinfo=UTC),
+        {"items": [1, 2]},
+        [1, "2"],
+    ],
+)
+def test_encode_variables_matches_deserialize(value: Any) -> None:  # noqa: ANN401
+    expected = deserialize(value).model_dump(
+        mode="json",
+        by_alias=True,
+        exclude_unset=True,
+    )
+    assert orjson.loads(encode_variables({"name": value}).content) == {
+        "name": expected,
+    }
+
+
+@pytest.mark.parametrize(
+    ("value", "expected"),
+    [
+        (Decimal("2.5"), {"value": 2.5, "type": "Double"}),
+        (b"\x00\xff", {"value": "AP8=", "type": "Bytes"}),
+        (
+            _Order(id=1, items=["a"]),
+            {"value": '{"id":1,"items":["a"]}', "type": "Json"},
+        ),
+        (
+            VariableValueSchema(value=1, type="Long"),
+            {"value": 1, "type": "Long"},
+        ),
+    ],
+)
+def test_encode_variables(value: Any, expected: dict[str, Any]) -> None:  # noqa: ANN401
+    assert orjson.loads(encode_variables({"name": value}).content) == {
+        "name": expected,
+    }
+
+
+def test_encode_variables_rejects_unknown_types() -> None:
+    with pytest.raises(ValueError, match="undefined type"):
+        encode_variables({"name": object()})
+
+
+@pytest.mark.anyio
+async def test_complete_with_encoded_variables() -> None:
+    bodies: list[bytes] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(204)
+
+    client = ExternalTaskClient(
+        worker_id="worker",
+        base_url="http://camunda/engine-rest",
+        auth_data=_AUTH,
+        transport=httpx.MockTransport(handler),
+    )
+    await client.complete(
+        "task",
+        global_variables=encode_variables({"count": 1}),
+        local_variables={"flag": deserialize(value=True)},
+    )
+
+    assert orjson.loads(bodies[0]) == {
+        "workerId": "worker",
+        "variables": {"count": {"value": 1, "type": "Integer"}},
+        "localVariables": {"flag": {"value": True, "type": "Boolean"}},
+    }
+
+
+@pytest.mark.anyio
+async def test_start_process_with_encoded_variables() -> None:
+    engine = FakeEngine()
+    engine.deploy("order", [ExternalTaskActivity("ship")])
+    client = CamundaEngineClient(
+        base_url="http://camunda/engine-rest",
+        auth_data=_AUTH,
+        transport=engine.transport,
+    )
+
+    process = await client.start_process(
+        "order",
+        business_key="order-1",
+        variables=encode_variables({"order": _Order(id=1, items=[])}),
+    )
+
+    assert engine.variables(str(process.id)) == {
+        "order": {"value": '{"id":1,"items":[]}', "type": "Json"},
+    }
@@ -0,0 +1,220 @@
+import asyncio
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from camunda_client import (
+    CamundaEngineClient,
+    ExternalTaskClient,
+    ExternalTaskConfig,
+    ExternalTaskContext,
+    ExternalTaskDTO,
+    ExternalTaskWorker,
+    VariableValueSchema,
+)
+from camunda_client.clients.dto import AuthData
+from camunda_client.exceptions import CamundaClientError
+from camunda_client.testing import (
+    ExternalTaskActivity,
+    FakeEngine,
+    FakeEngineConfig,
+    UserTaskActivity,
+)
+
+_BASE_URL = "http://camunda/engine-rest"
+_AUTH = AuthData(username="demo", password="demo")
+
+
+def _client(
+    engine: FakeEngine,
+    worker_id: str = "worker",
+    lock_duration: timedelta = timedelta(seconds=60),
+    transport: httpx.AsyncBaseTransport | None = None,
+) -> ExternalTaskClient:
+    return ExternalTaskClient(
+        worker_id=worker_id,
+        base_url=_BASE_URL,
+        auth_data=_AUTH,
+        transport=transport or engine.transport,
+        config=ExternalTaskConfig(
+            max_tasks=10,
+            lock_duration=lock_duration,
+            async_response_timeout=timedelta(0),
+            retry_timeout=timedelta(milliseconds=20),
+        ),
+    )
+
+
+@pytest.fixture
+def engine() -> FakeEngine:
+    engine = FakeEngine()
+    engine.deploy(
+        "order",
+        [ExternalTaskActivity("reserve"), ExternalTaskActivity("ship")],
+    )
+    return engine
+
+
+@pytest.mark.anyio
+async def test_worker_runs_processes_to_the_end(engine: FakeEngine) -> None:
+    for number in range(50):
+        engine.start_process(
+            "order",
+            variables={"number": VariableValueSchema(value=number, type="Integer")},
+        )
+
+    shipped = []
+
+    async def reserve(ctx: ExternalTaskContext, task: ExternalTaskDTO) -> None:
+        number = task.variables["number"].value
+        await ctx.complete(
+            global_variables={"reserved": VariableValueSchema(value=number)},
+        )
+
+    async def ship(ctx: ExternalTaskContext, task: ExternalTaskDTO) -> None:
+        shipped.append(task.variables["reserved"].value)
+        await ctx.complete()
+
+    worker = ExternalTaskWorker(
+        _client(engine),
+        pull_interval=timedelta(milliseconds=10),
+        max_in_flight=20,
+    )
+    async with asyncio.timeout(10), worker, asyncio.TaskGroup() as tg:
+        tg.create_task(worker.serve("reserve", reserve, concurrency=10))
+        tg.create_task(worker.serve("ship", ship, concurrency=10))
+        while engine.active_instances:
+            await asyncio.sleep(0.01)
+        worker.close()
+
+    assert sorted(shipped) == list(range(50))
+    assert engine.stats.ended == 50
+    assert engine.stats.completed == 100
+
+
+@pytest.mark.anyio
+async def test_lock_is_owned_by_worker_until_it_expires(engine: FakeEngine) -> None:
+    engine.start_process("order")
+    first = _client(engine, "first", lock_duration=timedelta(milliseconds=50))
+    second = _client(engine, "second")
+
+    [task] = await first.fetch_and_lock(["reserve"])
+    assert task.worker_id == "first"
+    assert await second.fetch_and_lock(["reserve"]) == []
+    with pytest.raises(CamundaClientError) as e:
+        await second.complete(task.id)
+    assert e.value.status_code == httpx.codes.BAD_REQUEST
+
+    await asyncio.sleep(0.06)
+    with pytest.raises(CamundaClientError):
+        await first.extend_lock(task.id)
+
+    [task] = await second.fetch_and_lock(["reserve"])
+    assert task.worker_id == "second"
+    with pytest.raises(CamundaClientError):
+        await first.complete(task.id)
+    await second.complete(task.id)
+
+    assert engine.stats.lock_expired == 1
+    assert engine.stats.lock_conflicts == 2
+
+
+@pytest.mark.anyio
+async def test_fetch_orders_by_priority_and_filters_topics() -> None:
+    engine = FakeEngine()
+    engine.deploy("low", [ExternalTaskActivity("topic", priority=1)])
+    engine.deploy("high", [ExternalTaskActivity("topic", priority=10)])
+    for process_key in ("low", "high", "low", "high"):
+        engine.start_process(process_key, business_key=process_key)
+    client = _client(engine)
+
+    tasks = await client.fetch_and_lock(["topic"], business_key="low")
+    assert [task.process_definition_key for task in tasks] == ["low", "low"]
+
+    tasks = await client.fetch_and_lock(["topic"], max_tasks=1, use_priority=True)
+    assert [task.process_definition_key for task in tasks] == ["high"]
+
+
+@pytest.mark.anyio
+async def test_fetch_waits_for_tasks(engine: FakeEngine) -> None:
+    client = _client(engine)
+
+    async def start() -> None:
+        await asyncio.sleep(0.05)
+        engine.start_process("order")
+
+    async with asyncio.TaskGroup() as tg:
+        tg.create_task(start())
+        fetch = tg.create_task(
+            client.fetch_and_lock(["reserve"], lock_timeout=timedelta(seconds=5)),
+        )
+    assert len(fetch.result()) == 1
+
+
+@pytest.mark.anyio
+async def test_failure_is_retried_until_incident(engine: FakeEngine) -> None:
+    engine.start_process("order")
+    client = _client(engine)
+
+    [task] = await client.fetch_and_lock(["reserve"])
+    await client.failure(task.id, error_message="retry", retries=1)
+    assert await client.fetch_and_lock(["reserve"]) == []
+
+    await asyncio.sleep(0.03)
+    [task] = await client.fetch_and_lock(["reserve"])
+    assert task.error_message == "retry"
+
+    await client.failure(task.id, error_message="give up", retries=0)
+    assert await client.fetch_and_lock(["reserve"]) == []
+    assert engine.stats.incidents == 1
+    assert engine.active_instances == 1
+
+
+@pytest.mark.anyio
+async def test_error_injection() -> None:
+    engine = FakeEngine(
+        FakeEngineConfig(error_rate=1, error_status=503, error_paths=["complete"]),
+    )
+    engine.deploy("order", [ExternalTaskActivity("reserve")])
+    engine.start_process("order")
+    client = _client(engine)
+
+    [task] = await client.fetch_and_lock(["reserve"])
+    with pytest.raises(CamundaClientError) as e:
+        await client.complete(task.id)
+    assert e.value.status_code == httpx.codes.SERVICE_UNAVAILABLE
+    assert engine.stats.injected_errors == 1
+
+
+@pytest.mark.anyio
+async def test_asgi_application(engine: FakeEngine) -> None:
+    client = _client(engine, transport=httpx.ASGITransport(app=engine))
+    engine.start_process("order")
+
+    [task] = await client.fetch_and_lock(["reserve"])
+    await client.complete(task.id)
+    assert [task.topic_name for task in await client.fetch_and_lock(["ship"])] == [
+        "ship",
+    ]
+
+
+@pytest.mark.anyio
+async def test_user_tasks() -> None:
+    engine = FakeEngine()
+    engine.deploy("review", [UserTaskActivity("Review")])
+    client = CamundaEngineClient(
+        base_url=_BASE_URL,
+        auth_data=_AUTH,
+        transport=engine.transport,
+    )
+    process = await client.start_process("review", business_key="order")
+
+    [task] = await client.get_tasks()
+    assert task.name == "Review"
+    assert task.process_instance_id == process.id
+    assert (await client.get_tasks_count()).count == 1
+
+    await client.submit_task_form(task.id)
+    assert await client.get_tasks() == []
+    assert engine.active_instances == 0
@@ -0,0 +1,69 @@
+from datetime import timedelta
+
+import httpx
+import orjson
+import pytest
+
+from camunda_client import ExternalTaskClient, ExternalTaskConfig
+from camunda_client.clients.dto import AuthData
+from camunda_client.clients.external_task.dto import FetchTopicDTO
+
+
+def _client(worker_id: str, bodies: list[bytes]) -> ExternalTaskClient:
+    def handler(request: httpx.Request) -> httpx.Response:
+        bodies.append(request.content)
+        return httpx.Response(200, json=[])
+
+    return ExternalTaskClient(
+        worker_id=worker_id,
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=httpx.MockTransport(handler),
+        config=ExternalTaskConfig(
+            max_tasks=5,
+            lock_duration=timedelta(seconds=10),
+            async_response_timeout=timedelta(seconds=20),
+        ),
+    )
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("worker_id", ["worker", '"maxTasks":0'])
+async def test_fetch_body_is_patched_with_max_tasks(worker_id: str) -> None:
+    bodies: list[bytes] = []
+    client = _client(worker_id, bodies)
+    topics = [FetchTopicDTO("a", variables=["x"]), FetchTopicDTO("b")]
+
+    await client.fetch_and_lock_json(topics)
+    await client.fetch_and_lock_json(topics, max_tasks=12)
+    await client.fetch_and_lock_json(topics, use_priority=True)
+
+    expected = {
+        "workerId": worker_id,
+        "maxTasks": 5,
+        "asyncResponseTimeout": 20000,
+        "topics": [
+            {
+                "topicName": "a",
+                "lockDuration": 10000,
+                "variables": ["x"],
+                "localVariables": None,
+                "processVariables": None,
+                "businessKey": None,
+            },
+            {
+                "topicName": "b",
+                "lockDuration": 10000,
+                "variables": None,
+                "localVariables": None,
+                "processVariables": None,
+                "businessKey": None,
+            },
+        ],
+        "usePriority": None,
+    }
+    assert [orjson.loads(body) for body in bodies] == [
+        expected,
+        {**expected, "maxTasks": 12},
+        {**expected, "usePriority": True},
+    ]
@@ -0,0 +1,104 @@
+from datetime import UTC, datetime, timedelta
+
+import httpx
+import pytest
+from prometheus_client import CollectorRegistry
+
+from camunda_client.clients import ExternalTaskClient
+from camunda_client.clients.dto import AuthData
+from camunda_client.exceptions import CamundaClientError
+from camunda_client.metrics.prometheus import PrometheusMetrics
+from camunda_client.metrics import InMemoryMetrics, Metrics
+from camunda_client.worker import ExternalTaskContext, ExternalTaskDTO
+
+
+def _handler(request: httpx.Request) -> httpx.Response:
+    if request.url.path.endswith("/unlock"):
+        return httpx.Response(500, json={"message": "error"})
+    return httpx.Response(204)
+
+
+@pytest.fixture
+def metrics() -> InMemoryMetrics:
+    return InMemoryMetrics()
+
+
+@pytest.fixture
+def client(metrics: InMemoryMetrics) -> ExternalTaskClient:
+    return ExternalTaskClient(
+        worker_id="worker",
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=httpx.MockTransport(_handler),
+        metrics=metrics,
+    )
+
+
+def _context(client: ExternalTaskClient, expires_in: int) -> ExternalTaskContext:
+    task = ExternalTaskDTO(
+        id="task",
+        worker_id="worker",
+        topic_name="topic",
+        lock_expiration_time=datetime.now(tz=UTC) + timedelta(seconds=expires_in),
+        variables={},
+    )
+    return ExternalTaskContext(client=client, task=task, exit_hook=lambda _: None)
+
+
+@pytest.mark.anyio
+async def test_requests_are_observed(
+    client: ExternalTaskClient,
+    metrics: InMemoryMetrics,
+) -> None:
+    await client.complete("task")
+    with pytest.raises(CamundaClientError):
+        await client.unlock("task")
+
+    assert len(metrics.request_seconds["complete"]) == 1
+    assert len(metrics.request_seconds["unlock"]) == 1
+    assert metrics.request_errors == {"unlock": 1}
+
+
+@pytest.mark.anyio
+async def test_handler_outcome_is_observed(
+    client: ExternalTaskClient,
+    metrics: InMemoryMetrics,
+) -> None:
+    async with _context(client, expires_in=60) as task:
+        await client.complete(task.id)
+    ctx = _context(client, expires_in=60)
+    async with ctx:
+        await ctx.complete()
+    with pytest.raises(ValueError, match="boom"):
+        async with _context(client, expires_in=-1):
+            raise ValueError("boom")
+
+    assert metrics.handler_outcomes == {
+        ("topic", "unhandled"): 1,
+        ("topic", "completed"): 1,
+        ("topic", "error"): 1,
+    }
+    assert metrics.lock_expirations == {"topic": 1}
+
+
+def test_lock_expiration_is_checked_only_if_tracked() -> None:
+    assert not Metrics().tracks_lock_expiration
+    assert InMemoryMetrics().tracks_lock_expiration
+
+
+def test_prometheus_metrics_share_collectors_of_registry() -> None:
+    registry = CollectorRegistry()
+    first = PrometheusMetrics(registry=registry)
+    second = PrometheusMetrics(registry=registry)
+    PrometheusMetrics(namespace="other", registry=registry)
+    PrometheusMetrics()
+    PrometheusMetrics()
+
+    first.lock_expired("topic")
+    second.lock_expired("topic")
+
+    value = registry.get_sample_value(
+        "camunda_client_lock_expired_total",
+        {"topic_name": "topic"},
+    )
+    assert value == 2  # noqa: PLR2004
@@ -0,0 +1,13 @@
+from pydantic import BaseModel, Field
+
+from camunda_client.utils import model_variable_names
+
+
+class _Variables(BaseModel):
+    email: str
+    sent_at: str = Field(alias="sentAt")
+    event_id: str = Field(validation_alias="eventId")
+
+
+def test_model_variable_names() -> None:
+    assert model_variable_names(_Variables) == ["email", "sentAt", "eventId"]
@@ -0,0 +1,76 @@
+from datetime import timedelta
+
+import httpx
+import pytest
+
+from camunda_client.clients import AuthData, ExternalTaskClient, NodePool
+
+
+def test_round_robin() -> None:
+    pool = NodePool(["http://a", "http://b"])
+
+    assert [pool.select().base_url for _ in range(4)] == [
+        "http://a",
+        "http://b",
+        "http://a",
+        "http://b",
+    ]
+
+
+def test_least_latency() -> None:
+    pool = NodePool(["http://a", "http://b"], strategy="least_latency")
+    a, b = pool.nodes
+    pool.succeeded(a, 0.5)
+    pool.succeeded(b, 0.1)
+
+    assert pool.select() is b
+
+
+def test_node_is_ejected_and_probed_again() -> None:
+    pool = NodePool(
+        ["http://a", "http://b"],
+        max_failures=2,
+        eject_for=timedelta(hours=1),
+    )
+    a, b = pool.nodes
+    pool.failed(a)
+    assert {pool.select() for _ in range(2)} == {a, b}
+
+    pool.failed(a)
+    assert {pool.select() for _ in range(2)} == {b}
+    # Ejected nodes are used only if there is nothing else
+    assert pool.select(exclude=[b]) is a
+
+    # The node is probed after the ejection time and ejected again on failure
+    a.ejected_until = 0
+    assert {pool.select() for _ in range(2)} == {a, b}
+    pool.failed(a)
+    assert {pool.select() for _ in range(2)} == {b}
+
+    pool.succeeded(a, 0.1)
+    assert {pool.select() for _ in range(2)} == {a, b}
+
+
+@pytest.mark.anyio
+async def test_request_fails_over_to_another_node() -> None:
+    hosts: list[str] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        hosts.append(request.url.host)
+        if request.url.host == "a":
+            raise httpx.ConnectError("refused", request=request)
+        return httpx.Response(204)
+
+    pool = NodePool(["http://a/engine-rest", "http://b/engine-rest"])
+    client = ExternalTaskClient(
+        worker_id="worker",
+        base_url=pool,
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=httpx.MockTransport(handler),
+    )
+    await client.complete("task")
+    await client.complete("task")
+
+    # Round-robin returns to the node until it is ejected
+    assert hosts == ["a", "b", "a", "b"]
+    assert [node.failures for node in pool.nodes] == [2, 0]
@@ -0,0 +1,47 @@
+from unittest.mock import patch
+
+from pydantic import BaseModel
+
+from camunda_client.types_ import VariableValueSchema
+from camunda_client.utils import ParsedVariables, process_variable
+from camunda_client.worker import ExternalTaskDTO
+
+
+class _Variables(BaseModel):
+    email: str
+
+
+def test_parsed_variables_decodes_on_access_once() -> None:
+    parsed = ParsedVariables(
+        {
+            "email": VariableValueSchema(value="user@example.com", type="String"),
+            "payload": VariableValueSchema(value='{"foo": "bar"}', type="Json"),
+        },
+    )
+
+    with patch(
+        "camunda_client.utils.process_variable",
+        side_effect=process_variable,
+    ) as process:
+        assert len(parsed) == 2  # noqa: PLR2004
+        assert process.call_count == 0
+
+        assert parsed["payload"] == {"foo": "bar"}
+        assert parsed["payload"] is parsed["payload"]
+        assert process.call_count == 1
+
+    assert dict(parsed) == {"email": "user@example.com", "payload": {"foo": "bar"}}
+
+
+def test_get_variables_skips_unused_variables() -> None:
+    task = ExternalTaskDTO(
+        id="1",
+        worker_id="worker",
+        topic_name="topic",
+        variables={
+            "email": VariableValueSchema(value="user@example.com", type="String"),
+            "payload": VariableValueSchema(value="not a json", type="Json"),
+        },
+    )
+
+    assert task.get_variables(_Variables) == _Variables(email="user@example.com")
@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from camunda_client.clients import (
+    AuthData,
+    CircuitBreaker,
+    CircuitBreakerConfig,
+    ExternalTaskClient,
+    RateLimit,
+    RateLimiter,
+)
+from camunda_client.clients.rate_limit import TokenBucket, endpoint_group
+from camunda_client.exceptions import CircuitOpenError
+
+
+@pytest.mark.parametrize(
+    ("operation", "group"),
+    [
+        ("fetch_and_lock", "fetch"),
+        ("complete", "complete"),
+        ("extend_lock", "complete"),
+        ("get_history_tasks", "history"),
+        ("get_variable_instances", "history"),
+        ("update_variable_instances", "engine"),
+        ("get_tasks", "engine"),
+    ],
+)
+def test_endpoint_group(operation: str, group: str) -> None:
+    assert endpoint_group(operation) == group
+
+
+@pytest.mark.anyio
+async def test_token_bucket_waiters_are_served_in_order() -> None:
+    bucket = TokenBucket(RateLimit(rate=100, burst=2))
+    order: list[int] = []
+
+    async def acquire(index: int) -> None:
+        await bucket.acquire()
+        order.append(index)
+
+    started = time.monotonic()
+    async with asyncio.TaskGroup() as tg:
+        for index in range(6):
+            tg.create_task(acquire(index))
+
+    # Two requests fit into the burst, the other four wait 10ms each
+    assert time.monotonic() - started >= 0.035  # noqa: PLR2004
+    assert order == list(range(6))
+
+
+@pytest.mark.anyio
+async def test_rate_limiter_limits_only_configured_groups() -> None:
+    limiter = RateLimiter({"complete": RateLimit(rate=0.001)})
+
+    await limiter.acquire("complete")
+    await asyncio.wait_for(limiter.acquire("fetch_and_lock"), timeout=1)
+    with pytest.raises(TimeoutError):
+        await asyncio.wait_for(limiter.acquire("unlock"), timeout=0.05)
+
+
+@pytest.mark.anyio
+async def test_open_circuit_does_not_spend_tokens() -> None:
+    breaker = CircuitBreaker(CircuitBreakerConfig(window=1, min_calls=1))
+    breaker.record("complete", failed=True, seconds=None)
+    limiter = RateLimiter({"complete": RateLimit(rate=0.001)})
+    client = ExternalTaskClient(
+        worker_id="worker",
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=httpx.MockTransport(lambda _: httpx.Response(204)),
+        breaker=breaker,
+        rate_limiter=limiter,
+    )
+
+    async with asyncio.timeout(1):
+        for _ in range(3):
+            with pytest.raises(CircuitOpenError):
+                await client.complete("task")
+        await limiter.acquire("complete")
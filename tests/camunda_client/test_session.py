@@ -0,0 +1,36 @@
+import httpx
+import pytest
+
+from camunda_client.clients import AuthData, ExternalTaskClient
+from camunda_client.clients.session import _SharedTransport
+
+
+class _Transport(httpx.MockTransport):
+    def __init__(self) -> None:
+        super().__init__(lambda _: httpx.Response(204))
+        self.closed = False
+
+    async def aclose(self) -> None:
+        self.closed = True
+
+
+def _client(transport: httpx.AsyncBaseTransport) -> ExternalTaskClient:
+    return ExternalTaskClient(
+        worker_id="worker",
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=transport,
+    )
+
+
+@pytest.mark.anyio
+async def test_closing_client_keeps_shared_transport_open() -> None:
+    transport = _Transport()
+    shared = _SharedTransport(transport)
+
+    async with _client(shared) as client:
+        await client.complete("task")
+    async with _client(shared) as client:
+        await client.complete("task")
+
+    assert not transport.closed
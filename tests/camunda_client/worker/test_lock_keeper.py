@@ -0,0 +1,52 @@
+import asyncio
+from datetime import timedelta
+from typing import Any
+
+import pytest
+
+from camunda_client.clients import ExternalTaskConfig
+from camunda_client.worker.dto import ExternalTaskDTO
+from camunda_client.worker.lock_keeper import LockKeeper
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.config = ExternalTaskConfig(
+            lock_duration=timedelta(milliseconds=200),
+            auto_extend_lock=True,
+        )
+        self.extended: list[str] = []
+
+    async def extend_lock(self, task_id: str, **_: Any) -> None:  # noqa: ANN401
+        self.extended.append(task_id)
+
+
+def _task(ident: str) -> ExternalTaskDTO:
+    return ExternalTaskDTO(
+        id=ident,
+        worker_id="worker",
+        topic_name="topic",
+        variables={},
+    )
+
+
+@pytest.mark.anyio
+async def test_lock_keeper_extends_until_discarded() -> None:
+    client = _Client()
+    keeper = LockKeeper(client)  # type: ignore[arg-type]
+    runner = asyncio.create_task(keeper.run())
+
+    keeper.add(_task("long"))
+    keeper.add(_task("short"))
+    keeper.discard("short")
+    await asyncio.sleep(0.45)
+    keeper.discard("long")
+    extended = len(client.extended)
+    await asyncio.sleep(0.25)
+    keeper.close()
+    await runner
+
+    assert set(client.extended) == {"long"}
+    assert extended >= 3  # noqa: PLR2004
+    assert len(client.extended) == extended
+    assert len(keeper) == 0
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+import pytest
+
+from camunda_client.worker.poller import Poller
+
+
+@pytest.mark.parametrize(
+    ("tasks", "elapsed", "top_up", "expected"),
+    [
+        (10, 0, False, 0),
+        (0, 30, False, 0),
+        (0, 1, False, 2),
+        (0, 0, False, 3),
+        (5, 0, False, 3),
+        (5, 0, True, 0),
+    ],
+)
+def test_poller_fetched(
+    tasks: int,
+    elapsed: float,
+    top_up: bool,  # noqa: FBT001
+    expected: float,
+) -> None:
+    poller = Poller(timedelta(seconds=3), top_up=top_up)
+    assert poller.fetched(tasks, max_tasks=10, elapsed=elapsed) == expected
+
+
+def test_poller_backs_off() -> None:
+    poller = Poller(
+        timedelta(seconds=3),
+        backoff=timedelta(seconds=1),
+        max_backoff=timedelta(seconds=5),
+    )
+    for ceiling in (1, 2, 4, 5, 5, 5):
+        assert 0 <= poller.failed() <= ceiling
+    assert poller.failures == 6  # noqa: PLR2004
+
+    poller.fetched(1, max_tasks=1, elapsed=0)
+    assert poller.failures == 0
@@ -0,0 +1,78 @@
+import asyncio
+import functools
+from collections.abc import Awaitable, Callable, Iterator
+
+import pytest
+import stamina
+
+from camunda_client.exceptions import CamundaClientError, CircuitOpenError
+from camunda_client.worker import TaskReporter
+
+
+@pytest.fixture(autouse=True)
+def _disable_retry_wait() -> Iterator[None]:
+    stamina.set_testing(True, attempts=3)  # noqa: FBT003
+    yield
+    stamina.set_testing(False)  # noqa: FBT003
+
+
+@pytest.mark.anyio
+async def test_reporter_retries_and_flushes_on_close() -> None:
+    reporter = TaskReporter(concurrency=2, attempts=3)
+    runner = asyncio.create_task(reporter.run())
+    await asyncio.sleep(0)
+    sent: list[str] = []
+    done: list[str] = []
+    calls = 0
+
+    async def flaky() -> None:
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            raise CamundaClientError(status_code=503)
+        sent.append("flaky")
+
+    async def bad_request() -> None:
+        raise CamundaClientError(status_code=400)
+
+    def report(ident: str) -> Callable[[], Awaitable[None]]:
+        async def send() -> None:
+            sent.append(ident)
+
+        return send
+
+    for ident in map(str, range(10)):
+        reporter.submit(ident, report(ident))
+    reporter.submit("flaky", flaky, on_sent=lambda: done.append("flaky"))
+    reporter.submit("bad", bad_request, on_sent=lambda: done.append("bad"))
+    reporter.close()
+    await runner
+
+    assert sorted(sent) == sorted([*map(str, range(10)), "flaky"])
+    assert sorted(done) == ["bad", "flaky"]
+    assert not reporter.is_running
+
+
+@pytest.mark.anyio
+async def test_reporter_drops_outcomes_rejected_by_open_circuit_on_close() -> None:
+    reporter = TaskReporter(concurrency=1)
+    runner = asyncio.create_task(reporter.run())
+    await asyncio.sleep(0)
+    calls = 0
+    done: list[str] = []
+
+    async def rejected() -> None:
+        nonlocal calls
+        calls += 1
+        raise CircuitOpenError("complete", retry_after=60)
+
+    for ident in ("waiting", "queued"):
+        reporter.submit(ident, rejected, on_sent=functools.partial(done.append, ident))
+    await asyncio.sleep(0.01)
+    reporter.close()
+    async with asyncio.timeout(1):
+        await runner
+
+    # The waiting outcome is tried once more on close, the queued one once
+    assert calls == 3  # noqa: PLR2004
+    assert done == ["waiting", "queued"]
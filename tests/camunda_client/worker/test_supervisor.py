@@ -0,0 +1,98 @@
+import os
+import signal
+import threading
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+from camunda_client.worker import WorkerProcessDTO, WorkerSupervisor
+from camunda_client.worker.supervisor import split_topics
+
+_DIR_ENV = "CAMUNDA_CLIENT_SUPERVISOR_TEST_DIR"
+
+
+@pytest.mark.parametrize(
+    ("topics", "processes", "expected"),
+    [
+        (["a", "b", "c"], 2, [["a", "c"], ["b"]]),
+        (["a", "b"], 2, [["a"], ["b"]]),
+        (["a", "b"], 3, [["a"], ["b"], ["a"]]),
+    ],
+)
+def test_split_topics(
+    topics: list[str],
+    processes: int,
+    expected: list[list[str]],
+) -> None:
+    assert split_topics(topics, processes) == expected
+
+
+async def _target(process: WorkerProcessDTO) -> None:
+    directory = Path(os.environ[_DIR_ENV])
+    crashed = directory / f"{process.worker_id}.crashed"
+    if process.index == 0 and not crashed.exists():
+        crashed.touch()
+        raise RuntimeError
+
+    (directory / f"{process.worker_id}.started").write_text(",".join(process.topics))
+    await process.stopping.wait()
+    (directory / f"{process.worker_id}.stopped").touch()
+
+
+def test_supervisor_restarts_crashed_process_and_stops_children(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv(_DIR_ENV, str(tmp_path))
+    supervisor = WorkerSupervisor(
+        _target,
+        worker_id="worker",
+        topics=["a", "b"],
+        processes=2,
+        restart_delay=timedelta(milliseconds=100),
+        start_method="fork",
+    )
+    timer = threading.Timer(2, os.kill, args=(os.getpid(), signal.SIGTERM))
+    timer.start()
+    supervisor.run()
+
+    assert sorted(path.name for path in tmp_path.iterdir()) == [
+        "worker-0.crashed",
+        "worker-0.started",
+        "worker-0.stopped",
+        "worker-1.started",
+        "worker-1.stopped",
+    ]
+    assert (tmp_path / "worker-1.started").read_text() == "b"
+
+
+async def _returning_target(process: WorkerProcessDTO) -> None:
+    directory = Path(os.environ[_DIR_ENV])
+    with (directory / f"{process.worker_id}.started").open("a") as file:
+        file.write("started\n")
+
+
+def test_supervisor_does_not_restart_process_that_exits_cleanly(
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv(_DIR_ENV, str(tmp_path))
+    supervisor = WorkerSupervisor(
+        _returning_target,
+        worker_id="worker",
+        topics=["a", "b"],
+        processes=2,
+        restart_delay=timedelta(milliseconds=10),
+        start_method="fork",
+    )
+    # Stops the supervisor if it keeps restarting the processes
+    timer = threading.Timer(2, os.kill, args=(os.getpid(), signal.SIGTERM))
+    timer.start()
+    try:
+        supervisor.run()
+    finally:
+        timer.cancel()
+
+    for worker_id in ("worker-0", "worker-1"):
+        assert (tmp_path / f"{worker_id}.started").read_text() == "started\n"
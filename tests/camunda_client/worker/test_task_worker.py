@@ -0,0 +1,353 @@
+import asyncio
+import threading
+import time
+from datetime import timedelta
+from typing import Any
+
+import httpx
+import orjson
+import pytest
+
+from camunda_client import (
+    ExternalTaskClient,
+    ExternalTaskConfig,
+    Variables,
+    VariableValueSchema,
+)
+from camunda_client.clients.dto import AuthData
+from camunda_client.testing import ExternalTaskActivity, FakeEngine
+from camunda_client.worker import (
+    ExternalTaskContext,
+    ExternalTaskDTO,
+    ExternalTaskWorker,
+    TaskReporter,
+)
+from camunda_client.worker.types_ import ExecutorType
+
+
+def _client(
+    transport: httpx.AsyncBaseTransport,
+    max_tasks: int = 10,
+) -> ExternalTaskClient:
+    return ExternalTaskClient(
+        worker_id="worker",
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=transport,
+        config=ExternalTaskConfig(
+            max_tasks=max_tasks,
+            async_response_timeout=timedelta(0),
+        ),
+    )
+
+
+class _Engine:
+    """Returns `responses` to fetches one by one, then no tasks"""
+
+    def __init__(self, *responses: list[str]) -> None:
+        self.fetches: list[dict[str, Any]] = []
+        self.unlocked: list[str] = []
+        self.completed: list[str] = []
+        self.accepts_reports = asyncio.Event()
+        self.accepts_reports.set()
+        self._responses = list(responses)
+
+    @property
+    def transport(self) -> httpx.MockTransport:
+        return httpx.MockTransport(self._handle)
+
+    async def _handle(self, request: httpx.Request) -> httpx.Response:
+        *_, task_id, action = request.url.path.split("/")
+        if action == "complete":
+            await self.accepts_reports.wait()
+            self.completed.append(task_id)
+            return httpx.Response(204)
+        if action == "unlock":
+            self.unlocked.append(task_id)
+            if task_id == "failing":
+                return httpx.Response(500, json={"message": "error"})
+            return httpx.Response(204)
+
+        body = orjson.loads(request.content)
+        self.fetches.append(body)
+        task_ids = self._responses.pop(0) if self._responses else []
+        return httpx.Response(
+            200,
+            json=[
+                {
+                    "id": task_id,
+                    "workerId": "worker",
+                    "topicName": body["topics"][0]["topicName"],
+                    "variables": {},
+                }
+                for task_id in task_ids
+            ],
+        )
+
+    def topics(self, fetch: int) -> list[str]:
+        return [topic["topicName"] for topic in self.fetches[fetch]["topics"]]
+
+
+@pytest.mark.anyio
+async def test_unsubscribe_releases_queued_tasks() -> None:
+    engine = FakeEngine()
+    engine.deploy("a", [ExternalTaskActivity("a")])
+    engine.deploy("b", [ExternalTaskActivity("b")])
+    worker = ExternalTaskWorker(_client(engine.transport), pull_interval=timedelta(0))
+
+    async with asyncio.timeout(5), worker:
+        async with worker.subscribe("b") as consumer_b:
+            async with worker.subscribe("a"):
+                engine.start_process("a")
+                while engine.stats.fetched < 1:
+                    await asyncio.sleep(0.01)
+            # The queued task of "a" is given back and does not hold the batch
+            assert engine.stats.unlocked == 1
+
+            engine.start_process("b")
+            ctx = await anext(consumer_b)
+            async with ctx:
+                await ctx.complete()
+        worker.close()
+
+    assert engine.stats.completed == 1
+    assert worker.shutdown_report.released == 1
+
+
+@pytest.mark.anyio
+async def test_full_topic_is_not_fetched_and_extra_tasks_are_unlocked() -> None:
+    engine = _Engine(["queued", "extra", "failing"])
+    worker = ExternalTaskWorker(
+        _client(engine.transport, max_tasks=5),
+        pull_interval=timedelta(milliseconds=10),
+        max_in_flight=10,
+    )
+
+    async with (
+        asyncio.timeout(5),
+        worker,
+        worker.subscribe("a", concurrency=1) as consumer,
+        worker.subscribe("b"),
+    ):
+        while len(engine.fetches) < 2:  # noqa: PLR2004
+            await asyncio.sleep(0.01)
+        assert engine.topics(0) == ["a", "b"]
+        assert engine.topics(1) == ["b"]
+        assert sorted(engine.unlocked) == ["extra", "failing"]
+
+        async with await anext(consumer) as task:
+            assert task.id == "queued"
+        fetches = len(engine.fetches)
+        while len(engine.fetches) == fetches:
+            await asyncio.sleep(0.01)
+        assert engine.topics(-1) == ["a", "b"]
+        worker.close()
+
+    assert engine.fetches[0]["maxTasks"] == 5  # noqa: PLR2004
+
+
+@pytest.mark.anyio
+async def test_fetch_is_limited_by_free_slots_of_topics() -> None:
+    engine = _Engine()
+    worker = ExternalTaskWorker(
+        _client(engine.transport),
+        pull_interval=timedelta(milliseconds=10),
+    )
+
+    async with (
+        asyncio.timeout(5),
+        worker,
+        worker.subscribe("a", concurrency=2),
+        worker.subscribe("b", concurrency=1),
+    ):
+        while not engine.fetches:
+            await asyncio.sleep(0.01)
+        worker.close()
+
+    assert engine.fetches[0]["maxTasks"] == 3  # noqa: PLR2004
+
+
+@pytest.mark.anyio
+async def test_serve_runs_at_most_concurrency_handlers() -> None:
+    engine = FakeEngine()
+    engine.deploy("process", [ExternalTaskActivity("topic")])
+    for _ in range(6):
+        engine.start_process("process")
+    running = 0
+    max_running = 0
+
+    async def handler(ctx: ExternalTaskContext, _: ExternalTaskDTO) -> None:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        await ctx.complete()
+
+    worker = ExternalTaskWorker(
+        _client(engine.transport),
+        pull_interval=timedelta(milliseconds=10),
+        max_in_flight=10,
+    )
+    async with asyncio.timeout(5), worker, asyncio.TaskGroup() as tg:
+        tg.create_task(worker.serve("topic", handler, concurrency=2))
+        while engine.active_instances:
+            await asyncio.sleep(0.01)
+        worker.close()
+
+    assert engine.stats.completed == 6  # noqa: PLR2004
+    assert max_running == 2  # noqa: PLR2004
+
+
+@pytest.mark.anyio
+async def test_slot_is_held_until_outcome_is_sent() -> None:
+    engine = _Engine(["first"], ["second"])
+    engine.accepts_reports.clear()
+    worker = ExternalTaskWorker(
+        _client(engine.transport),
+        pull_interval=timedelta(milliseconds=10),
+        max_in_flight=1,
+        reporter=TaskReporter(),
+    )
+
+    async with asyncio.timeout(5), worker, worker.subscribe("a") as consumer:
+        ctx = await anext(consumer)
+        async with ctx:
+            await ctx.complete()
+        await asyncio.sleep(0.05)
+        assert len(engine.fetches) == 1
+
+        engine.accepts_reports.set()
+        ctx = await anext(consumer)
+        async with ctx as task:
+            assert task.id == "second"
+            await ctx.complete()
+        worker.close()
+
+    assert engine.completed == ["first", "second"]
+
+
+@pytest.mark.anyio
+async def test_pipelined_worker_tops_up_freed_slots() -> None:
+    engine = _Engine(["1", "2", "3"])
+    worker = ExternalTaskWorker(
+        _client(engine.transport, max_tasks=3),
+        pull_interval=timedelta(seconds=10),
+        max_in_flight=3,
+    )
+
+    async with asyncio.timeout(5), worker, worker.subscribe("a") as consumer:
+        ctx = await anext(consumer)
+        async with ctx:
+            await ctx.complete()
+        while len(engine.fetches) < 2:  # noqa: PLR2004
+            await asyncio.sleep(0.01)
+        worker.close()
+
+    assert [fetch["maxTasks"] for fetch in engine.fetches] == [3, 1]
+
+
+@pytest.mark.anyio
+async def test_batch_worker_waits_for_whole_batch() -> None:
+    engine = _Engine(["1", "2"])
+    worker = ExternalTaskWorker(
+        _client(engine.transport, max_tasks=2),
+        pull_interval=timedelta(milliseconds=10),
+    )
+
+    async with asyncio.timeout(5), worker, worker.subscribe("a") as consumer:
+        ctx = await anext(consumer)
+        async with ctx:
+            await ctx.complete()
+        await asyncio.sleep(0.05)
+        assert len(engine.fetches) == 1
+
+        ctx = await anext(consumer)
+        async with ctx:
+            await ctx.complete()
+        while len(engine.fetches) < 2:  # noqa: PLR2004
+            await asyncio.sleep(0.01)
+        worker.close()
+
+    assert [fetch["maxTasks"] for fetch in engine.fetches[:2]] == [2, 2]
+
+
+def _double(task: ExternalTaskDTO) -> Variables:
+    number = task.variables["number"].value
+    if number < 0:
+        msg = "negative number"
+        raise ValueError(msg)
+    time.sleep(0.05)
+    return {"doubled": VariableValueSchema(value=number * 2, type="Integer")}
+
+
+@pytest.mark.anyio
+@pytest.mark.parametrize("executor", ["thread", "process"])
+async def test_serve_runs_sync_handler_on_executor(executor: ExecutorType) -> None:
+    engine = FakeEngine()
+    engine.deploy(
+        "process",
+        [ExternalTaskActivity("topic"), ExternalTaskActivity("next")],
+    )
+    processes = {
+        number: engine.start_process(
+            "process",
+            variables={"number": VariableValueSchema(value=number, type="Integer")},
+        )
+        for number in (1, 2, -1)
+    }
+    worker = ExternalTaskWorker(
+        _client(engine.transport),
+        pull_interval=timedelta(milliseconds=10),
+        max_in_flight=10,
+    )
+    ticks = 0
+
+    async with asyncio.timeout(10), worker, asyncio.TaskGroup() as tg:
+        tg.create_task(
+            worker.serve("topic", _double, executor=executor, max_workers=1),
+        )
+        while engine.stats.completed + engine.stats.failed < 3:  # noqa: PLR2004
+            await asyncio.sleep(0.01)
+            ticks += 1
+        worker.close()
+
+    assert engine.stats.completed == 2  # noqa: PLR2004
+    assert engine.stats.failed == 1
+    assert engine.variables(processes[2])["doubled"]["value"] == 4  # noqa: PLR2004
+    # Handlers block the executor, not the event loop
+    assert ticks >= 10  # noqa: PLR2004
+
+
+@pytest.mark.anyio
+async def test_cancelled_serve_does_not_wait_for_blocking_handler() -> None:
+    engine = FakeEngine()
+    engine.deploy("process", [ExternalTaskActivity("topic")])
+    engine.start_process("process")
+    started = threading.Event()
+    released = threading.Event()
+
+    def handler(_: ExternalTaskDTO) -> None:
+        started.set()
+        released.wait(5)
+
+    worker = ExternalTaskWorker(
+        _client(engine.transport),
+        pull_interval=timedelta(milliseconds=10),
+    )
+    try:
+        async with asyncio.timeout(5), worker:
+            serve = asyncio.create_task(
+                worker.serve("topic", handler, executor="thread"),
+            )
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+
+            cancelled_at = time.perf_counter()
+            serve.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await serve
+            assert time.perf_counter() - cancelled_at < 0.5  # noqa: PLR2004
+            worker.close()
+    finally:
+        released.set()
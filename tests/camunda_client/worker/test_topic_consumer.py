@@ -0,0 +1,103 @@
+import asyncio
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from camunda_client.exceptions import CamundaClientError
+from camunda_client.worker import ExternalTaskContext, ExternalTaskDTO, TopicConsumer
+
+_NOW = datetime(2026, 1, 1, tzinfo=UTC)
+
+
+class _Client:
+    def __init__(self) -> None:
+        self.unlocked: list[str] = []
+
+    async def unlock(self, task_id: str) -> None:
+        if task_id == "hanging":
+            await asyncio.sleep(10)
+        if task_id == "failing":
+            raise CamundaClientError(status_code=500)
+        self.unlocked.append(task_id)
+
+
+def _context(
+    ident: str,
+    priority: int | None = None,
+    expires_in: int | None = None,
+    client: _Client | None = None,
+) -> ExternalTaskContext:
+    task = ExternalTaskDTO(
+        id=ident,
+        worker_id="worker",
+        topic_name="topic",
+        priority=priority,
+        lock_expiration_time=(
+            _NOW + timedelta(seconds=expires_in) if expires_in is not None else None
+        ),
+        variables={},
+    )
+    return ExternalTaskContext(
+        client=client,  # type: ignore[arg-type]
+        task=task,
+        exit_hook=lambda _: None,
+    )
+
+
+@pytest.mark.anyio
+async def test_topic_consumer_orders_by_priority_and_lock_expiration() -> None:
+    consumer = TopicConsumer()
+    for ctx in (
+        _context("low", priority=0, expires_in=10),
+        _context("no-lock", priority=5, expires_in=None),
+        _context("high-late", priority=5, expires_in=60),
+        _context("high-soon", priority=5, expires_in=30),
+        _context("default", priority=None, expires_in=5),
+    ):
+        consumer.add_task(ctx)
+
+    order = [(await anext(consumer)).task.id for _ in range(5)]
+
+    assert order == ["high-soon", "high-late", "no-lock", "default", "low"]
+    assert consumer.in_flight == 5  # noqa: PLR2004
+
+
+@pytest.mark.anyio
+async def test_topic_consumer_close_stops_iterators_and_unlocks_queued() -> None:
+    client = _Client()
+    consumer = TopicConsumer(concurrency=3)
+    received: list[str] = []
+
+    async def consume() -> None:
+        async for ctx in consumer:
+            received.append(ctx.task.id)
+            await asyncio.sleep(0.01)
+
+    async with asyncio.TaskGroup() as tg:
+        for _ in range(2):
+            tg.create_task(consume())
+        await asyncio.sleep(0)
+        for ident in ("1", "2", "3"):
+            consumer.add_task(_context(ident, client=client))
+        await asyncio.sleep(0)
+        consumer.close()
+
+    assert sorted(received + client.unlocked) == ["1", "2", "3"]
+    assert len(client.unlocked) == 1
+
+
+@pytest.mark.anyio
+async def test_topic_consumer_unlock_queued_reports_left_locked() -> None:
+    client = _Client()
+    consumer = TopicConsumer(
+        unlock_concurrency=2,
+        unlock_timeout=timedelta(seconds=0.1),
+    )
+    idents = ["hanging", "failing", *map(str, range(10))]
+    for ident in idents:
+        consumer.add_task(_context(ident, client=client))
+    consumer.close()
+
+    assert [ctx async for ctx in consumer] == []
+    assert consumer.shutdown_report.released == 10  # noqa: PLR2004
+    assert sorted(consumer.shutdown_report.left_locked) == ["failing", "hanging"]
@@ -0,0 +1,125 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+from opentelemetry.sdk.trace import TracerProvider
+from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+from opentelemetry.sdk.trace.export.in_memory_span_exporter import (
+    InMemorySpanExporter,
+)
+from opentelemetry.trace import NoOpTracer
+
+from camunda_client.clients import ExternalTaskClient
+from camunda_client.clients.dto import AuthData
+from camunda_client.worker import ExternalTaskContext, ExternalTaskDTO, TaskReporter
+from camunda_client.worker.tracing import TaskTracer
+
+_TASK = ExternalTaskDTO(
+    id="task",
+    worker_id="worker",
+    topic_name="topic",
+    activity_id="activity",
+    process_instance_id="process-instance",
+    variables={},
+)
+
+
+@pytest.fixture
+def exporter() -> InMemorySpanExporter:
+    return InMemorySpanExporter()
+
+
+@pytest.fixture
+def tracer(exporter: InMemorySpanExporter) -> TaskTracer:
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    return TaskTracer(provider.get_tracer("tests"))
+
+
+@pytest.fixture
+def client() -> ExternalTaskClient:
+    return ExternalTaskClient(
+        worker_id="worker",
+        base_url="http://camunda/engine-rest",
+        auth_data=AuthData(username="demo", password="demo"),
+        transport=httpx.MockTransport(lambda _: httpx.Response(204)),
+    )
+
+
+@pytest.mark.anyio
+async def test_task_trace(
+    tracer: TaskTracer,
+    exporter: InMemorySpanExporter,
+    client: ExternalTaskClient,
+) -> None:
+    now = time.time_ns()
+    ctx = ExternalTaskContext(
+        client=client,
+        task=_TASK,
+        exit_hook=lambda _: None,
+        trace=tracer.start_task(_TASK, fetched_at=now, decoded_at=now + 1000),
+    )
+    async with ctx:
+        await ctx.complete()
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    assert set(spans) == {"decode", "handle", "complete", "process topic"}
+
+    root = spans["process topic"]
+    assert root.parent is None
+    assert root.start_time == now
+    assert root.attributes == {
+        "camunda.task_id": "task",
+        "camunda.topic_name": "topic",
+        "camunda.process_instance_id": "process-instance",
+        "camunda.activity_id": "activity",
+        "camunda.outcome": "completed",
+    }
+    for name in ("decode", "handle", "complete"):
+        parent = spans[name].parent
+        assert parent is not None
+        assert parent.span_id == root.context.span_id
+    assert spans["decode"].end_time == now + 1000
+
+
+@pytest.mark.anyio
+async def test_task_trace_ends_when_reported(
+    tracer: TaskTracer,
+    exporter: InMemorySpanExporter,
+    client: ExternalTaskClient,
+) -> None:
+    reporter = TaskReporter()
+    runner = asyncio.create_task(reporter.run())
+    await asyncio.sleep(0)
+    now = time.time_ns()
+    ctx = ExternalTaskContext(
+        client=client,
+        task=_TASK,
+        exit_hook=lambda _: None,
+        reporter=reporter,
+        trace=tracer.start_task(_TASK, fetched_at=now, decoded_at=now),
+    )
+    async with ctx:
+        await ctx.complete()
+    assert "process topic" not in {span.name for span in exporter.get_finished_spans()}
+
+    reporter.close()
+    await runner
+
+    spans = {span.name: span for span in exporter.get_finished_spans()}
+    root = spans["process topic"]
+    assert root.end_time is not None
+    assert spans["complete"].end_time is not None
+    assert spans["complete"].end_time <= root.end_time
+    assert root.attributes is not None
+    assert root.attributes["camunda.outcome"] == "completed"
+
+
+@pytest.mark.parametrize(
+    "tracer",
+    [TaskTracer(sample_rate=0), TaskTracer(NoOpTracer())],
+)
+def test_task_is_not_traced(tracer: TaskTracer) -> None:
+    now = time.time_ns()
+    assert tracer.start_task(_TASK, fetched_at=now, decoded_at=now) is None